@@ -0,0 +1,61 @@
+import csv
+from itertools import islice
+
+from reviews.constants import EXPORT_CSV, EXPORT_NDJSON
+
+from .renderers import FastJSONRenderer
+
+
+def serialized_chunks(rows, serializer_class, fields, chunk_size):
+    """
+    Сериализует строки порциями по chunk_size.
+
+    Порция сериализуется целиком, поэтому связанные данные (например,
+    жанры произведений) подгружаются одним запросом на порцию.
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield serializer_class(chunk, many=True, fields=fields).data
+
+
+def ndjson_lines(fields, chunks):
+    """Строки NDJSON: по одному JSON-объекту на строку."""
+    renderer = FastJSONRenderer()
+    for chunk in chunks:
+        yield b''.join(renderer.render(item) + b'\n' for item in chunk)
+
+
+class Echo:
+    """Буфер для csv.writer, который просто возвращает записанное."""
+
+    def write(self, value):
+        return value
+
+
+def csv_cell(value):
+    """Вложенные жанры и категория выводятся в CSV слагами."""
+    if isinstance(value, dict):
+        return value['slug']
+    if isinstance(value, list):
+        return ','.join(item['slug'] for item in value)
+    return value
+
+
+def csv_lines(fields, chunks):
+    """Строки CSV с заголовком из имён полей."""
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for chunk in chunks:
+        yield ''.join(
+            writer.writerow([csv_cell(item[field]) for field in fields])
+            for item in chunk
+        )
+
+
+EXPORT_WRITERS = {
+    EXPORT_NDJSON: (ndjson_lines, 'application/x-ndjson'),
+    EXPORT_CSV: (csv_lines, 'text/csv; charset=utf-8'),
+}
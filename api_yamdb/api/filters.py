@@ -1,16 +1,22 @@
 import django_filters
+from django.db.models import Exists, F, OuterRef
+from rest_framework.filters import OrderingFilter
 
+from reviews.cache import categories, genres
+from reviews.constants import GENRE_MODE_ALL, GENRE_MODE_CHOICES
 from reviews.models import Title
 
+TitleGenre = Title.genre.through
+
 
 class TitleFilter(django_filters.FilterSet):
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='iexact'  # точное совпадение без учёта регистра
-    )
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='iexact'  # точное совпадение без учёта регистра
+    # Слаги категорий и жанров сравниваются без учёта регистра и
+    # разрешаются в id по процессному кэшу справочников, без JOIN.
+    category = django_filters.CharFilter(method='filter_category')
+    genre = django_filters.CharFilter(method='filter_genre')
+    genre_mode = django_filters.ChoiceFilter(
+        choices=GENRE_MODE_CHOICES,
+        method='filter_genre_mode'
     )
     year = django_filters.NumberFilter(
         field_name='year',
@@ -23,4 +29,69 @@ class TitleFilter(django_filters.FilterSet):
 
     class Meta:
         model = Title
-        fields = ['category', 'genre', 'year', 'name']
+        fields = ['category', 'genre', 'genre_mode', 'year', 'name']
+
+    @staticmethod
+    def genre_links(slugs):
+        """Строки промежуточной таблицы с любым из указанных жанров."""
+        return TitleGenre.objects.filter(genre_id__in=[
+            genre.pk
+            for slug in slugs
+            for genre in genres.filter_slug_iexact(slug)
+        ])
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category_id__in=[
+            category.pk for category in categories.filter_slug_iexact(value)
+        ])
+
+    def filter_genre(self, queryset, name, value):
+        """
+        Фильтрует по одному или нескольким слагам жанров через запятую.
+
+        genre_mode=any (по умолчанию) — хотя бы один из жанров,
+        genre_mode=all — все перечисленные жанры.
+
+        Оба режима — полусоединения с промежуточной таблицей: в отличие
+        от фильтра через JOIN они не размножают строки произведений,
+        поэтому не искажают агрегат рейтинга и не требуют distinct().
+        В режиме all на каждый слаг свой EXISTS: без учёта регистра слагу
+        может соответствовать несколько жанров (Drama и drama), и подсчёт
+        id жанров отбросил бы произведение с обоими.
+        """
+        slugs = set(
+            slug.strip().lower() for slug in value.split(',') if slug.strip()
+        )
+        if not slugs:
+            return queryset
+        if self.form.cleaned_data.get('genre_mode') == GENRE_MODE_ALL:
+            groups = [[slug] for slug in slugs]
+        else:
+            groups = [slugs]
+        return queryset.filter(*(
+            Exists(self.genre_links(group).filter(title_id=OuterRef('pk')))
+            for group in groups
+        ))
+
+    def filter_genre_mode(self, queryset, name, value):
+        """Режим учитывается в filter_genre, сам по себе не фильтрует."""
+        return queryset
+
+
+class NullsLastOrderingFilter(OrderingFilter):
+    """
+    Сортировка, при которой пустые значения всегда в конце.
+
+    Иначе порядок NULL зависит от СУБД: у SQLite они «меньше» любых
+    значений, у PostgreSQL — «больше».
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*(
+            F(field[1:]).desc(nulls_last=True) if field.startswith('-')
+            else F(field).asc(nulls_last=True)
+            for field in ordering
+        ))
@@ -0,0 +1,196 @@
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.messages.middleware import MessageMiddleware
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.middleware.csrf import CsrfViewMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard необязателен
+    zstandard = None
+
+# Уровни сжатия подобраны для динамических ответов: почти максимальная
+# степень сжатия при небольших затратах процессора.
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+# Случайная добавка к заголовку gzip, как в GZipMiddleware (защита от BREACH).
+GZIP_MAX_RANDOM_BYTES = 100
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+
+def gzip_compress(content):
+    return compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+def gzip_stream(chunks):
+    return compress_sequence(chunks, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+def brotli_compress(content):
+    return brotli.compress(content, quality=BROTLI_QUALITY)
+
+
+def brotli_stream(chunks):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in chunks:
+        # flush после каждой порции, чтобы клиент получал данные сразу.
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+def zstd_compress(content):
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(content)
+
+
+def zstd_stream(chunks):
+    compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# Доступные кодировки в порядке предпочтения сервера:
+# Content-Encoding -> (сжатие строки, сжатие потока).
+CODECS = {}
+if brotli is not None:
+    CODECS['br'] = (brotli_compress, brotli_stream)
+if zstandard is not None:
+    CODECS['zstd'] = (zstd_compress, zstd_stream)
+CODECS['gzip'] = (gzip_compress, gzip_stream)
+
+
+def choose_encoding(accept_encoding):
+    """Первая из CODECS кодировка, которую клиент принимает с q > 0."""
+    weights = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+    for encoding in CODECS:
+        if weights.get(encoding, weights.get('*', 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Сжимает ответы по Accept-Encoding: br или zstd (если установлены
+    brotli и zstandard) либо gzip.
+
+    Сжимаются только текстовые ответы не короче COMPRESSION_MIN_SIZE
+    байт. Потоковые ответы сжимаются по мере отдачи, не собираясь в
+    памяти; асинхронные потоковые ответы не сжимаются.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or not response.get(
+            'Content-Type', ''
+        ).startswith(COMPRESSIBLE_TYPES):
+            return response
+        if response.streaming:
+            if response.is_async:
+                return response
+        elif len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        )
+        if encoding is None:
+            return response
+        compress, compress_stream = CODECS[encoding]
+
+        if response.streaming:
+            response.streaming_content = compress_stream(
+                response.streaming_content
+            )
+            # Размер сжатого потока заранее неизвестен.
+            del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+class NonAPIMiddleware:
+    """
+    Обёртка, которая применяет middleware_class только вне API_PREFIX.
+
+    API аутентифицируется только JWT, поэтому сессии, CSRF и сообщения
+    нужны лишь админке и остальным страницам. Из хуков обёрнутого
+    middleware, кроме самого вызова, пробрасывается process_view.
+    """
+
+    middleware_class = None
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.middleware = self.middleware_class(get_response)
+
+    def skips(self, request):
+        return request.path_info.startswith(settings.API_PREFIX)
+
+    def __call__(self, request):
+        if self.skips(request):
+            return self.get_response(request)
+        return self.middleware(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        process_view = getattr(self.middleware, 'process_view', None)
+        if process_view is None or self.skips(request):
+            return None
+        return process_view(request, view_func, view_args, view_kwargs)
+
+
+class NonAPISessionMiddleware(NonAPIMiddleware):
+    middleware_class = SessionMiddleware
+
+
+class NonAPICsrfViewMiddleware(NonAPIMiddleware):
+    middleware_class = CsrfViewMiddleware
+
+
+class NonAPIAuthenticationMiddleware(NonAPIMiddleware):
+    middleware_class = AuthenticationMiddleware
+
+
+class NonAPIMessageMiddleware(NonAPIMiddleware):
+    middleware_class = MessageMiddleware
@@ -0,0 +1,29 @@
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from .renderers import orjson
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser, который разбирает тело запроса через orjson, если он есть.
+
+    orjson, как и JSONParser в строгом режиме, не принимает NaN и Infinity.
+    Тела в других кодировках и всё, что orjson отверг, разбирает
+    стандартный JSONParser, поэтому результат и тексты ошибок совпадают.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(
+                io.BytesIO(body), media_type, parser_context
+            )
@@ -6,6 +6,13 @@ class IsAdmin(permissions.BasePermission):
         return request.user.is_authenticated and request.user.is_admin
 
 
+class IsModeratorOrAdmin(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and (
+            request.user.is_moderator or request.user.is_admin
+        )
+
+
 class IsAdminOrReadOnly(IsAdmin):
     """Чтение - всем, запись - только админу."""
 
@@ -1,14 +1,35 @@
+from collections import defaultdict
+from operator import attrgetter
+
 from django.contrib.auth import get_user_model
+from django.core.validators import MaxValueValidator
+from django.db import models, transaction
+from django.utils.encoding import smart_str
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from reviews.cache import categories, genres
 from reviews.constants import (
     CONFIRMATION_CODE_LENGTH,
     EMAIL_MAX_LENGTH,
+    MODERATION_ACTIONS,
+    MODERATION_TARGET_ALL,
+    MODERATION_TARGETS,
+    NAME_MAX_LENGTH,
     USERNAME_MAX_LENGTH,
     USERNAME_PATTERN,
 )
-from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.models import (
+    Category,
+    Comment,
+    DeletionJob,
+    Genre,
+    LeaderboardEntry,
+    Review,
+    Title,
+    current_year,
+)
+from reviews.leaderboards import mark_leaderboards_stale
 from reviews.validators import username_validator
 
 User = get_user_model()
@@ -31,26 +52,6 @@ class ReviewSerializer(serializers.ModelSerializer):
         fields = ('id', 'text', 'author', 'score', 'pub_date')
         model = Review
 
-    def validate(self, data):
-        """
-        Проверяет, что пользователь ещё не оставлял отзыв к произведению.
-        """
-        request = self.context['request']
-        if request.method != 'POST':
-            return data
-
-        title_id = self.context['view'].kwargs['title_pk']
-
-        if Review.objects.filter(
-            title_id=title_id, author=request.user
-        ).exists():
-            title_name = Title.objects.get(pk=title_id).name
-            raise ValidationError(
-                f'Отзыв пользователя {request.user.username}'
-                f'к произведению {title_name} уже существует.'
-            )
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """
@@ -82,39 +83,116 @@ class GenreSerializer(serializers.ModelSerializer):
         fields = ('name', 'slug')
 
 
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """SlugRelatedField, который ищет объект в процессном кэше справочника."""
+
+    def __init__(self, catalog, **kwargs):
+        self.catalog = catalog
+        kwargs.setdefault('queryset', catalog.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.catalog.get_by_slug(data)
+        if obj is None:
+            self.fail(
+                'does_not_exist',
+                slug_name=self.slug_field,
+                value=smart_str(data),
+            )
+        return obj
+
+
+def title_genre_ids(title_ids):
+    """Словарь {id произведения: [id жанров]} одним запросом."""
+    genre_ids = defaultdict(list)
+    if title_ids:
+        for title_id, genre_id in Title.genre.through.objects.filter(
+            title_id__in=title_ids
+        ).values_list('title_id', 'genre_id'):
+            genre_ids[title_id].append(genre_id)
+    return genre_ids
+
+
+def represent_genres(genre_ids):
+    """
+    Жанры произведения из кэша справочника, по названию.
+
+    При промахе кэш перечитывается (см. CatalogCache.get); жанр,
+    которого нет и после этого, удалён вместе со связью.
+    """
+    title_genres = filter(None, (genres.get(pk) for pk in genre_ids))
+    return [
+        {'name': genre.name, 'slug': genre.slug}
+        for genre in sorted(title_genres, key=attrgetter('name'))
+    ]
+
+
+def represent_category(category_id):
+    """Категория произведения из кэша справочника или None."""
+    category = categories.get(category_id) if category_id else None
+    if category is None:
+        return None
+    return {'name': category.name, 'slug': category.slug}
+
+
+class TitleReadListSerializer(serializers.ListSerializer):
+    """Загружает id жанров всех произведений списка одним запросом."""
+
+    def to_representation(self, data):
+        titles = list(
+            data.all() if isinstance(data, models.manager.BaseManager)
+            else data
+        )
+        genre_ids = title_genre_ids([title.pk for title in titles])
+        for title in titles:
+            title.genre_ids = genre_ids[title.pk]
+        return super().to_representation(titles)
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
-    """Для вывода информации о произведении."""
+    """
+    Для вывода информации о произведении.
+
+    Жанры и категория берутся из процессного кэша справочников,
+    из базы читаются только id жанров произведения.
+    """
 
     rating = serializers.IntegerField(read_only=True)
-    genre = GenreSerializer(many=True, read_only=True)
-    category = CategorySerializer(read_only=True)
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
 
     class Meta:
+        list_serializer_class = TitleReadListSerializer
         model = Title
         fields = (
             'id',
             'name',
             'year',
             'rating',
+            'weighted_rating',
             'description',
             'genre',
             'category',
         )
         read_only_fields = fields
 
+    def get_genre(self, title):
+        genre_ids = getattr(title, 'genre_ids', None)
+        if genre_ids is None:
+            genre_ids = title_genre_ids([title.pk])[title.pk]
+        return represent_genres(genre_ids)
+
+    def get_category(self, title):
+        return represent_category(title.category_id)
+
 
 class TitleWriteSerializer(serializers.ModelSerializer):
     """Для создания/обновления произведения."""
 
-    genre = serializers.SlugRelatedField(
-        slug_field='slug',
-        queryset=Genre.objects.all(),
-        many=True,
-        required=False,
-    )
-    category = serializers.SlugRelatedField(
-        slug_field='slug', queryset=Category.objects.all(), required=False
-    )
+    genre = CachedSlugRelatedField(genres, many=True, required=False)
+    category = CachedSlugRelatedField(categories, required=False)
 
     class Meta:
         model = Title
@@ -127,6 +205,337 @@ class TitleWriteSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance, context=self.context).data
 
 
+class ValuesSerializer(serializers.BaseSerializer):
+    """
+    Быстрый сериализатор для чтения строк QuerySet.values().
+
+    Вместо полей ModelSerializer использует заранее составленный план
+    plan: кортежи (ключ ответа, ключ строки, преобразование или None).
+    Вывод должен совпадать с выводом соответствующего ModelSerializer.
+    Аргумент fields оставляет в ответе только перечисленные поля.
+    """
+
+    plan = ()
+    # Поля, которые выводятся не из одного столбца:
+    # ключ ответа -> поля строки, нужные для его вывода.
+    computed = {}
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected = self.field_names() if fields is None else fields
+        self.active_plan = [
+            entry for entry in self.plan if entry[0] in self.selected
+        ]
+
+    @classmethod
+    def field_names(cls):
+        """Все поля ответа по порядку."""
+        return [key for key, _, _ in cls.plan] + list(cls.computed)
+
+    @classmethod
+    def value_fields(cls, fields=None):
+        """Поля для QuerySet.values(), нужные для полей ответа fields."""
+        if fields is None:
+            fields = cls.field_names()
+        sources = [source for key, source, _ in cls.plan if key in fields]
+        for key in fields:
+            sources.extend(cls.computed.get(key, ()))
+        return list(dict.fromkeys(sources))
+
+    def to_representation(self, row):
+        data = {}
+        for key, source, convert in self.active_plan:
+            value = row[source]
+            if convert is not None and value is not None:
+                value = convert(value)
+            data[key] = value
+        return data
+
+
+# Дата публикации в том же формате, что и у DateTimeField сериализаторов.
+represent_datetime = serializers.DateTimeField().to_representation
+
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """Чтение отзывов, вывод как у ReviewSerializer."""
+
+    plan = (
+        ('id', 'id', None),
+        ('text', 'text', None),
+        ('author', 'author__username', None),
+        ('score', 'score', None),
+        ('pub_date', 'pub_date', represent_datetime),
+    )
+
+
+class CommentValuesSerializer(ValuesSerializer):
+    """Чтение комментариев, вывод как у CommentSerializer."""
+
+    plan = (
+        ('id', 'id', None),
+        ('text', 'text', None),
+        ('author', 'author__username', None),
+        ('pub_date', 'pub_date', represent_datetime),
+    )
+
+
+class TitleValuesListSerializer(serializers.ListSerializer):
+    """Загружает id жанров всех строк списка одним запросом."""
+
+    def to_representation(self, data):
+        rows = list(data)
+        if 'genre' in self.child.selected:
+            genre_ids = title_genre_ids([row['id'] for row in rows])
+            for row in rows:
+                row['genre_ids'] = genre_ids[row['id']]
+        return super().to_representation(rows)
+
+
+class TitleValuesSerializer(ValuesSerializer):
+    """
+    Чтение произведений, вывод как у TitleReadSerializer.
+
+    Жанры и категория берутся из кэша справочников.
+    """
+
+    plan = (
+        ('id', 'id', None),
+        ('name', 'name', None),
+        ('year', 'year', None),
+        ('rating', 'rating', int),
+        ('weighted_rating', 'weighted_rating', float),
+        ('description', 'description', None),
+    )
+    computed = {'genre': ('id',), 'category': ('category_id',)}
+
+    class Meta:
+        list_serializer_class = TitleValuesListSerializer
+
+    def to_representation(self, row):
+        data = super().to_representation(row)
+        if 'genre' in self.selected:
+            genre_ids = row.get('genre_ids')
+            if genre_ids is None:
+                genre_ids = title_genre_ids([row['id']])[row['id']]
+            data['genre'] = represent_genres(genre_ids)
+        if 'category' in self.selected:
+            data['category'] = represent_category(row['category_id'])
+        return data
+
+
+class LeaderboardTitleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Title
+        fields = ('id', 'name', 'year')
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """Место произведения в материализованном рейтинге."""
+
+    title = LeaderboardTitleSerializer(read_only=True)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('position', 'weighted_rating', 'title')
+
+
+class TitleBulkListSerializer(serializers.ListSerializer):
+    """
+    Массовое создание и обновление произведений.
+
+    Слаги жанров и категорий разрешаются по процессному кэшу
+    справочников, id обновляемых произведений — одним запросом,
+    а запись выполняется через bulk_create/bulk_update в одной
+    транзакции.
+    """
+
+    def to_internal_value(self, data):
+        """
+        Проверяет ссылки на жанры, категории и произведения.
+
+        Ошибки возвращаются списком по элементам, как и ошибки полей.
+        """
+        items = super().to_internal_value(data)
+        item_genres = genres.in_bulk_by_slug(
+            {slug for item in items for slug in item.get('genre', [])}
+        )
+        item_categories = categories.in_bulk_by_slug(
+            {item['category'] for item in items if item.get('category')}
+        )
+        titles = Title.objects.in_bulk(
+            [item['id'] for item in items if 'id' in item]
+        )
+        errors = []
+        seen_ids = set()
+        for item in items:
+            error = self.validate_item(
+                item, titles, item_genres, item_categories
+            )
+            if 'id' in item:
+                if item['id'] in seen_ids:
+                    error['id'] = [f'Произведение {item["id"]} повторяется.']
+                seen_ids.add(item['id'])
+            errors.append(error)
+        if any(errors):
+            raise ValidationError(errors)
+        return items
+
+    @staticmethod
+    def validate_item(item, titles, genres, categories):
+        """Подставляет объекты вместо id и слагов, возвращает ошибки."""
+        error = {}
+        if 'id' in item and item['id'] not in titles:
+            error['id'] = [f'Произведение {item["id"]} не найдено.']
+        unknown = [
+            slug for slug in item.get('genre', []) if slug not in genres
+        ]
+        if unknown:
+            error['genre'] = [f'Жанр {slug} не найден.' for slug in unknown]
+        if item.get('category') and item['category'] not in categories:
+            error['category'] = [f'Категория {item["category"]} не найдена.']
+        if error:
+            return error
+        if 'id' in item:
+            item['instance'] = titles[item['id']]
+        if 'genre' in item:
+            item['genre'] = [genres[slug] for slug in item['genre']]
+        if 'category' in item:
+            item['category'] = categories.get(item['category'])
+        return error
+
+    def create(self, validated_data):
+        result = []
+        created = []
+        updated = []
+        updated_fields = set()
+        genres = []
+        for item in validated_data:
+            title = item.pop('instance', None)
+            item.pop('id', None)
+            genre = item.pop('genre', None)
+            if title is None:
+                title = Title(**item)
+                created.append(title)
+            else:
+                for field, value in item.items():
+                    setattr(title, field, value)
+                updated.append(title)
+                updated_fields.update(item)
+            result.append(title)
+            if genre is not None:
+                genres.append((title, genre))
+        TitleGenre = Title.genre.through
+        # У новых произведений pk появится только после bulk_create.
+        replaced_ids = [title.pk for title, _ in genres if title.pk]
+        with transaction.atomic():
+            Title.objects.bulk_create(created)
+            if updated_fields:
+                Title.objects.bulk_update(updated, updated_fields)
+            TitleGenre.objects.filter(title_id__in=replaced_ids).delete()
+            TitleGenre.objects.bulk_create(
+                TitleGenre(title_id=title.pk, genre_id=genre.pk)
+                for title, title_genres in genres
+                for genre in title_genres
+            )
+        if updated:
+            # bulk-операции не отправляют сигналы, которые обновляют
+            # рейтинги лучших произведений.
+            mark_leaderboards_stale([title.pk for title in updated])
+        return result
+
+
+class TitleBulkSerializer(serializers.Serializer):
+    """
+    Элемент массовой загрузки произведений.
+
+    Элемент с id обновляет существующее произведение (только переданные
+    поля), без id — создаёт новое.
+    """
+
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=NAME_MAX_LENGTH, required=False)
+    year = serializers.IntegerField(
+        validators=[MaxValueValidator(current_year)], required=False
+    )
+    description = serializers.CharField(required=False, allow_blank=True)
+    genre = serializers.ListField(
+        child=serializers.SlugField(), required=False
+    )
+    category = serializers.SlugField(required=False, allow_null=True)
+
+    class Meta:
+        list_serializer_class = TitleBulkListSerializer
+
+    def validate(self, data):
+        if 'id' not in data:
+            missing = {'name', 'year'} - set(data)
+            if missing:
+                raise ValidationError(
+                    {field: ['Обязательное поле.'] for field in missing}
+                )
+        return data
+
+
+class ModerationSerializer(serializers.Serializer):
+    """
+    Массовая модерация: действие, цель и фильтры отзывов и комментариев.
+
+    Фильтры объединяются через И; нужен хотя бы один из них.
+    """
+
+    action = serializers.ChoiceField(choices=MODERATION_ACTIONS)
+    target = serializers.ChoiceField(
+        choices=MODERATION_TARGETS, default=MODERATION_TARGET_ALL
+    )
+    author = serializers.SlugRelatedField(
+        slug_field='username', queryset=User.objects.all(), required=False
+    )
+    title = serializers.PrimaryKeyRelatedField(
+        queryset=Title.objects.all(), required=False
+    )
+    date_from = serializers.DateTimeField(required=False)
+    date_to = serializers.DateTimeField(required=False)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False
+    )
+
+    filter_fields = ('author', 'title', 'date_from', 'date_to', 'ids')
+
+    def validate(self, data):
+        if not any(field in data for field in self.filter_fields):
+            raise ValidationError(
+                'Укажите хотя бы один фильтр: '
+                f'{", ".join(self.filter_fields)}.'
+            )
+        if 'ids' in data and data['target'] == MODERATION_TARGET_ALL:
+            raise ValidationError(
+                {'ids': 'Список id задаётся для отзывов или комментариев.'}
+            )
+        if data.get('date_from') and data.get('date_to') and (
+            data['date_from'] > data['date_to']
+        ):
+            raise ValidationError(
+                {'date_to': 'Конец периода раньше его начала.'}
+            )
+        return data
+
+
+class DeletionJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = DeletionJob
+        fields = (
+            'id',
+            'target',
+            'object_id',
+            'status',
+            'processed',
+            'error',
+            'created_at',
+            'finished_at',
+        )
+        read_only_fields = fields
+
+
 class TokenSerializer(serializers.Serializer):
     username = serializers.RegexField(
         required=True,
@@ -4,10 +4,16 @@ from rest_framework.routers import DefaultRouter
 from api.views import (
     CategoryViewSet,
     CommentViewSet,
+    DeletionJobViewSet,
     GenreViewSet,
+    instrumentation_view,
+    LeaderboardView,
     ReviewViewSet,
     TitleViewSet,
     UserViewSet,
+    moderation_view,
+    profile_view,
+    profiles_view,
     signup_view,
     token_view,
 )
@@ -17,6 +23,9 @@ v1_router.register('users', UserViewSet, basename='users')
 v1_router.register('categories', CategoryViewSet, basename='categories')
 v1_router.register('genres', GenreViewSet, basename='genres')
 v1_router.register('titles', TitleViewSet, basename='titles')
+v1_router.register(
+    'deletion-jobs', DeletionJobViewSet, basename='deletion-jobs'
+)
 v1_router.register(
     r'titles/(?P<title_pk>\d+)/reviews',
     ReviewViewSet,
@@ -31,8 +40,25 @@ auth_urls = [
     path('signup/', signup_view, name='signup'),
     path('token/', token_view, name='token'),
 ]
+leaderboard_urls = [
+    path('<str:board>/', LeaderboardView.as_view(), name='leaderboard'),
+    path(
+        '<str:board>/<str:key>/',
+        LeaderboardView.as_view(),
+        name='leaderboard-detail',
+    ),
+]
 
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/', include(auth_urls)),
+    path('v1/leaderboards/', include(leaderboard_urls)),
+    path('v1/moderation/', moderation_view, name='moderation'),
+    path(
+        'v1/instrumentation/',
+        instrumentation_view,
+        name='instrumentation',
+    ),
+    path('v1/profiles/', profiles_view, name='profiles'),
+    path('v1/profiles/<str:name>/', profile_view, name='profile'),
 ]
@@ -2,43 +2,87 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.db.models import Avg
+from django.db.models import Avg, Q
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.functional import cached_property
 from django.utils.crypto import get_random_string
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, status, viewsets
+from rest_framework import filters, generics, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import SearchFilter
+from rest_framework.generics import ListAPIView
 from rest_framework.mixins import (
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
 )
 from rest_framework.permissions import (
+    SAFE_METHODS,
     AllowAny,
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 
+from monitoring import profiling
+from monitoring.metrics import record_auth
+from monitoring.mixins import SerializeTimingMixin
+from monitoring.stats import registry
+from reviews.cache import categories, genres
 from reviews.constants import (
     CONFIRMATION_CODE_CHARS,
     CONFIRMATION_CODE_LENGTH,
+    DELETION_TARGET_CATEGORY,
+    DELETION_TARGET_TITLE,
+    DELETION_TARGET_USER,
     EDIT_PROFILE_URL,
+    EXPORT_CHUNK_SIZE,
+    LEADERBOARD_CATEGORY,
+    LEADERBOARD_GENRE,
+    LEADERBOARD_OVERALL,
+    LEADERBOARD_YEAR,
+    TITLES_BATCH_MAX_SIZE,
+    UNIQUE_REVIEW,
+)
+from reviews.deletion import schedule_deletion
+from reviews.models import (
+    Category,
+    DeletionJob,
+    Genre,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from reviews.moderation import moderate, select_content
+from reviews.stats import get_title_stats
+
+from .export import EXPORT_WRITERS, serialized_chunks
+from .filters import NullsLastOrderingFilter, TitleFilter
+from .permissions import (
+    IsAdmin,
+    IsAdminOrReadOnly,
+    IsAuthorOrModeratorOrAdmin,
+    IsModeratorOrAdmin,
 )
-from reviews.models import Category, Genre, Review, Title
-
-from .filters import TitleFilter
-from .permissions import IsAdmin, IsAdminOrReadOnly, IsAuthorOrModeratorOrAdmin
 from .serializers import (
     CategorySerializer,
     CommentSerializer,
+    CommentValuesSerializer,
+    DeletionJobSerializer,
     GenreSerializer,
+    LeaderboardEntrySerializer,
+    ModerationSerializer,
     ReviewSerializer,
+    ReviewValuesSerializer,
     SignUpSerializer,
+    TitleBulkSerializer,
     TitleReadSerializer,
+    TitleValuesSerializer,
     TitleWriteSerializer,
     TokenSerializer,
     UserSerializer,
@@ -47,7 +91,137 @@ from .serializers import (
 User = get_user_model()
 
 
+def unique_review_violated(error):
+    """
+    IntegrityError вызвано ограничением unique_review.
+
+    PostgreSQL называет ограничение, SQLite — только его столбцы.
+    """
+    columns = ', '.join(
+        f'{Review._meta.db_table}.{Review._meta.get_field(name).column}'
+        for name in ('title', 'author')
+    )
+    return UNIQUE_REVIEW in str(error) or columns in str(error)
+
+
+class DeletionJobMixin:
+    """
+    Удаление через фоновое задание, если включено DELETION_JOBS_ENABLED.
+
+    Объект сразу пропадает из выдачи, ответ — 202 с заданием;
+    зависимые строки удаляет команда process_deletions.
+    """
+
+    deletion_target = None
+
+    def destroy(self, request, *args, **kwargs):
+        if not settings.DELETION_JOBS_ENABLED:
+            return super().destroy(request, *args, **kwargs)
+        job = schedule_deletion(self.deletion_target, self.get_object())
+        return Response(
+            self.timed(DeletionJobSerializer(job)).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class ValuesReadMixin:
+    """
+    Чтение (list и retrieve) строками QuerySet.values().
+
+    Для GET-запросов списка и объекта используется быстрый
+    values_serializer_class, для остальных — обычный сериализатор.
+    Параметры fields= и exclude= (имена через запятую) сужают набор
+    полей ответа, а вместе с ним и столбцы, выбираемые из базы.
+    """
+
+    values_serializer_class = None
+
+    def reads_values(self):
+        return (
+            self.action in ('list', 'retrieve', 'export')
+            and self.request.method in SAFE_METHODS
+        )
+
+    @cached_property
+    def selected_fields(self):
+        """Поля ответа с учётом параметров fields= и exclude=."""
+        names = self.values_serializer_class.field_names()
+        selected = names
+        for param in ('fields', 'exclude'):
+            if param not in self.request.query_params:
+                continue
+            requested = {
+                name.strip()
+                for name in self.request.query_params[param].split(',')
+                if name.strip()
+            }
+            if not requested or requested.difference(names):
+                raise ValidationError({
+                    param: f'Укажите через запятую поля из: '
+                           f'{", ".join(names)}.'
+                })
+            selected = [
+                name for name in selected
+                if (name in requested) == (param == 'fields')
+            ]
+        return selected
+
+    def get_serializer_class(self):
+        if self.reads_values():
+            return self.values_serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.reads_values():
+            kwargs['fields'] = self.selected_fields
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.reads_values():
+            return queryset.values(
+                *self.values_serializer_class.value_fields(
+                    self.selected_fields
+                )
+            )
+        return queryset
+
+
+class ExportMixin:
+    """
+    Потоковая выгрузка списка для администратора: export/ndjson/, export/csv/.
+
+    Учитывает фильтры и параметры fields=/exclude=. Строки читаются
+    из базы через QuerySet.iterator() порциями по EXPORT_CHUNK_SIZE
+    и сразу отдаются клиенту, поэтому память не зависит от объёма.
+    """
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAdmin],
+        url_path=r'export/(?P<export_format>ndjson|csv)',
+    )
+    def export(self, request, export_format, **kwargs):
+        rows = self.filter_queryset(self.get_queryset()).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+        writer, content_type = EXPORT_WRITERS[export_format]
+        fields = self.selected_fields
+        response = StreamingHttpResponse(
+            writer(fields, serialized_chunks(
+                rows, self.get_serializer_class(), fields, EXPORT_CHUNK_SIZE
+            )),
+            content_type=content_type,
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.basename}.{export_format}"'
+        )
+        return response
+
+
 class BaseCategoryGenreViewSet(
+    SerializeTimingMixin,
     CreateModelMixin,
     ListModelMixin,
     DestroyModelMixin,
@@ -62,9 +236,12 @@ class BaseCategoryGenreViewSet(
     permission_classes = [IsAdminOrReadOnly]
 
 
-class CategoryViewSet(BaseCategoryGenreViewSet):
-    queryset = Category.objects.all()
+class CategoryViewSet(DeletionJobMixin, BaseCategoryGenreViewSet):
+    queryset = Category.objects.exclude(
+        pk__in=DeletionJob.objects.pending_ids(DELETION_TARGET_CATEGORY)
+    )
     serializer_class = CategorySerializer
+    deletion_target = DELETION_TARGET_CATEGORY
 
 
 class GenreViewSet(BaseCategoryGenreViewSet):
@@ -72,25 +249,171 @@ class GenreViewSet(BaseCategoryGenreViewSet):
     serializer_class = GenreSerializer
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(rating=Avg('reviews__score')).order_by(
+class TitleViewSet(
+    SerializeTimingMixin,
+    DeletionJobMixin,
+    ExportMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Title.objects.exclude(
+        pk__in=DeletionJob.objects.pending_ids(DELETION_TARGET_TITLE)
+    ).order_by(
         *Title._meta.ordering
     )
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [DjangoFilterBackend, NullsLastOrderingFilter]
     filterset_class = TitleFilter
+    ordering_fields = ['weighted_rating', 'year', 'name']
+    deletion_target = DELETION_TARGET_TITLE
     permission_classes = [IsAdminOrReadOnly]
     http_method_names = ['get', 'post', 'patch', 'delete', 'head']
+    serializer_class = TitleWriteSerializer
+    values_serializer_class = TitleValuesSerializer
 
-    def get_serializer_class(self):
-        if self.action in ['list', 'retrieve']:
-            return TitleReadSerializer
-        return TitleWriteSerializer
+    def get_queryset(self):
+        """Рейтинг (JOIN с отзывами) считается, только если он выводится."""
+        queryset = super().get_queryset()
+        if self.reads_values() and 'rating' not in self.selected_fields:
+            return queryset
+        return queryset.annotate(
+            rating=Avg(
+                'reviews__score',
+                filter=Q(reviews__is_hidden=False, reviews__is_deleted=False),
+            )
+        )
+
+    def list(self, request, *args, **kwargs):
+        if 'ids' in request.query_params:
+            return self.list_by_ids(request)
+        return super().list(request, *args, **kwargs)
+
+    def get_requested_ids(self, request):
+        """Разбирает параметр ids=1,2,3, сохраняя порядок и убирая повторы."""
+        ids = [
+            value.strip()
+            for value in request.query_params['ids'].split(',')
+            if value.strip()
+        ]
+        # isdigit() пропускает символы вроде «²», которые int() не разбирает.
+        if not ids or not all(value.isdecimal() for value in ids):
+            raise ValidationError(
+                {'ids': 'Укажите id произведений через запятую.'}
+            )
+        ids = list(dict.fromkeys(int(value) for value in ids))
+        if len(ids) > TITLES_BATCH_MAX_SIZE:
+            raise ValidationError(
+                {'ids': f'Не больше {TITLES_BATCH_MAX_SIZE} id за запрос.'}
+            )
+        return ids
+
+    def list_by_ids(self, request):
+        """
+        Пакетное получение произведений: GET /titles/?ids=1,2,3.
+
+        Без пагинации, в порядке из запроса; id, которых нет (или которые
+        отсеяны остальными фильтрами), перечисляются в missing.
+        Произведения и id их жанров загружаются двумя запросами
+        независимо от числа id, жанры и категории берутся из кэша.
+        """
+        ids = self.get_requested_ids(request)
+        # id нужен для порядка и missing, даже если его нет в fields=.
+        columns = self.values_serializer_class.value_fields(
+            self.selected_fields
+        )
+        titles = {
+            title['id']: title for title in
+            self.filter_queryset(self.get_queryset()).filter(
+                pk__in=ids
+            ).values(*dict.fromkeys(['id', *columns]))
+        }
+        found = [titles[pk] for pk in ids if pk in titles]
+        return Response({
+            'results': self.get_serializer(found, many=True).data,
+            'missing': [pk for pk in ids if pk not in titles],
+        })
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Массовое создание и обновление произведений списком.
+
+        Ответ — созданные и обновлённые произведения в порядке запроса.
+        """
+        serializer = TitleBulkSerializer(
+            data=request.data,
+            many=True,
+            allow_empty=False,
+            max_length=TITLES_BATCH_MAX_SIZE,
+            context=self.get_serializer_context(),
+        )
+        serializer.is_valid(raise_exception=True)
+        ids = [title.pk for title in serializer.save()]
+        titles = self.get_queryset().in_bulk(ids)
+        return Response(
+            self.timed(TitleReadSerializer(
+                [titles[pk] for pk in ids],
+                many=True,
+                context=self.get_serializer_context(),
+            )).data,
+            status=status.HTTP_201_CREATED,
+        )
 
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        """
+        Количество отзывов, средняя, медиана и гистограмма оценок.
+
+        Считается по счётчикам ScoreBucket, а не по отзывам.
+        """
+        # get_object_or_404 из DRF отвечает 404 и на нечисловой pk.
+        generics.get_object_or_404(self.queryset.only('pk'), pk=pk)
+        return Response(get_title_stats(pk))
+
+
+class LeaderboardView(SerializeTimingMixin, ListAPIView):
+    """
+    Лучшие произведения: все, по категории, жанру или году.
+
+    Читает материализованный рейтинг LeaderboardEntry одним диапазоном
+    по индексу, без агрегации по отзывам.
+    """
+
+    serializer_class = LeaderboardEntrySerializer
+    pagination_class = None
+    permission_classes = [AllowAny]
+    catalogs = {LEADERBOARD_CATEGORY: categories, LEADERBOARD_GENRE: genres}
+
+    def get_board_key(self):
+        board = self.kwargs['board']
+        key = self.kwargs.get('key')
+        if board == LEADERBOARD_OVERALL and key is None:
+            return ''
+        if board == LEADERBOARD_YEAR and key is not None and key.isdecimal():
+            return str(int(key))
+        if board in self.catalogs and key is not None:
+            obj = self.catalogs[board].get_by_slug(key)
+            if obj is not None:
+                return str(obj.pk)
+        raise NotFound('Такого рейтинга нет.')
 
-class ReviewViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        return LeaderboardEntry.objects.filter(
+            board=self.kwargs['board'], key=self.get_board_key()
+        ).exclude(
+            title_id__in=DeletionJob.objects.pending_ids(DELETION_TARGET_TITLE)
+        ).select_related('title')
+
+
+class ReviewViewSet(
+    SerializeTimingMixin,
+    ExportMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     """Вьюсет для запросов к отзывам."""
 
     serializer_class = ReviewSerializer
+    values_serializer_class = ReviewValuesSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = [
         IsAuthenticatedOrReadOnly,
@@ -99,21 +422,51 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
     def get_title(self):
         """Возвращает произведение по pk, указанному в URL."""
-        return get_object_or_404(Title, pk=self.kwargs['title_pk'])
+        return get_object_or_404(
+            Title.objects.exclude(
+                pk__in=DeletionJob.objects.pending_ids(DELETION_TARGET_TITLE)
+            ),
+            pk=self.kwargs['title_pk'],
+        )
 
     def get_queryset(self):
         """Возвращает отзыв к произведению."""
-        return self.get_title().reviews.all()
+        return self.get_title().reviews.visible()
 
     def perform_create(self, serializer):
-        """Сохраняет отзыв, подставляя автора и произведение."""
-        serializer.save(author=self.request.user, title=self.get_title())
-
-
-class CommentViewSet(viewsets.ModelViewSet):
+        """
+        Сохраняет отзыв, подставляя автора и произведение.
+
+        Повторный отзыв отсекает ограничение unique_review, а не проверка
+        exists() перед вставкой: она стоила лишнего запроса и пропускала
+        одновременные запросы одного пользователя, которые падали с 500.
+        """
+        title = self.get_title()
+        try:
+            # Review.save() сам выполняется в транзакции вместе со
+            # счётчиками оценок, после ошибки она уже откачена.
+            serializer.save(author=self.request.user, title=title)
+        except IntegrityError as error:
+            if not unique_review_violated(error):
+                raise
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                f'Отзыв пользователя {self.request.user.username} '
+                f'к произведению {title.name} уже существует.'
+            ]})
+
+    def perform_destroy(self, instance):
+        """Мягкое удаление: комментарии удалит команда purge_deleted."""
+        instance.is_deleted = True
+        instance.save(update_fields=['is_deleted'])
+
+
+class CommentViewSet(
+    SerializeTimingMixin, ValuesReadMixin, viewsets.ModelViewSet
+):
     """Вьюсет для запросов к комментариям."""
 
     serializer_class = CommentSerializer
+    values_serializer_class = CommentValuesSerializer
     http_method_names = ['get', 'post', 'patch', 'delete']
     permission_classes = [
         IsAuthenticatedOrReadOnly,
@@ -122,31 +475,120 @@ class CommentViewSet(viewsets.ModelViewSet):
 
     def get_review(self):
         """Возвращает отзыв по pk, указанному в URL."""
-        return get_object_or_404(Review, pk=self.kwargs['review_pk'])
+        return get_object_or_404(
+            Review.objects.visible(), pk=self.kwargs['review_pk']
+        )
 
     def get_queryset(self):
         """Возвращает комментарий к отзыву."""
-        return self.get_review().comments.all()
+        return self.get_review().comments.visible()
 
     def perform_create(self, serializer):
         """Сохраняет комментарий, подставляя автора и отзыв."""
         serializer.save(author=self.request.user, review=self.get_review())
 
+    def perform_destroy(self, instance):
+        """Мягкое удаление, запись удалит команда purge_deleted."""
+        instance.is_deleted = True
+        instance.save(update_fields=['is_deleted'])
+
+
+@api_view(('POST',))
+@permission_classes([IsModeratorOrAdmin])
+def moderation_view(request):
+    """
+    Массовое удаление, скрытие или показ отзывов и комментариев.
+
+    Изменения выполняются запросами над множествами строк, рейтинги
+    затронутых произведений пересчитываются один раз.
+    """
+    serializer = ModerationSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    filters = dict(serializer.validated_data)
+    action_name = filters.pop('action')
+    reviews, comments = select_content(**filters)
+    return Response(
+        moderate(action_name, reviews, comments), status=status.HTTP_200_OK
+    )
+
+
+@api_view(('GET', 'DELETE'))
+@permission_classes([IsAdmin])
+def instrumentation_view(request):
+    """
+    Перцентили времени, запросов к БД и размера ответов по представлениям.
+
+    Собираются InstrumentationMiddleware в текущем процессе;
+    DELETE сбрасывает статистику.
+    """
+    if request.method == 'DELETE':
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response({
+        'enabled': settings.INSTRUMENTATION_ENABLED,
+        'views': registry.snapshot(),
+    })
+
+
+@api_view(('GET',))
+@permission_classes([IsAdmin])
+def profiles_view(request):
+    """Сохранённые трейсы ProfilingMiddleware, новые первыми."""
+    return Response({
+        'enabled': settings.PROFILING_ENABLED,
+        'profilers': list(profiling.PROFILERS),
+        'profiles': [
+            {
+                **profiling.describe(path),
+                'url': request.build_absolute_uri(
+                    reverse('profile', args=(path.name,))
+                ),
+            }
+            for path in profiling.traces()
+        ],
+    })
+
+
+@api_view(('GET', 'DELETE'))
+@permission_classes([IsAdmin])
+def profile_view(request, name):
+    """Скачивание трейса файлом; DELETE удаляет его."""
+    path = profiling.trace_path(name)
+    if path is None:
+        raise NotFound('Трейс не найден.')
+    if request.method == 'DELETE':
+        path.unlink(missing_ok=True)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=name,
+        content_type=profiling.content_type(name),
+    )
+
 
 @api_view(('POST',))
 @permission_classes([AllowAny])
 def token_view(request):
     serializer = TokenSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
+    if not serializer.is_valid():
+        record_auth('token', 'invalid')
+        raise ValidationError(serializer.errors)
     confirmation_code = serializer.validated_data['confirmation_code']
-    user = get_object_or_404(
-        User, username=serializer.validated_data['username']
-    )
+    try:
+        user = get_object_or_404(
+            User, username=serializer.validated_data['username']
+        )
+    except Http404:
+        record_auth('token', 'unknown_user')
+        raise
     if user.confirmation_code != confirmation_code:
         user.confirmation_code = None
         user.save(update_fields=['confirmation_code'])
+        record_auth('token', 'wrong_code')
         raise ValidationError({'confirmation_code': 'Неверный код'})
     token = AccessToken.for_user(user)
+    record_auth('token', 'success')
     return Response({'token': str(token)}, status=status.HTTP_200_OK)
 
 
@@ -154,7 +596,9 @@ def token_view(request):
 @permission_classes([AllowAny])
 def signup_view(request):
     serializer = SignUpSerializer(data=request.data)
-    serializer.is_valid(raise_exception=True)
+    if not serializer.is_valid():
+        record_auth('signup', 'invalid')
+        raise ValidationError(serializer.errors)
     username = serializer.validated_data['username']
     email = serializer.validated_data['email']
     try:
@@ -169,6 +613,7 @@ def signup_view(request):
             )
         else:
             errors['email'] = 'Электронная почта занята другим пользователем'
+        record_auth('signup', 'conflict')
         raise ValidationError(errors)
     user.confirmation_code = get_random_string(
         length=CONFIRMATION_CODE_LENGTH,
@@ -182,20 +627,25 @@ def signup_view(request):
         [email],
         fail_silently=True,
     )
-
+    record_auth('signup', 'success' if created else 'code_resent')
     return Response(
         {'email': email, 'username': username}, status=status.HTTP_200_OK
     )
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    SerializeTimingMixin, DeletionJobMixin, viewsets.ModelViewSet
+):
     http_method_names = ['get', 'post', 'patch', 'delete']
-    queryset = User.objects.all()
+    queryset = User.objects.exclude(
+        pk__in=DeletionJob.objects.pending_ids(DELETION_TARGET_USER)
+    )
     serializer_class = UserSerializer
     permission_classes = (IsAdmin,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
     lookup_field = 'username'
+    deletion_target = DELETION_TARGET_USER
 
     @action(
         detail=False,
@@ -211,3 +661,11 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save(role=user.role)
         return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+class DeletionJobViewSet(SerializeTimingMixin, viewsets.ReadOnlyModelViewSet):
+    """Статус фоновых заданий на удаление."""
+
+    queryset = DeletionJob.objects.all()
+    serializer_class = DeletionJobSerializer
+    permission_classes = (IsAdmin,)
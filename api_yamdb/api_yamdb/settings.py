@@ -28,10 +28,16 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt',
     'reviews.apps.ReviewsConfig',
     'api.apps.ApiConfig',
+    'monitoring.apps.MonitoringConfig',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.ProfilingMiddleware',
+    'monitoring.middleware.InstrumentationMiddleware',
+    'monitoring.middleware.NPlusOneMiddleware',
+    'monitoring.middleware.SlowQueryMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -39,6 +45,10 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+# Префикс URL API; профиль settings_api не применяет к нему middleware
+# сессий, CSRF, аутентификации Django и сообщений.
+API_PREFIX = '/api/'
+
 AUTH_USER_MODEL = 'reviews.YamdbUser'
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -98,18 +108,126 @@ STATIC_URL = '/static/'
 
 STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
+# JSON кодируется и разбирается через orjson, если он установлен;
+# FAST_JSON=False возвращает стандартные JSONRenderer и JSONParser DRF.
+FAST_JSON = os.getenv('FAST_JSON', 'True') == 'True'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer' if FAST_JSON
+        else 'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser' if FAST_JSON
+        else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'admin@yamdb.fake'
 
 
+# Число «виртуальных» отзывов со средней оценкой по всем произведениям,
+# которое добавляется к отзывам произведения при расчёте взвешенного рейтинга.
+RATING_PRIOR_WEIGHT = int(os.getenv('RATING_PRIOR_WEIGHT', 10))
+
+# Замеры времени, запросов к БД и размера ответов по представлениям:
+# заголовок Server-Timing и статистика в /api/v1/instrumentation/.
+INSTRUMENTATION_ENABLED = (
+    os.getenv('INSTRUMENTATION_ENABLED', 'False') == 'True'
+)
+# Сколько последних замеров каждого представления хранит процесс.
+INSTRUMENTATION_SAMPLES = int(os.getenv('INSTRUMENTATION_SAMPLES', 1000))
+
+# Метрики Prometheus по адресу /metrics. При нескольких процессах
+# (воркеры gunicorn, load_data) укажите общую директорию METRICS_DIR,
+# которую нужно очищать при перезапуске сервера.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+# Если задан, /metrics требует заголовок Authorization: Bearer <токен>.
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Поиск N+1: запрос, одинаковый по форме SQL, выполненный за один
+# HTTP-запрос больше NPLUSONE_THRESHOLD раз. 'log' — предупреждение
+# в лог, 'raise' — исключение (в тестах), 'off' — без проверки.
+NPLUSONE_DETECTION = os.getenv(
+    'NPLUSONE_DETECTION', 'log' if DEBUG else 'off'
+)
+NPLUSONE_THRESHOLD = int(os.getenv('NPLUSONE_THRESHOLD', 3))
+
+# Журнал медленных запросов к БД: запросы дольше SLOW_QUERY_THRESHOLD
+# миллисекунд пишутся в SLOW_QUERY_LOG_FILE (JSON по строке на запрос,
+# с ротацией), дольше SLOW_QUERY_EXPLAIN_THRESHOLD — вместе с планом.
+SLOW_QUERY_LOG_ENABLED = os.getenv('SLOW_QUERY_LOG_ENABLED', 'False') == 'True'
+SLOW_QUERY_THRESHOLD = float(os.getenv('SLOW_QUERY_THRESHOLD', 100))
+SLOW_QUERY_EXPLAIN_THRESHOLD = float(
+    os.getenv('SLOW_QUERY_EXPLAIN_THRESHOLD', 250)
+)
+SLOW_QUERY_LOG_FILE = os.getenv(
+    'SLOW_QUERY_LOG_FILE', str(BASE_DIR / 'slow_queries.log')
+)
+SLOW_QUERY_LOG_MAX_BYTES = int(
+    os.getenv('SLOW_QUERY_LOG_MAX_BYTES', 10 * 1024 * 1024)
+)
+SLOW_QUERY_LOG_BACKUP_COUNT = int(os.getenv('SLOW_QUERY_LOG_BACKUP_COUNT', 5))
+
+# Профилирование запросов администраторов по ?profile=1 или заголовку
+# X-Profile. Трейсы (cProfile .prof или HTML pyinstrument) хранятся в
+# PROFILING_DIR, не больше PROFILING_KEEP последних.
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+PROFILING_PROFILER = os.getenv('PROFILING_PROFILER', 'cprofile')
+PROFILING_DIR = os.getenv('PROFILING_DIR', str(BASE_DIR / 'profiles'))
+PROFILING_KEEP = int(os.getenv('PROFILING_KEEP', 100))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'monitoring.slowlog.JSONFormatter'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': SLOW_QUERY_LOG_MAX_BYTES,
+            'backupCount': SLOW_QUERY_LOG_BACKUP_COUNT,
+            'encoding': 'utf-8',
+            # Файл создаётся при первой записи, а не при запуске.
+            'delay': True,
+            'formatter': 'json',
+        },
+    },
+    'loggers': {
+        'monitoring.slowqueries': {
+            'handlers': ['slow_queries'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
+# Ответы короче стольких байт не сжимаются: выигрыш не окупает затрат.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+
+# Как часто (в секундах) процесс сверяет версию кэша категорий и жанров
+# с базой (CatalogVersion), чтобы увидеть изменения из других процессов.
+CATALOG_CACHE_CHECK_INTERVAL = float(
+    os.getenv('CATALOG_CACHE_CHECK_INTERVAL', 1)
+)
+
+# Удаление пользователей, произведений и категорий через фоновые задания:
+# DELETE отвечает 202, зависимые строки удаляет process_deletions.
+DELETION_JOBS_ENABLED = os.getenv('DELETION_JOBS_ENABLED', 'False') == 'True'
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=10),
     'AUTH_HEADER_TYPES': ('Bearer',),
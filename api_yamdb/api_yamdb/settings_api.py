@@ -0,0 +1,24 @@
+"""
+Профиль развёртывания только для API.
+
+Запросы к API_PREFIX аутентифицируются JWT и не проходят через
+middleware сессий, CSRF, аутентификации Django и сообщений; админка
+и остальные страницы работают как обычно. Включается так:
+
+    DJANGO_SETTINGS_MODULE=api_yamdb.settings_api
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+NON_API_MIDDLEWARE = {
+    'django.contrib.sessions.middleware.SessionMiddleware':
+        'api.middleware.NonAPISessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware':
+        'api.middleware.NonAPICsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware':
+        'api.middleware.NonAPIAuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware':
+        'api.middleware.NonAPIMessageMiddleware',
+}
+
+MIDDLEWARE = [NON_API_MIDDLEWARE.get(name, name) for name in MIDDLEWARE]
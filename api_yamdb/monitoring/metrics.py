@@ -0,0 +1,238 @@
+"""
+Метрики в текстовом формате Prometheus.
+
+Каждый процесс копит значения у себя в памяти. Если задан METRICS_DIR,
+процесс не чаще раза в METRICS_FLUSH_INTERVAL секунд записывает свои
+значения в отдельный файл этой директории, а /metrics суммирует файлы
+всех процессов (воркеров WSGI-сервера, команд вроде load_data).
+Директорию, как и у prometheus_client, нужно очищать при перезапуске
+сервера.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+
+# Границы корзин гистограммы длительности запросов, в секундах.
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+METRICS = {
+    'yamdb_http_requests_total': (
+        COUNTER, 'Запросы по представлениям, методам и статусам.'
+    ),
+    'yamdb_http_request_duration_seconds': (
+        HISTOGRAM, 'Длительность запросов по представлениям.'
+    ),
+    'yamdb_db_queries_total': (
+        COUNTER, 'Запросы к базе данных по представлениям.'
+    ),
+    'yamdb_db_query_duration_seconds_total': (
+        COUNTER, 'Суммарное время запросов к базе данных по представлениям.'
+    ),
+    'yamdb_catalog_cache_lookups_total': (
+        COUNTER, 'Обращения к кэшу справочников: hit — без перечитывания.'
+    ),
+    'yamdb_auth_total': (
+        COUNTER, 'Исходы регистрации (signup) и получения токена (token).'
+    ),
+    'yamdb_import_rows_total': (
+        COUNTER, 'Строки CSV, обработанные load_data, по файлам.'
+    ),
+    'yamdb_import_duration_seconds_total': (
+        COUNTER, 'Время загрузки CSV командой load_data, по файлам.'
+    ),
+}
+
+
+class Metrics:
+    """Значения метрик процесса: счётчики и гистограммы по меткам."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = defaultdict(float)
+        self.histograms = {}
+        self.flushed_at = 0.0
+        self.filename = f'{os.getpid()}-{uuid.uuid4().hex}.json'
+
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self.lock:
+            self.counters[key] += value
+
+    def observe(self, name, labels, value):
+        key = (name, labels)
+        index = bisect_left(DURATION_BUCKETS, value)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {
+                    'buckets': [0] * (len(DURATION_BUCKETS) + 1), 'sum': 0.0
+                }
+            histogram['buckets'][index] += 1
+            histogram['sum'] += value
+
+    def dump(self):
+        with self.lock:
+            return {
+                'counters': [
+                    [name, labels, value]
+                    for (name, labels), value in self.counters.items()
+                ],
+                'histograms': [
+                    [name, labels, data['buckets'], data['sum']]
+                    for (name, labels), data in self.histograms.items()
+                ],
+            }
+
+    def flush(self, force=False):
+        """Записывает значения процесса в METRICS_DIR (атомарно)."""
+        directory = settings.METRICS_DIR
+        now = time.monotonic()
+        if not directory or (
+            not force
+            and now - self.flushed_at < settings.METRICS_FLUSH_INTERVAL
+        ):
+            return
+        self.flushed_at = now
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        path = Path(directory) / self.filename
+        temporary = path.with_name(
+            f'{self.filename}.{threading.get_ident()}.tmp'
+        )
+        temporary.write_text(json.dumps(self.dump()), encoding='utf-8')
+        os.replace(temporary, path)
+
+    def collect(self):
+        """Значения всех процессов из METRICS_DIR или только этого."""
+        if not settings.METRICS_DIR:
+            dumps = [self.dump()]
+        else:
+            self.flush(force=True)
+            dumps = [
+                json.loads(path.read_text(encoding='utf-8'))
+                for path in sorted(Path(settings.METRICS_DIR).glob('*.json'))
+            ]
+        counters = defaultdict(float)
+        histograms = {}
+        for dump in dumps:
+            for name, labels, value in dump['counters']:
+                counters[name, freeze(labels)] += value
+            for name, labels, buckets, total in dump['histograms']:
+                key = (name, freeze(labels))
+                if key not in histograms:
+                    histograms[key] = {
+                        'buckets': [0] * len(buckets), 'sum': 0.0
+                    }
+                for index, count in enumerate(buckets):
+                    histograms[key]['buckets'][index] += count
+                histograms[key]['sum'] += total
+        return counters, histograms
+
+
+def number(value):
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def freeze(labels):
+    return tuple(tuple(pair) for pair in labels)
+
+
+def labels_text(labels, extra=()):
+    pairs = [*labels, *extra]
+    if not pairs:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in pairs
+    ) + '}'
+
+
+def render(counters, histograms):
+    """Текст в формате Prometheus 0.0.4."""
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == COUNTER:
+            for key in sorted(key for key in counters if key[0] == name):
+                lines.append(
+                    f'{name}{labels_text(key[1])} {number(counters[key])}'
+                )
+            continue
+        for key in sorted(key for key in histograms if key[0] == name):
+            data, labels = histograms[key], key[1]
+            cumulative = 0
+            for bound, count in zip(
+                [*map(str, DURATION_BUCKETS), '+Inf'], data['buckets']
+            ):
+                cumulative += count
+                lines.append(
+                    f'{name}_bucket{labels_text(labels, [("le", bound)])} '
+                    f'{cumulative}'
+                )
+            lines.append(
+                f'{name}_sum{labels_text(labels)} {number(data["sum"])}'
+            )
+            lines.append(f'{name}_count{labels_text(labels)} {cumulative}')
+    return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
+atexit.register(metrics.flush, force=True)
+
+
+def enabled():
+    return settings.METRICS_ENABLED
+
+
+def flush():
+    """Сразу сохраняет метрики процесса, например в конце команды."""
+    metrics.flush(force=True)
+
+
+def record_request(view, method, status, duration, queries, db_duration):
+    labels = (('view', view),)
+    metrics.inc(
+        'yamdb_http_requests_total',
+        (*labels, ('method', method), ('status', str(status))),
+    )
+    metrics.observe('yamdb_http_request_duration_seconds', labels, duration)
+    metrics.inc('yamdb_db_queries_total', labels, queries)
+    metrics.inc('yamdb_db_query_duration_seconds_total', labels, db_duration)
+    metrics.flush()
+
+
+def record_cache_lookup(catalog, hit):
+    if enabled():
+        metrics.inc(
+            'yamdb_catalog_cache_lookups_total',
+            (('catalog', catalog), ('result', 'hit' if hit else 'miss')),
+        )
+
+
+def record_auth(endpoint, outcome):
+    if enabled():
+        metrics.inc(
+            'yamdb_auth_total',
+            (('endpoint', endpoint), ('outcome', outcome)),
+        )
+
+
+def record_import(file, rows, duration):
+    if enabled():
+        labels = (('file', file),)
+        metrics.inc('yamdb_import_rows_total', labels, rows)
+        metrics.inc('yamdb_import_duration_seconds_total', labels, duration)
@@ -0,0 +1,212 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import metrics, profiling
+from .nplusone import QueryShapes
+from .slowlog import SlowQueryLog
+from .stats import registry
+
+
+def view_name(request, view_func):
+    """
+    Имя представления для статистики.
+
+    Для вьюсетов DRF — «Класс.действие» (TitleViewSet.list), для
+    остальных представлений DRF — «Класс.метод», иначе — путь к функции.
+    """
+    cls = getattr(view_func, 'cls', None)
+    if cls is None:
+        return f'{view_func.__module__}.{view_func.__qualname__}'
+    method = request.method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{cls.__name__}.{actions.get(method, method)}'
+
+
+class RequestTiming:
+    """Замеры одного запроса."""
+
+    def __init__(self):
+        self.view = None
+        self.queries = 0
+        self.db = 0.0
+        self.serialize = 0.0
+        self.encode = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+    def server_timing(self, wall):
+        return (
+            f'total;dur={wall * 1000:.2f}, '
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f'serialize;dur={self.serialize * 1000:.2f}, '
+            f'encode;dur={self.encode * 1000:.2f}'
+        )
+
+
+class InstrumentationMiddleware:
+    """
+    Замеряет запросы по представлениям.
+
+    Для каждого запроса считаются общее время, число и время запросов
+    к БД, время сериализаторов ответа (в представлениях с
+    SerializeTimingMixin), время кодирования ответа рендерером DRF
+    (JSON, HTML) и размер ответа.
+    При INSTRUMENTATION_ENABLED итоги добавляются в заголовок
+    Server-Timing и в статистику процесса (monitoring.stats.registry),
+    при METRICS_ENABLED — в метрики Prometheus. Потоковые ответы
+    учитываются до начала отдачи, без размера.
+    """
+
+    def __init__(self, get_response):
+        if not (settings.INSTRUMENTATION_ENABLED or metrics.enabled()):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = request.timing = RequestTiming()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = self.get_response(request)
+        wall = time.perf_counter() - started
+        if metrics.enabled():
+            metrics.record_request(
+                timing.view or 'unresolved',
+                request.method,
+                response.status_code,
+                wall,
+                timing.queries,
+                timing.db,
+            )
+        if not settings.INSTRUMENTATION_ENABLED:
+            return response
+        response['Server-Timing'] = timing.server_timing(wall)
+        if timing.view is not None:
+            registry.record(timing.view, (
+                wall * 1000,
+                timing.db * 1000,
+                timing.queries,
+                timing.serialize * 1000,
+                timing.encode * 1000,
+                0 if response.streaming else len(response.content),
+            ))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.timing.view = view_name(request, view_func)
+
+    def process_template_response(self, request, response):
+        timing = request.timing
+        started = time.perf_counter()
+
+        def encoded(response):
+            timing.encode += time.perf_counter() - started
+
+        response.add_post_render_callback(encoded)
+        return response
+
+
+class NPlusOneMiddleware:
+    """
+    Ищет N+1: одинаковые по форме SQL-запросы в рамках одного запроса.
+
+    Если форма выполнена больше NPLUSONE_THRESHOLD раз, при
+    NPLUSONE_DETECTION='log' пишется предупреждение в лог
+    monitoring.nplusone, при 'raise' — выбрасывается NPlusOneError
+    (для тестов). При 'off' middleware отключается.
+    """
+
+    def __init__(self, get_response):
+        if settings.NPLUSONE_DETECTION not in ('log', 'raise'):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryShapes(settings.NPLUSONE_THRESHOLD) as shapes:
+            response = self.get_response(request)
+        shapes.report(
+            f'{request.method} {request.path}', settings.NPLUSONE_DETECTION
+        )
+        return response
+
+
+class SlowQueryMiddleware:
+    """
+    Пишет медленные запросы к БД в лог monitoring.slowqueries.
+
+    Включается SLOW_QUERY_LOG_ENABLED; пороги и файл лога задаются
+    настройками SLOW_QUERY_* (см. monitoring.slowlog).
+    """
+
+    def __init__(self, get_response):
+        if not settings.SLOW_QUERY_LOG_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        log = request.slow_query_log = SlowQueryLog(request)
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(log))
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.slow_query_log.view = view_name(request, view_func)
+
+
+class ProfilingMiddleware:
+    """
+    Профилирует запрос администратора, если тот об этом попросил.
+
+    Включается PROFILING_ENABLED; профиль запрашивается параметром
+    ?profile=1 (или именем профилировщика, например ?profile=pyinstrument)
+    либо заголовком X-Profile. Права проверяются по JWT здесь же, до
+    представления, поэтому запросы остальных пользователей выполняются
+    как обычно. Имя сохранённого трейса возвращается в заголовке
+    X-Profile-Id, скачать его можно по /api/v1/profiles/<имя>/.
+    Потоковые ответы профилируются до начала отдачи.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        kind = profiling.requested(request)
+        if kind is None or not self.is_admin(request):
+            return self.get_response(request)
+        if not profiling.lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response['X-Profile-Id'] = 'busy'
+            return response
+        try:
+            with profiling.PROFILERS[kind]() as profiler:
+                response = self.get_response(request)
+        finally:
+            profiling.lock.release()
+        response['X-Profile-Id'] = profiling.save(
+            profiler, f'{request.method} {request.path}'
+        )
+        return response
+
+    @staticmethod
+    def is_admin(request):
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except APIException:
+            return False
+        return authenticated is not None and authenticated[0].is_admin
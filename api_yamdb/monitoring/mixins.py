@@ -0,0 +1,34 @@
+import time
+
+
+class SerializeTimingMixin:
+    """
+    Замеряет время сериализации ответа представления DRF.
+
+    Для сериализатора из get_serializer (или переданного в timed)
+    замеряется to_representation верхнего уровня — всё вычисление .data,
+    включая вложенные сериализаторы и, при many=True, все строки списка.
+    Время копится в request.timing.serialize, который создаёт
+    InstrumentationMiddleware; без неё сериализатор не меняется.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        return self.timed(super().get_serializer(*args, **kwargs))
+
+    def timed(self, serializer):
+        timing = getattr(self.request, 'timing', None)
+        if timing is None:
+            return serializer
+        to_representation = serializer.to_representation
+
+        def timed_to_representation(instance):
+            started = time.perf_counter()
+            try:
+                return to_representation(instance)
+            finally:
+                timing.serialize += time.perf_counter() - started
+
+        # Атрибут экземпляра перекрывает метод класса только у этого
+        # сериализатора: вложенные и дочерние не замеряются повторно.
+        serializer.to_representation = timed_to_representation
+        return serializer
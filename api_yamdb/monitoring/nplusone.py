@@ -0,0 +1,70 @@
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Списки параметров IN (%s, %s, ...) разной длины дают одну форму.
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+WHITESPACE = re.compile(r'\s+')
+# Управление транзакциями и точками сохранения не считается.
+IGNORED_PREFIXES = (
+    'BEGIN', 'COMMIT', 'ROLLBACK', 'SAVEPOINT', 'RELEASE SAVEPOINT'
+)
+
+
+class NPlusOneError(Exception):
+    """Один и тот же по форме запрос выполнен слишком много раз."""
+
+
+def query_shape(sql):
+    """SQL без различий в числе параметров IN и пробелах."""
+    return IN_LIST.sub('IN (...)', WHITESPACE.sub(' ', sql.strip()))
+
+
+class QueryShapes:
+    """
+    Считает выполненные SQL-запросы по форме на всех подключениях.
+
+    Используется как контекстный менеджер; repeated() возвращает формы,
+    выполненные больше threshold раз, — признак N+1.
+    """
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+        self.counts = Counter()
+        self.stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.startswith(IGNORED_PREFIXES):
+            self.counts[query_shape(sql)] += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+    def repeated(self):
+        return {
+            shape: count for shape, count in self.counts.most_common()
+            if count > self.threshold
+        }
+
+    def report(self, where, mode):
+        """Сообщает о N+1 в лог ('log') или исключением ('raise')."""
+        repeated = self.repeated()
+        if not repeated:
+            return
+        message = f'N+1 в {where}: ' + '; '.join(
+            f'{count} раз: {shape}' for shape, count in repeated.items()
+        )
+        if mode == 'raise':
+            raise NPlusOneError(message)
+        logger.warning(message)
@@ -0,0 +1,179 @@
+"""
+Профилирование отдельных запросов и команд.
+
+Профиль по умолчанию снимает детерминированный cProfile: файл .prof
+открывается pstats, snakeviz или gprof2dot. Если установлен
+pyinstrument, доступен и семплирующий профилировщик: его трейс —
+HTML-страница с деревом вызовов. Трейсы хранятся в PROFILING_DIR,
+старые удаляются, когда их больше PROFILING_KEEP.
+"""
+import cProfile
+import io
+import pstats
+import re
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.text import slugify
+
+try:
+    import pyinstrument
+except ImportError:  # pragma: no cover - pyinstrument необязателен
+    pyinstrument = None
+
+# Профилирование запроса включается параметром ?profile=... или
+# заголовком X-Profile: имя профилировщика или одно из TRUE_VALUES.
+PROFILE_PARAM = 'profile'
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+TRUE_VALUES = ('1', 'true', 'yes')
+# Имена трейсов: только те, что создаёт trace_name.
+TRACE_NAME = re.compile(r'[\w-]+\.(prof|html)')
+SLUG_MAX_LENGTH = 60
+
+
+class CProfileProfiler:
+    """Детерминированный профилировщик: учитывает каждый вызов."""
+
+    extension = 'prof'
+    content_type = 'application/octet-stream'
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+
+    def __enter__(self):
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.disable()
+
+    def save(self, path):
+        self.profiler.dump_stats(path)
+
+    def summary(self, limit):
+        """Функции с наибольшим суммарным временем, текстом pstats."""
+        out = io.StringIO()
+        pstats.Stats(self.profiler, stream=out).sort_stats(
+            pstats.SortKey.CUMULATIVE
+        ).print_stats(limit)
+        return out.getvalue()
+
+
+class PyinstrumentProfiler:
+    """Семплирующий профилировщик: дешевле на коде с частыми вызовами."""
+
+    extension = 'html'
+    content_type = 'text/html; charset=utf-8'
+
+    def __init__(self):
+        self.profiler = pyinstrument.Profiler()
+
+    def __enter__(self):
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+
+    def save(self, path):
+        Path(path).write_text(self.profiler.output_html(), encoding='utf-8')
+
+    def summary(self, limit):
+        return self.profiler.output_text()
+
+
+# Доступные профилировщики: имя -> класс.
+PROFILERS = {'cprofile': CProfileProfiler}
+if pyinstrument is not None:
+    PROFILERS['pyinstrument'] = PyinstrumentProfiler
+
+# В процессе одновременно работает только один профилировщик: начиная
+# с Python 3.12 cProfile не запускается, пока активен другой.
+lock = threading.Lock()
+
+
+def requested(request):
+    """Имя профилировщика, запрошенного для request, или None."""
+    value = request.GET.get(PROFILE_PARAM) or request.META.get(
+        PROFILE_HEADER, ''
+    )
+    value = value.strip().lower()
+    if value in PROFILERS:
+        return value
+    if value in TRUE_VALUES:
+        return settings.PROFILING_PROFILER
+    return None
+
+
+def directory():
+    return Path(settings.PROFILING_DIR)
+
+
+def trace_name(label, extension):
+    """Имя файла трейса: время, метка и случайный суффикс."""
+    slug = slugify(label)[:SLUG_MAX_LENGTH] or 'trace'
+    return (
+        f'{datetime.now():%Y%m%d-%H%M%S}-{slug}-{uuid.uuid4().hex[:8]}'
+        f'.{extension}'
+    )
+
+
+def save(profiler, label):
+    """Сохраняет трейс в PROFILING_DIR; возвращает имя файла."""
+    path = directory()
+    path.mkdir(parents=True, exist_ok=True)
+    name = trace_name(label, profiler.extension)
+    profiler.save(path / name)
+    prune()
+    return name
+
+
+def traces():
+    """Файлы трейсов, новые первыми."""
+    path = directory()
+    if not path.is_dir():
+        return []
+    return sorted(
+        (
+            file for file in path.iterdir()
+            if TRACE_NAME.fullmatch(file.name) and file.is_file()
+        ),
+        key=lambda file: file.stat().st_mtime,
+        reverse=True,
+    )
+
+
+def describe(path):
+    stat = path.stat()
+    return {
+        'name': path.name,
+        'size': stat.st_size,
+        'created': datetime.fromtimestamp(
+            stat.st_mtime, timezone.utc
+        ).isoformat(),
+    }
+
+
+def prune():
+    """Удаляет трейсы сверх PROFILING_KEEP, начиная со старых."""
+    for file in traces()[settings.PROFILING_KEEP:]:
+        file.unlink(missing_ok=True)
+
+
+def trace_path(name):
+    """Путь к трейсу name или None, если его нет или имя чужое."""
+    if not TRACE_NAME.fullmatch(name):
+        return None
+    path = directory() / name
+    return path if path.is_file() else None
+
+
+def content_type(name):
+    extension = name.rsplit('.', 1)[-1]
+    for profiler in (CProfileProfiler, PyinstrumentProfiler):
+        if profiler.extension == extension:
+            return profiler.content_type
+    return 'application/octet-stream'
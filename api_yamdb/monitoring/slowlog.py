@@ -0,0 +1,92 @@
+"""
+Журнал медленных запросов к БД.
+
+Запросы дольше SLOW_QUERY_THRESHOLD миллисекунд пишутся в лог
+monitoring.slowqueries вместе с параметрами, длительностью и
+представлением, из которого они выполнены; для запросов дольше
+SLOW_QUERY_EXPLAIN_THRESHOLD к записи добавляется план выполнения.
+Лог — JSON по строке на запрос (см. JSONFormatter и LOGGING в settings).
+"""
+import json
+import logging
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+
+logger = logging.getLogger('monitoring.slowqueries')
+
+# Префикс запроса плана для СУБД; для остальных план не снимается.
+EXPLAIN_PREFIXES = {
+    'sqlite': 'EXPLAIN QUERY PLAN ',
+    'postgresql': 'EXPLAIN ',
+}
+# План снимается только для чтения: EXPLAIN изменяющих запросов
+# в некоторых СУБД может иметь побочные эффекты.
+EXPLAINABLE = ('SELECT', 'WITH')
+
+
+def explain(connection, sql, params):
+    """План запроса строками: detail для SQLite, текст плана для PostgreSQL."""
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or not sql.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        return [str(row[-1]) for row in cursor.fetchall()]
+
+
+class SlowQueryLog:
+    """Обёртка execute, которая пишет медленные запросы одного запроса."""
+
+    def __init__(self, request):
+        self.method = request.method
+        self.path = request.path
+        self.view = None
+        self.explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.explaining:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - started) * 1000
+        if duration >= settings.SLOW_QUERY_THRESHOLD:
+            self.log(sql, params, many, context['connection'], duration)
+        return result
+
+    def log(self, sql, params, many, connection, duration):
+        plan = None
+        if not many and duration >= settings.SLOW_QUERY_EXPLAIN_THRESHOLD:
+            self.explaining = True
+            try:
+                plan = explain(connection, sql, params)
+            finally:
+                self.explaining = False
+        logger.info('%.1f ms %s', duration, sql, extra={'query': {
+            'view': self.view,
+            'method': self.method,
+            'path': self.path,
+            'database': connection.alias,
+            'duration_ms': round(duration, 3),
+            'sql': sql,
+            'params': params if not many else None,
+            'plan': plan,
+        }})
+
+
+class JSONFormatter(logging.Formatter):
+    """Одна JSON-строка на запись; поля запроса — из extra={'query': ...}."""
+
+    def format(self, record):
+        data = {
+            'time': datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        data.update(getattr(record, 'query', None) or {
+            'message': record.getMessage()
+        })
+        return json.dumps(data, ensure_ascii=False, default=str)
@@ -0,0 +1,71 @@
+import threading
+from collections import deque
+
+from django.conf import settings
+
+# Поля замера запроса: время в мс, число запросов к БД, размер в байтах.
+SAMPLE_FIELDS = (
+    'wall_ms', 'db_ms', 'queries', 'serialize_ms', 'encode_ms', 'size'
+)
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values, percent):
+    """Перцентиль отсортированного списка по ближайшему рангу."""
+    rank = max(1, -(-len(values) * percent // 100))
+    return values[rank - 1]
+
+
+class ViewStats:
+    """Счётчик запросов и последние замеры одного представления."""
+
+    def __init__(self, size):
+        self.count = 0
+        self.samples = deque(maxlen=size)
+
+    def summary(self):
+        summary = {'count': self.count, 'samples': len(self.samples)}
+        for index, field in enumerate(SAMPLE_FIELDS):
+            values = sorted(sample[index] for sample in self.samples)
+            summary[field] = {
+                f'p{percent}': percentile(values, percent)
+                for percent in PERCENTILES
+            } if values else None
+        return summary
+
+
+class Registry:
+    """
+    Замеры запросов процесса по представлениям.
+
+    Для каждого представления хранится не больше INSTRUMENTATION_SAMPLES
+    последних замеров, перцентили считаются по ним при чтении.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, sample):
+        with self.lock:
+            stats = self.views.get(view)
+            if stats is None:
+                stats = self.views[view] = ViewStats(
+                    settings.INSTRUMENTATION_SAMPLES
+                )
+            stats.count += 1
+            stats.samples.append(sample)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                view: stats.summary()
+                for view, stats in sorted(self.views.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.views.clear()
+
+
+registry = Registry()
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+
+from . import metrics
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Метрики всех процессов в текстовом формате Prometheus.
+
+    Доступно при METRICS_ENABLED; если задан METRICS_TOKEN, нужен
+    заголовок Authorization: Bearer <METRICS_TOKEN>.
+    """
+    if not metrics.enabled():
+        raise Http404
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''),
+        f'Bearer {settings.METRICS_TOKEN}',
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        metrics.render(*metrics.metrics.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
@@ -33,8 +33,8 @@ class TitleAdmin(admin.ModelAdmin):
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ('author', 'title', 'score', 'pub_date')
-    list_filter = ('score', 'pub_date', 'title')
+    list_display = ('author', 'title', 'score', 'pub_date', 'is_hidden')
+    list_filter = ('score', 'pub_date', 'is_hidden', 'is_deleted', 'title')
     search_fields = ('text', 'author__username', 'title__name')
     readonly_fields = ('pub_date',)
     raw_id_fields = ('author', 'title')
@@ -42,8 +42,8 @@ class ReviewAdmin(admin.ModelAdmin):
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
-    list_display = ('author', 'review', 'text', 'pub_date')
-    list_filter = ('pub_date', 'author')
+    list_display = ('author', 'review', 'text', 'pub_date', 'is_hidden')
+    list_filter = ('pub_date', 'is_hidden', 'is_deleted', 'author')
     search_fields = ('text', 'author__username', 'review__text')
     readonly_fields = ('pub_date',)
     raw_id_fields = ('author', 'review')
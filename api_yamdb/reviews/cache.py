@@ -0,0 +1,151 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+from monitoring.metrics import record_cache_lookup
+
+from .models import CatalogVersion, Category, Genre
+
+# Версия справочника, строка которого ещё ни разу не менялась.
+INITIAL_VERSION = ''
+
+
+class SharedVersions:
+    """
+    Версии всех справочников из CatalogVersion.
+
+    Читаются одним запросом для всех кэшей и не чаще раза в
+    CATALOG_CACHE_CHECK_INTERVAL секунд.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+        self.checked_at = None
+
+    def get(self, name):
+        now = time.monotonic()
+        with self.lock:
+            if self.checked_at is None or (
+                now - self.checked_at >= settings.CATALOG_CACHE_CHECK_INTERVAL
+            ):
+                self.values = dict(
+                    CatalogVersion.objects.values_list('name', 'version')
+                )
+                self.checked_at = now
+            return self.values.get(name, INITIAL_VERSION)
+
+    def set(self, name, version):
+        with self.lock:
+            self.values[name] = version
+
+
+shared_versions = SharedVersions()
+
+
+class CatalogCache:
+    """
+    Процессный кэш всех строк небольшого справочника по id и slug.
+
+    Версия справочника хранится строкой CatalogVersion в базе, общей
+    для всех процессов. Изменение строки в любом процессе меняет версию,
+    и процессы перечитывают таблицу при следующем обращении: свой —
+    сразу, остальные — не позже чем через CATALOG_CACHE_CHECK_INTERVAL
+    секунд (версии всех справочников сверяются одним запросом).
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.name = model._meta.label_lower
+        self.lock = threading.Lock()
+        self.version = None
+        self.by_id = {}
+        self.by_slug = {}
+
+    def __deepcopy__(self, memo):
+        # Кэш общий для процесса: поля сериализаторов копируют его ссылкой.
+        return self
+
+    def load(self, force=False):
+        """
+        Перечитывает таблицу, если версия в базе изменилась.
+
+        force — перечитать в любом случае, например при промахе по id.
+        """
+        version = shared_versions.get(self.name)
+        hit = version == self.version and not force
+        record_cache_lookup(self.model._meta.model_name, hit=hit)
+        if hit:
+            return
+        with self.lock:
+            objects = list(self.model.objects.all())
+            by_slug = {}
+            for obj in objects:
+                by_slug.setdefault(obj.slug.lower(), []).append(obj)
+            self.by_id = {obj.pk: obj for obj in objects}
+            self.by_slug = by_slug
+            self.version = version
+
+    def get(self, pk):
+        """
+        Объект по id или None.
+
+        id берутся из строк базы (category_id, связи с жанрами), поэтому
+        промах значит, что кэш устарел: таблица перечитывается.
+        """
+        self.load()
+        obj = self.by_id.get(pk)
+        if obj is None:
+            self.load(force=True)
+            obj = self.by_id.get(pk)
+        return obj
+
+    def get_by_slug(self, slug):
+        """Объект с точно таким slug или None."""
+        self.load()
+        for obj in self.by_slug.get(slug.lower(), ()):
+            if obj.slug == slug:
+                return obj
+        return None
+
+    def in_bulk_by_slug(self, slugs):
+        """Словарь {slug: объект} для найденных slug, как QuerySet.in_bulk."""
+        found = {}
+        for slug in slugs:
+            obj = self.get_by_slug(slug)
+            if obj is not None:
+                found[slug] = obj
+        return found
+
+    def filter_slug_iexact(self, slug):
+        """Объекты со slug, совпадающим без учёта регистра."""
+        self.load()
+        return list(self.by_slug.get(slug.lower(), ()))
+
+    def invalidate(self, local_only=False):
+        """
+        Сбрасывает кэш процесса, а если не local_only — и общую версию.
+
+        Общую версию стоит менять после фиксации транзакции, иначе другой
+        процесс может успеть перечитать таблицу без изменений.
+        """
+        self.version = None
+        if local_only:
+            return
+        version = uuid.uuid4().hex
+        # Один INSERT ... ON CONFLICT DO UPDATE: строки версии может
+        # ещё не быть.
+        CatalogVersion.objects.bulk_create(
+            [CatalogVersion(name=self.name, version=version)],
+            update_conflicts=True,
+            unique_fields=['name'],
+            update_fields=['version'],
+        )
+        shared_versions.set(self.name, version)
+
+
+categories = CatalogCache(Category)
+genres = CatalogCache(Genre)
+CATALOG_CACHES = {Category: categories, Genre: genres}
@@ -2,6 +2,7 @@ import string
 
 MIN_SCORE = 1
 MAX_SCORE = 10
+DEFAULT_PRIOR_MEAN = (MIN_SCORE + MAX_SCORE) / 2
 SLUG_MAX_LENGTH = 50
 NAME_MAX_LENGTH = 256
 USER = 'user'
@@ -13,3 +14,46 @@ EMAIL_MAX_LENGTH = 254
 CONFIRMATION_CODE_LENGTH = 20
 CONFIRMATION_CODE_CHARS = string.ascii_uppercase + string.digits
 EDIT_PROFILE_URL = 'me'
+GENRE_MODE_ANY = 'any'
+GENRE_MODE_ALL = 'all'
+GENRE_MODE_CHOICES = (
+    (GENRE_MODE_ANY, 'Хотя бы один из жанров'),
+    (GENRE_MODE_ALL, 'Все перечисленные жанры'),
+)
+LEADERBOARD_SIZE = 100
+# Сколько отмеченных произведений refresh_leaderboards --stale
+# обрабатывает в одной транзакции.
+LEADERBOARD_REFRESH_BATCH_SIZE = 500
+LEADERBOARD_OVERALL = 'overall'
+LEADERBOARD_CATEGORY = 'category'
+LEADERBOARD_GENRE = 'genre'
+LEADERBOARD_YEAR = 'year'
+TITLES_BATCH_MAX_SIZE = 200
+UNIQUE_REVIEW = 'unique_review'
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_NDJSON = 'ndjson'
+EXPORT_CSV = 'csv'
+MODERATION_DELETE = 'delete'
+MODERATION_HIDE = 'hide'
+MODERATION_UNHIDE = 'unhide'
+MODERATION_ACTIONS = (
+    (MODERATION_DELETE, 'Удалить'),
+    (MODERATION_HIDE, 'Скрыть'),
+    (MODERATION_UNHIDE, 'Показать'),
+)
+MODERATION_TARGET_REVIEWS = 'reviews'
+MODERATION_TARGET_COMMENTS = 'comments'
+MODERATION_TARGET_ALL = 'all'
+MODERATION_TARGETS = (
+    (MODERATION_TARGET_ALL, 'Отзывы и комментарии'),
+    (MODERATION_TARGET_REVIEWS, 'Отзывы'),
+    (MODERATION_TARGET_COMMENTS, 'Комментарии'),
+)
+DELETION_TARGET_USER = 'user'
+DELETION_TARGET_TITLE = 'title'
+DELETION_TARGET_CATEGORY = 'category'
+DELETION_PENDING = 'pending'
+DELETION_RUNNING = 'running'
+DELETION_DONE = 'done'
+DELETION_FAILED = 'failed'
+DELETION_BATCH_SIZE = 500
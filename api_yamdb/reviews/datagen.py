@@ -0,0 +1,225 @@
+"""
+Синтетические данные для нагрузочных тестов в формате CSV load_data.
+
+Все файлы пишутся построчно, в памяти держится только состояние одного
+произведения, поэтому объём данных ограничен лишь диском. Одинаковые
+параметры и seed дают одинаковые файлы.
+
+Число отзывов на произведение распределено по закону Ципфа: у
+произведения с местом r по популярности вес 1 / r ** s. Авторы отзывов
+на одно произведение не повторяются: это элементы арифметической
+прогрессии по модулю числа пользователей с шагом, взаимно простым с ним.
+"""
+import csv
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .constants import ADMIN, MAX_SCORE, MIN_SCORE, MODERATOR, USER
+
+FILES = {
+    'category': ('id', 'name', 'slug'),
+    'genre': ('id', 'name', 'slug'),
+    'titles': ('id', 'name', 'year', 'category'),
+    'genre_title': ('id', 'title_id', 'genre_id'),
+    'users': (
+        'id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name'
+    ),
+    'review': ('id', 'title_id', 'text', 'author', 'score', 'pub_date'),
+    'comments': ('id', 'review_id', 'text', 'author', 'pub_date'),
+}
+
+# Каждый MODERATORS_EVERY-й пользователь — модератор, первый — админ.
+MODERATORS_EVERY = 1000
+# Годы выпуска не зависят от текущей даты, чтобы данные повторялись.
+FIRST_YEAR = 1900
+LAST_YEAR = 2024
+# Отзывы и комментарии пишутся в этом промежутке.
+PUBLISHED_FROM = datetime(2015, 1, 1, tzinfo=timezone.utc)
+PUBLISHED_DAYS = 365 * 10
+# Разброс оценок вокруг «качества» произведения.
+SCORE_SPREAD = 2.0
+
+PHRASES = (
+    'Отличная работа',
+    'Смотрел на одном дыхании',
+    'Ожидал большего',
+    'Сюжет затянут',
+    'Актёры великолепны',
+    'Финал разочаровал',
+    'Пересматриваю каждый год',
+    'Не для всех',
+    'Классика жанра',
+    'Середина провисает',
+    'Рекомендую друзьям',
+    'Слишком предсказуемо',
+)
+
+
+@dataclass
+class Sizes:
+    """Объём генерируемых данных."""
+
+    users: int
+    titles: int
+    reviews: int
+    comments: int
+    categories: int
+    genres: int
+    max_genres: int
+    zipf: float
+
+
+def coprime_step(rnd, modulus):
+    """Случайный шаг, взаимно простой с modulus."""
+    if modulus == 1:
+        return 1
+    step = rnd.randrange(1, modulus)
+    while math.gcd(step, modulus) != 1:
+        step = step % (modulus - 1) + 1
+    return step
+
+
+def zipf_counts(total, size, exponent):
+    """
+    Числа отзывов для мест 1..size по закону Ципфа, в сумме total.
+
+    Округляется накопленная сумма, а не каждая доля, поэтому итог точно
+    равен total; вес считается на лету, без списка всех весов.
+    """
+    harmonic = math.fsum(1 / rank ** exponent for rank in range(1, size + 1))
+    cumulative = 0.0
+    issued = 0
+    for rank in range(1, size + 1):
+        cumulative += 1 / rank ** exponent
+        count = round(total * cumulative / harmonic) - issued
+        issued += count
+        yield count
+
+
+def timestamp(moment):
+    """Дата в формате исходных фикстур: 2019-09-24T21:08:21.567Z."""
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.') + (
+        f'{moment.microsecond // 1000:03d}Z'
+    )
+
+
+def random_moment(rnd, after=None):
+    start = after or PUBLISHED_FROM
+    end = PUBLISHED_FROM + timedelta(days=PUBLISHED_DAYS)
+    seconds = max(int((end - start).total_seconds()), 1)
+    return start + timedelta(
+        seconds=rnd.randrange(seconds), milliseconds=rnd.randrange(1000)
+    )
+
+
+def random_text(rnd):
+    return '. '.join(rnd.sample(PHRASES, rnd.randint(1, 4))) + '.'
+
+
+class Writer:
+    """CSV-файлы load_data в директории path и счётчики их строк."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.files = {}
+        self.writers = {}
+        self.rows = dict.fromkeys(FILES, 0)
+
+    def __enter__(self):
+        for name, header in FILES.items():
+            file = open(
+                self.path / f'{name}.csv', 'w', encoding='utf-8', newline=''
+            )
+            self.files[name] = file
+            self.writers[name] = csv.writer(file)
+            self.writers[name].writerow(header)
+        return self
+
+    def __exit__(self, *exc_info):
+        for file in self.files.values():
+            file.close()
+
+    def write(self, name, *row):
+        self.rows[name] += 1
+        self.writers[name].writerow(row)
+
+
+def generate(path, sizes, seed=0):
+    """Пишет набор данных sizes в path; возвращает число строк по файлам."""
+    rnd = random.Random(seed)
+    with Writer(path) as out:
+        for pk in range(1, sizes.categories + 1):
+            out.write('category', pk, f'Категория {pk}', f'category-{pk}')
+        for pk in range(1, sizes.genres + 1):
+            out.write('genre', pk, f'Жанр {pk}', f'genre-{pk}')
+        for pk in range(1, sizes.users + 1):
+            role = (
+                ADMIN if pk == 1
+                else MODERATOR if pk % MODERATORS_EVERY == 0
+                else USER
+            )
+            out.write(
+                'users', pk, f'user{pk}', f'user{pk}@yamdb.fake', role,
+                '', '', ''
+            )
+
+        # Места по популярности разбросаны по id произведений
+        # перестановкой rank -> rank * step mod titles.
+        title_step = coprime_step(rnd, sizes.titles)
+        counts = zipf_counts(sizes.reviews, sizes.titles, sizes.zipf)
+        # Отзывы сверх числа пользователей переходят к следующему месту.
+        carry = 0
+        for rank, count in enumerate(counts):
+            title_id = rank * title_step % sizes.titles + 1
+            out.write(
+                'titles', title_id, f'Произведение {title_id}',
+                rnd.randint(FIRST_YEAR, LAST_YEAR),
+                rnd.randint(1, sizes.categories),
+            )
+            for genre_id in sorted(rnd.sample(
+                range(1, sizes.genres + 1),
+                rnd.randint(1, min(sizes.max_genres, sizes.genres)),
+            )):
+                out.write(
+                    'genre_title', out.rows['genre_title'] + 1, title_id,
+                    genre_id,
+                )
+            carry += count - write_reviews(
+                out, rnd, sizes, title_id, count + carry
+            )
+    return out.rows
+
+
+def write_reviews(out, rnd, sizes, title_id, count):
+    """Отзывы на произведение и комментарии к ним; возвращает их число."""
+    # Один пользователь пишет на произведение не больше одного отзыва.
+    count = min(count, sizes.users)
+    author_step = coprime_step(rnd, sizes.users)
+    first_author = rnd.randrange(sizes.users)
+    quality = rnd.uniform(MIN_SCORE + 1, MAX_SCORE - 1)
+    comments_per_review = sizes.comments / max(sizes.reviews, 1)
+    for index in range(count):
+        review_id = out.rows['review'] + 1
+        published = random_moment(rnd)
+        score = round(rnd.gauss(quality, SCORE_SPREAD))
+        out.write(
+            'review', review_id, title_id, random_text(rnd),
+            (first_author + index * author_step) % sizes.users + 1,
+            min(max(score, MIN_SCORE), MAX_SCORE), timestamp(published),
+        )
+        # Комментарии распределены по отзывам равномерно, с округлением
+        # накопленной суммы, как в zipf_counts.
+        comments = round(review_id * comments_per_review) - out.rows[
+            'comments'
+        ]
+        for _ in range(comments):
+            out.write(
+                'comments', out.rows['comments'] + 1, review_id,
+                random_text(rnd), rnd.randint(1, sizes.users),
+                timestamp(random_moment(rnd, after=published)),
+            )
+    return count
@@ -0,0 +1,163 @@
+import time
+from collections import defaultdict
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from .constants import (
+    DELETION_DONE,
+    DELETION_FAILED,
+    DELETION_PENDING,
+    DELETION_RUNNING,
+    DELETION_TARGET_CATEGORY,
+    DELETION_TARGET_TITLE,
+    DELETION_TARGET_USER,
+    LEADERBOARD_CATEGORY,
+)
+from .leaderboards import refresh_leaderboards, title_boards
+from .models import (
+    Category,
+    Comment,
+    DeletionJob,
+    LeaderboardEntry,
+    Review,
+    Title,
+)
+from .signals import score_signals_muted
+from .stats import refresh_title_ratings
+
+User = get_user_model()
+
+
+def batches(queryset, batch_size, pause=0.0):
+    """
+    Отдаёт списки pk строк queryset пакетами по batch_size.
+
+    Следующий пакет выбирается заново, поэтому вызывающий код должен
+    удалить или изменить строки пакета так, чтобы они выпали из queryset.
+    """
+    while True:
+        ids = list(
+            queryset.order_by('pk').values_list('pk', flat=True)[:batch_size]
+        )
+        if not ids:
+            return
+        yield ids
+        if pause:
+            time.sleep(pause)
+
+
+def delete_in_batches(queryset, batch_size, pause=0.0):
+    """Удаляет строки queryset пакетами, возвращает их количество."""
+    total = 0
+    for ids in batches(queryset, batch_size, pause):
+        queryset.model.objects.filter(pk__in=ids).delete()
+        total += len(ids)
+    return total
+
+
+def delete_reviews_in_batches(reviews, batch_size, pause=0.0,
+                              refresh_ratings=True):
+    """
+    Удаляет отзывы вместе с комментариями пакетами.
+
+    Перед каждым пакетом отзывов пакетами удаляются комментарии к ним.
+    Сигналы счётчиков отключены, а рейтинги затронутых произведений
+    пересчитываются один раз на пакет (если refresh_ratings).
+    """
+    total = 0
+    for ids in batches(reviews, batch_size, pause):
+        total += delete_in_batches(
+            Comment.objects.filter(review_id__in=ids), batch_size, pause
+        )
+        batch = Review.objects.filter(pk__in=ids)
+        title_ids = set(batch.values_list('title_id', flat=True))
+        with score_signals_muted():
+            batch.delete()
+        if refresh_ratings:
+            refresh_title_ratings(title_ids)
+        total += len(ids)
+    return total
+
+
+def drain_user(user_id, batch_size, pause):
+    total = delete_in_batches(
+        Comment.objects.filter(author_id=user_id), batch_size, pause
+    )
+    total += delete_reviews_in_batches(
+        Review.objects.filter(author_id=user_id), batch_size, pause
+    )
+    User.objects.filter(pk=user_id).delete()
+    return total
+
+
+def drain_title(title_id, batch_size, pause):
+    total = delete_reviews_in_batches(
+        Review.objects.filter(title_id=title_id),
+        batch_size,
+        pause,
+        refresh_ratings=False,
+    )
+    boards = title_boards([title_id])
+    Title.objects.filter(pk=title_id).delete()
+    keys = defaultdict(list)
+    for board, key in boards:
+        keys[board].append(key)
+    refresh_leaderboards(keys)
+    return total
+
+
+def drain_category(category_id, batch_size, pause):
+    total = 0
+    titles = Title.objects.filter(category_id=category_id)
+    for ids in batches(titles, batch_size, pause):
+        total += Title.objects.filter(pk__in=ids).update(category=None)
+    LeaderboardEntry.objects.filter(
+        board=LEADERBOARD_CATEGORY, key=str(category_id)
+    ).delete()
+    Category.objects.filter(pk=category_id).delete()
+    return total
+
+
+DRAINERS = {
+    DELETION_TARGET_USER: drain_user,
+    DELETION_TARGET_TITLE: drain_title,
+    DELETION_TARGET_CATEGORY: drain_category,
+}
+
+
+def schedule_deletion(target, instance):
+    """
+    Создаёт задание на удаление и скрывает объект из API.
+
+    Пользователь сразу деактивируется, чтобы его токены перестали
+    действовать.
+    """
+    with transaction.atomic():
+        job = DeletionJob.objects.create(target=target, object_id=instance.pk)
+        if target == DELETION_TARGET_USER:
+            instance.is_active = False
+            instance.save(update_fields=['is_active'])
+    return job
+
+
+def run_deletion_job(job, batch_size, pause=0.0):
+    """Выполняет задание; ошибка сохраняется в задании и пробрасывается."""
+    job.status = DELETION_RUNNING
+    job.save(update_fields=['status'])
+    try:
+        job.processed = DRAINERS[job.target](job.object_id, batch_size, pause)
+        job.status = DELETION_DONE
+    except Exception as error:
+        job.status = DELETION_FAILED
+        job.error = repr(error)
+        raise
+    finally:
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'processed', 'error', 'finished_at'])
+    return job
+
+
+def pending_jobs():
+    return DeletionJob.objects.filter(status=DELETION_PENDING)
@@ -0,0 +1,263 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import CharField, Count, F, Min, Q, Value, Window
+from django.db.models.functions import Cast, RowNumber
+
+from .constants import (
+    LEADERBOARD_CATEGORY,
+    LEADERBOARD_GENRE,
+    LEADERBOARD_OVERALL,
+    LEADERBOARD_REFRESH_BATCH_SIZE,
+    LEADERBOARD_SIZE,
+    LEADERBOARD_YEAR,
+)
+from .models import (
+    LEADERBOARD_CHOICES,
+    LeaderboardEntry,
+    StaleLeaderboard,
+    StaleLeaderboardTitle,
+    Title,
+)
+
+TitleGenre = Title.genre.through
+
+BOARDS = [board for board, _ in LEADERBOARD_CHOICES]
+
+
+def ranked_rows(board, keys=None):
+    """
+    Лучшие произведения доски board по взвешенному рейтингу.
+
+    Возвращает кортежи (ключ, id произведения, рейтинг, место) для всех
+    ключей доски (или только для keys) одним запросом с оконной функцией.
+    """
+    if board == LEADERBOARD_GENRE:
+        rows = TitleGenre.objects.filter(title__weighted_rating__isnull=False)
+        key, title, prefix = F('genre_id'), F('title_id'), 'title__'
+    else:
+        rows = Title.objects.filter(weighted_rating__isnull=False)
+        key, title, prefix = {
+            LEADERBOARD_OVERALL: Value(''),
+            LEADERBOARD_CATEGORY: F('category_id'),
+            LEADERBOARD_YEAR: F('year'),
+        }[board], F('pk'), ''
+        if board == LEADERBOARD_CATEGORY:
+            rows = rows.filter(category__isnull=False)
+    rows = rows.annotate(
+        board_key=Cast(key, output_field=CharField()),
+        board_title=title,
+        board_rating=F(f'{prefix}weighted_rating'),
+    )
+    if keys is not None:
+        rows = rows.filter(board_key__in=keys)
+    return rows.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=(
+                None if board == LEADERBOARD_OVERALL else [F('board_key')]
+            ),
+            order_by=[
+                F('board_rating').desc(),
+                F(f'{prefix}name').asc(),
+                F('board_title').asc(),
+            ],
+        )
+    ).filter(position__lte=LEADERBOARD_SIZE).values_list(
+        'board_key', 'board_title', 'board_rating', 'position'
+    )
+
+
+def refresh_leaderboards(stale):
+    """
+    Пересчитывает доски stale: {доска: ключи или None — вся доска}.
+
+    Старые записи всех досок удаляются одним запросом и новые вставляются
+    одним bulk_create, а не по запросу на каждую доску.
+    """
+    if not stale:
+        return
+    condition = Q()
+    for board, keys in stale.items():
+        condition |= (
+            Q(board=board) if keys is None else Q(board=board, key__in=keys)
+        )
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(condition).delete()
+        LeaderboardEntry.objects.bulk_create(
+            LeaderboardEntry(
+                board=board,
+                key=key,
+                title_id=title_id,
+                weighted_rating=rating,
+                position=position,
+            )
+            for board, keys in stale.items()
+            for key, title_id, rating, position in ranked_rows(board, keys)
+        )
+
+
+def refresh_leaderboard(board, keys=None):
+    """Пересчитывает доску board целиком или только для ключей keys."""
+    refresh_leaderboards({board: keys})
+
+
+def refresh_all_leaderboards():
+    """Пересчитывает все доски; отметки устаревших досок больше не нужны."""
+    with transaction.atomic():
+        StaleLeaderboardTitle.objects.all().delete()
+        StaleLeaderboard.objects.all().delete()
+        refresh_leaderboards(dict.fromkeys(BOARDS))
+
+
+def title_boards(title_ids):
+    """Доски, в которые входят или входили произведения title_ids."""
+    boards = set()
+    titles = Title.objects.filter(pk__in=title_ids).values_list(
+        'category_id', 'year'
+    )
+    for category_id, year in titles:
+        boards.add((LEADERBOARD_OVERALL, ''))
+        boards.add((LEADERBOARD_YEAR, str(year)))
+        if category_id is not None:
+            boards.add((LEADERBOARD_CATEGORY, str(category_id)))
+    boards.update(
+        (LEADERBOARD_GENRE, str(genre_id))
+        for genre_id in TitleGenre.objects.filter(
+            title_id__in=title_ids
+        ).values_list('genre_id', flat=True)
+    )
+    boards.update(
+        LeaderboardEntry.objects.filter(title_id__in=title_ids)
+        .values_list('board', 'key')
+    )
+    return boards
+
+
+def refresh_title_leaderboards(title_ids):
+    """
+    Инкрементально обновляет доски после изменения произведений.
+
+    Пересчитывается только доска, в которой произведение уже есть, которая
+    заполнена не полностью, или в которую оно проходит по рейтингу.
+    """
+    boards = title_boards(title_ids)
+    if not boards:
+        return
+    condition = Q()
+    for board, key in boards:
+        condition |= Q(board=board, key=key)
+    summary = {
+        (row['board'], row['key']): row
+        for row in LeaderboardEntry.objects.filter(condition)
+        .values('board', 'key').annotate(
+            size=Count('id'),
+            lowest=Min('weighted_rating'),
+            present=Count('id', filter=Q(title_id__in=title_ids)),
+        ).order_by()
+    }
+    best = max(
+        (
+            rating for rating in Title.objects.filter(
+                pk__in=title_ids, weighted_rating__isnull=False
+            ).values_list('weighted_rating', flat=True)
+        ),
+        default=None,
+    )
+    stale = defaultdict(list)
+    for board, key in boards:
+        row = summary.get((board, key))
+        if row is None:
+            if best is None:
+                continue
+        elif not (
+            row['present']
+            or row['size'] < LEADERBOARD_SIZE
+            or best is not None and best >= row['lowest']
+        ):
+            continue
+        stale[board].append(key)
+    refresh_leaderboards(stale)
+
+
+def mark_leaderboards_stale(title_ids):
+    """
+    Отмечает, что рейтинги с произведениями title_ids нужно пересчитать.
+
+    Запись добавляется после фиксации транзакции одним INSERT, сами
+    доски пересчитывает refresh_stale_leaderboards (команда
+    refresh_leaderboards --stale). Так запросы на запись не сортируют
+    произведения и не конкурируют за строки досок.
+    """
+    title_ids = set(title_ids)
+    if not title_ids:
+        return
+    transaction.on_commit(
+        lambda: StaleLeaderboardTitle.objects.bulk_create(
+            [StaleLeaderboardTitle(title_id=pk) for pk in title_ids],
+            ignore_conflicts=True,
+        )
+    )
+
+
+def mark_boards_stale(boards):
+    """
+    Отмечает доски boards — пары (доска, ключ) — для пересчёта целиком.
+
+    Как и mark_leaderboards_stale, запись добавляется после фиксации
+    транзакции одним INSERT.
+    """
+    boards = set(boards)
+    if not boards:
+        return
+    transaction.on_commit(
+        lambda: StaleLeaderboard.objects.bulk_create(
+            [StaleLeaderboard(board=board, key=key) for board, key in boards],
+            ignore_conflicts=True,
+        )
+    )
+
+
+def refresh_stale_boards(batch_size):
+    """Пересчитывает отмеченные доски (StaleLeaderboard) пакетами."""
+    while True:
+        with transaction.atomic():
+            stale = list(
+                StaleLeaderboard.objects.order_by('pk')[:batch_size]
+            )
+            if not stale:
+                return
+            StaleLeaderboard.objects.filter(
+                pk__in=[board.pk for board in stale]
+            ).delete()
+            keys = defaultdict(list)
+            for board in stale:
+                keys[board.board].append(board.key)
+            refresh_leaderboards(keys)
+
+
+def refresh_stale_leaderboards(batch_size=LEADERBOARD_REFRESH_BATCH_SIZE):
+    """
+    Пересчитывает отмеченные доски и доски отмеченных произведений пакетами.
+
+    Отметки пакета удаляются в одной транзакции с пересчётом: если он
+    упадёт, они останутся, а отметка, добавленная во время пересчёта,
+    попадёт в следующий пакет. Рассчитана на один воркер.
+    Возвращает число обработанных произведений.
+    """
+    refresh_stale_boards(batch_size)
+    total = 0
+    while True:
+        with transaction.atomic():
+            title_ids = list(
+                StaleLeaderboardTitle.objects.order_by('pk').values_list(
+                    'title_id', flat=True
+                )[:batch_size]
+            )
+            if not title_ids:
+                return total
+            StaleLeaderboardTitle.objects.filter(
+                title_id__in=title_ids
+            ).delete()
+            refresh_title_leaderboards(title_ids)
+        total += len(title_ids)
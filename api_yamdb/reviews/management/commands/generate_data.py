@@ -0,0 +1,75 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from reviews.datagen import Sizes, generate
+
+
+class Command(BaseCommand):
+    """
+    Генерирует синтетический набор данных для нагрузочных тестов.
+
+    Файлы пишутся в формате, который читает load_data:
+        python manage.py generate_data --path /tmp/yamdb \\
+            --users 1000000 --titles 100000 --reviews 5000000 \\
+            --comments 10000000
+        python manage.py load_data --path /tmp/yamdb
+
+    Отзывы распределены по произведениям по закону Ципфа (--zipf),
+    у произведения от 1 до --max-genres жанров. Данные пишутся потоком,
+    с постоянным расходом памяти, и повторяются при одинаковом --seed.
+    """
+
+    help = 'Генерирует CSV-файлы с синтетическими данными для load_data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', required=True, help='Папка для CSV-файлов'
+        )
+        for name, default, help_text in (
+            ('users', 1000, 'Число пользователей'),
+            ('titles', 1000, 'Число произведений'),
+            ('reviews', 10000, 'Число отзывов'),
+            ('comments', 20000, 'Число комментариев'),
+            ('categories', 10, 'Число категорий'),
+            ('genres', 30, 'Число жанров'),
+            ('max-genres', 3, 'Наибольшее число жанров у произведения'),
+            ('seed', 0, 'Начальное значение генератора случайных чисел'),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default, help=help_text
+            )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='Показатель распределения Ципфа отзывов по произведениям',
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'titles', 'categories', 'genres', 'max_genres'):
+            if options[name] < 1:
+                self.stderr.write(
+                    self.style.ERROR(f'--{name.replace("_", "-")} < 1')
+                )
+                return
+        sizes = Sizes(
+            users=options['users'],
+            titles=options['titles'],
+            reviews=options['reviews'],
+            comments=options['comments'],
+            categories=options['categories'],
+            genres=options['genres'],
+            max_genres=options['max_genres'],
+            zipf=options['zipf'],
+        )
+        started = time.perf_counter()
+        rows = generate(options['path'], sizes, seed=options['seed'])
+        for name, count in rows.items():
+            self.stdout.write(f'{name}.csv: {count}')
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Данные записаны в {options["path"]} за '
+                f'{time.perf_counter() - started:.1f} с'
+            )
+        )
@@ -1,10 +1,15 @@
 import csv
+import time
 from datetime import datetime
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
 
+from monitoring import metrics
+from reviews.leaderboards import refresh_all_leaderboards
 from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import score_signals_muted
+from reviews.stats import rebuild_score_buckets, refresh_weighted_ratings
 
 User = get_user_model()
 
@@ -61,14 +66,33 @@ class Command(BaseCommand):
             )
             return
 
-        # Вызываем методы для загрузки данных по каждому файлу
-        self.load_categories(f'{path}/category.csv')
-        self.load_genres(f'{path}/genre.csv')
-        self.load_titles(f'{path}/titles.csv')
-        self.load_genre_title(f'{path}/genre_title.csv')
-        self.load_users(f'{path}/users.csv')
-        self.load_reviews(f'{path}/review.csv')
-        self.load_comments(f'{path}/comments.csv')
+        # Вызываем методы для загрузки данных по каждому файлу,
+        # замеряя число строк и время загрузки для метрик импорта.
+        loaders = [
+            ('category', self.load_categories),
+            ('genre', self.load_genres),
+            ('titles', self.load_titles),
+            ('genre_title', self.load_genre_title),
+            ('users', self.load_users),
+            ('review', self.load_reviews),
+            ('comments', self.load_comments),
+        ]
+        # Счётчики оценок, взвешенные рейтинги и рейтинги лучших
+        # пересчитываются один раз после загрузки, а не сигналами
+        # на каждый отзыв.
+        with score_signals_muted():
+            for name, loader in loaders:
+                self.rows_read = 0
+                started = time.perf_counter()
+                loader(f'{path}/{name}.csv')
+                metrics.record_import(
+                    name, self.rows_read, time.perf_counter() - started
+                )
+        metrics.flush()
+        rebuild_score_buckets()
+        refresh_weighted_ratings()
+        refresh_all_leaderboards()
+        self.stdout.write(self.style.SUCCESS('Рейтинги пересчитаны'))
 
         # Сообщаем об успешном завершении
         self.stdout.write(
@@ -84,7 +108,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 # Используем get_or_create(), чтобы избежать дубликатов.
                 Category.objects.get_or_create(
@@ -104,7 +128,7 @@ class Command(BaseCommand):
             id,name,slug
         """
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 Genre.objects.get_or_create(
                     id=row['id'],
@@ -126,7 +150,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 category = (Category.objects.get(id=row['category'])
                             if row['category'] else None)
@@ -150,7 +174,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 title = Title.objects.get(id=row['title_id'])
                 genre = Genre.objects.get(id=row['genre_id'])
@@ -167,7 +191,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 user, created = User.objects.get_or_create(
                     id=row['id'],
@@ -195,7 +219,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 Review.objects.get_or_create(
                     id=row['id'],
@@ -218,7 +242,7 @@ class Command(BaseCommand):
         """
 
         with open(file_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
+            reader = self.read_csv(file)
             for row in reader:
                 Comment.objects.get_or_create(
                     id=row['id'],
@@ -231,6 +255,12 @@ class Command(BaseCommand):
                 )
         self.stdout.write(self.style.SUCCESS('Комментарии загружены'))
 
+    def read_csv(self, file):
+        """Строки CSV-файла; их число учитывается в self.rows_read."""
+        for row in csv.DictReader(file):
+            self.rows_read += 1
+            yield row
+
     def parse_datetime(self, datetime_str):
         """Парсит строку с датой и временем в объект datetime."""
         # Пример: "2019-09-24T21:08:21.567Z"
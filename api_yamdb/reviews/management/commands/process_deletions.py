@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import DELETION_BATCH_SIZE
+from reviews.deletion import pending_jobs, run_deletion_job
+
+
+class Command(BaseCommand):
+    """
+    Выполняет ожидающие задания на удаление пользователей, произведений
+    и категорий.
+
+    Зависимые отзывы и комментарии удаляются пакетами, рейтинги
+    произведений пересчитываются после каждого пакета. Рассчитана на
+    запуск воркером или из cron:
+        python manage.py process_deletions --batch-size 500 --pause 0.1
+    """
+
+    help = 'Выполняет фоновые задания на удаление'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DELETION_BATCH_SIZE,
+            help='Сколько строк удалять одним запросом',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Пауза между пакетами в секундах',
+        )
+
+    def handle(self, *args, **options):
+        for job in pending_jobs():
+            try:
+                run_deletion_job(job, options['batch_size'], options['pause'])
+            except Exception as error:
+                self.stderr.write(
+                    self.style.ERROR(f'Задание {job.pk}: {error!r}')
+                )
+                continue
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Задание {job.pk} ({job}) выполнено, '
+                    f'удалено строк: {job.processed}'
+                )
+            )
@@ -0,0 +1,80 @@
+import time
+from io import StringIO
+from itertools import count
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from monitoring import profiling
+
+
+class Command(BaseCommand):
+    """
+    Профилирует полный прогон load_data.
+
+    Пример использования:
+        python manage.py generate_data --path /tmp/yamdb --reviews 100000
+        python manage.py profile_load_data --path /tmp/yamdb
+
+    Трейс сохраняется в PROFILING_DIR (или в файл --output), для
+    cProfile в вывод добавляются --limit функций с наибольшим суммарным
+    временем. Данные загружаются в настроенную базу, как и load_data.
+    """
+
+    help = 'Загружает CSV командой load_data под профилировщиком'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', required=True, help='Путь к папке с CSV-файлами'
+        )
+        parser.add_argument(
+            '--profiler',
+            choices=list(profiling.PROFILERS),
+            default=settings.PROFILING_PROFILER,
+            help='Профилировщик',
+        )
+        parser.add_argument(
+            '--output', help='Файл трейса вместо PROFILING_DIR'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=30,
+            help='Сколько функций вывести в сводке',
+        )
+
+    def handle(self, *args, **options):
+        if options['profiler'] not in profiling.PROFILERS:
+            raise CommandError(
+                f'Профилировщик {options["profiler"]} недоступен.'
+            )
+        queries = count()
+
+        def counted(execute, sql, params, many, context):
+            next(queries)
+            return execute(sql, params, many, context)
+
+        output = StringIO()
+        with connection.execute_wrapper(counted):
+            started = time.perf_counter()
+            with profiling.PROFILERS[options['profiler']]() as profiler:
+                call_command('load_data', path=options['path'], stdout=output)
+            elapsed = time.perf_counter() - started
+        self.stdout.write(output.getvalue(), ending='')
+        self.stdout.write(profiler.summary(options['limit']))
+
+        if options['output']:
+            profiler.save(options['output'])
+            trace = options['output']
+        else:
+            trace = profiling.directory() / profiling.save(
+                profiler, 'load_data'
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'load_data: {elapsed:.1f} с, {next(queries)} запросов '
+                f'к БД; трейс сохранён в {trace}'
+            )
+        )
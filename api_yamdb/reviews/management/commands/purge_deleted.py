@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import DELETION_BATCH_SIZE
+from reviews.deletion import delete_in_batches
+from reviews.models import Comment, Review
+
+
+class Command(BaseCommand):
+    """
+    Физически удаляет мягко удалённые отзывы и комментарии.
+
+    Каскад Review -> Comment выполняется вручную небольшими пакетами,
+    чтобы ни один запрос не блокировал тысячи строк:
+        1. удалённые комментарии;
+        2. комментарии к удалённым отзывам;
+        3. удалённые отзывы (счётчики оценок уже обновлены
+           при мягком удалении).
+
+    Рассчитана на фоновый запуск, например из cron:
+        python manage.py purge_deleted --batch-size 500 --pause 0.1
+    """
+
+    help = 'Удаляет мягко удалённые отзывы и комментарии пакетами'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DELETION_BATCH_SIZE,
+            help='Сколько строк удалять одним запросом',
+        )
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0.0,
+            help='Пауза между пакетами в секундах',
+        )
+
+    def handle(self, *args, **options):
+        batch = options['batch_size'], options['pause']
+        comments = delete_in_batches(
+            Comment.objects.filter(is_deleted=True), *batch
+        )
+        comments += delete_in_batches(
+            Comment.objects.filter(review__is_deleted=True), *batch
+        )
+        reviews = delete_in_batches(
+            Review.objects.filter(is_deleted=True), *batch
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Удалено отзывов: {reviews}, комментариев: {comments}'
+            )
+        )
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand
+
+from reviews.constants import LEADERBOARD_REFRESH_BATCH_SIZE
+from reviews.leaderboards import (
+    BOARDS,
+    refresh_all_leaderboards,
+    refresh_leaderboard,
+    refresh_stale_leaderboards,
+)
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает материализованные рейтинги произведений.
+
+    Запросы к API только отмечают произведения, рейтинги с которыми
+    устарели. С флагом --stale команда пересчитывает доски отмеченных
+    произведений; её нужно запускать часто (воркером или из cron),
+    по одному экземпляру:
+        python manage.py refresh_leaderboards --stale
+
+    Без флага пересчитывает все рейтинги (или один, --board):
+        python manage.py refresh_leaderboards
+        python manage.py refresh_leaderboards --board genre
+    """
+
+    help = 'Пересчитывает рейтинги лучших произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--board',
+            choices=BOARDS,
+            help='Пересчитать только указанный рейтинг',
+        )
+        parser.add_argument(
+            '--stale',
+            action='store_true',
+            help='Пересчитать только рейтинги отмеченных произведений',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=LEADERBOARD_REFRESH_BATCH_SIZE,
+            help='Сколько отмеченных произведений обрабатывать за раз',
+        )
+
+    def handle(self, *args, **options):
+        if options['stale']:
+            count = refresh_stale_leaderboards(options['batch_size'])
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Рейтинги обновлены для произведений: {count}'
+                )
+            )
+        elif options['board']:
+            refresh_leaderboard(options['board'])
+            self.stdout.write(
+                self.style.SUCCESS(f'Рейтинг {options["board"]} пересчитан')
+            )
+        else:
+            refresh_all_leaderboards()
+            self.stdout.write(self.style.SUCCESS('Все рейтинги пересчитаны'))
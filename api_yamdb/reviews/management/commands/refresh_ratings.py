@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+
+from reviews.leaderboards import refresh_all_leaderboards
+from reviews.stats import (
+    rebuild_score_buckets,
+    refresh_prior_mean,
+    refresh_weighted_ratings,
+)
+
+
+class Command(BaseCommand):
+    """
+    Обновляет среднюю оценку по всем отзывам и взвешенные рейтинги.
+
+    Так как от средней оценки зависят все взвешенные рейтинги,
+    рейтинги лучших произведений после этого пересчитываются целиком.
+
+    Рассчитана на периодический запуск (например, из cron):
+        python manage.py refresh_ratings
+
+    С флагом --rebuild-buckets сначала пересчитывает счётчики оценок
+    по отзывам (после массовых операций в обход сигналов).
+    """
+
+    help = 'Обновляет среднюю оценку и взвешенные рейтинги произведений'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild-buckets',
+            action='store_true',
+            help='Пересчитать счётчики оценок по отзывам',
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild_buckets']:
+            rebuild_score_buckets()
+            self.stdout.write(self.style.SUCCESS('Счётчики оценок обновлены'))
+        mean = refresh_prior_mean()
+        refresh_weighted_ratings(prior_mean=mean)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Взвешенные рейтинги обновлены, средняя оценка {mean:.2f}'
+            )
+        )
+        refresh_all_leaderboards()
+        self.stdout.write(self.style.SUCCESS('Рейтинги лучших обновлены'))
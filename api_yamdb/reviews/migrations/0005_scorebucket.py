@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:14
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_score_buckets(apps, schema_editor):
+    Review = apps.get_model('reviews', 'Review')
+    ScoreBucket = apps.get_model('reviews', 'ScoreBucket')
+    ScoreBucket.objects.bulk_create(
+        ScoreBucket(**row)
+        for row in Review.objects.values('title_id', 'score').annotate(
+            count=Count('id')
+        ).order_by()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_alter_yamdbuser_confirmation_code'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.IntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(10)], verbose_name='Оценка')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_buckets', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'счётчик оценок',
+                'verbose_name_plural': 'Счётчики оценок',
+                'ordering': ('title', 'score'),
+                'constraints': [models.UniqueConstraint(fields=('title', 'score'), name='unique_score_bucket')],
+            },
+        ),
+        migrations.RunPython(fill_score_buckets, migrations.RunPython.noop),
+    ]
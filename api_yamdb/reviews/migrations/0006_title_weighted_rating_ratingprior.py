@@ -0,0 +1,60 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:15
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, FloatField, OuterRef, Subquery, Sum, Value
+
+from reviews.constants import DEFAULT_PRIOR_MEAN
+
+
+def fill_weighted_ratings(apps, schema_editor):
+    """Средняя оценка и взвешенные рейтинги по счётчикам из 0005."""
+    RatingPrior = apps.get_model('reviews', 'RatingPrior')
+    ScoreBucket = apps.get_model('reviews', 'ScoreBucket')
+    Title = apps.get_model('reviews', 'Title')
+    totals = ScoreBucket.objects.aggregate(
+        votes=Sum('count'), total=Sum(F('score') * F('count'))
+    )
+    mean = DEFAULT_PRIOR_MEAN
+    if totals['votes']:
+        mean = totals['total'] / totals['votes']
+    RatingPrior.objects.create(mean=mean)
+    weight = float(settings.RATING_PRIOR_WEIGHT)
+    rating = ScoreBucket.objects.filter(
+        title_id=OuterRef('pk'), count__gt=0
+    ).values('title_id').annotate(
+        value=(
+            Sum(F('score') * F('count')) + Value(mean * weight)
+        ) / (Sum('count') + Value(weight))
+    ).values('value')
+    Title.objects.update(
+        weighted_rating=Subquery(rating, output_field=FloatField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0005_scorebucket'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RatingPrior',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mean', models.FloatField(verbose_name='Средняя оценка')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Обновлено')),
+            ],
+            options={
+                'verbose_name': 'средняя оценка',
+                'verbose_name_plural': 'Средняя оценка',
+            },
+        ),
+        migrations.AddField(
+            model_name='title',
+            name='weighted_rating',
+            field=models.FloatField(blank=True, db_index=True, editable=False, null=True, verbose_name='Взвешенный рейтинг'),
+        ),
+        migrations.RunPython(fill_weighted_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.1 on 2026-10-19 10:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_title_weighted_rating_ratingprior'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('overall', 'Все произведения'), ('category', 'Категория'), ('genre', 'Жанр'), ('year', 'Год')], max_length=8, verbose_name='Рейтинг')),
+                ('key', models.CharField(blank=True, max_length=50, verbose_name='Ключ')),
+                ('position', models.PositiveIntegerField(verbose_name='Место')),
+                ('weighted_rating', models.FloatField(verbose_name='Взвешенный рейтинг')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='reviews.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'место в рейтинге',
+                'verbose_name_plural': 'Рейтинги произведений',
+                'ordering': ('board', 'key', 'position'),
+                'constraints': [models.UniqueConstraint(fields=('board', 'key', 'position'), name='unique_leaderboard_position')],
+            },
+        ),
+    ]
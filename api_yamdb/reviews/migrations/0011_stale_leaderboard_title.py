@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:56
+
+from django.db import migrations, models
+
+
+def mark_rated_titles(apps, schema_editor):
+    """Рейтинги с уже оценёнными произведениями построит --stale."""
+    StaleLeaderboardTitle = apps.get_model('reviews', 'StaleLeaderboardTitle')
+    Title = apps.get_model('reviews', 'Title')
+    StaleLeaderboardTitle.objects.bulk_create(
+        StaleLeaderboardTitle(title_id=pk)
+        for pk in Title.objects.filter(
+            weighted_rating__isnull=False
+        ).values_list('pk', flat=True).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0010_deletionjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleLeaderboardTitle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title_id', models.BigIntegerField(unique=True, verbose_name='id произведения')),
+            ],
+            options={
+                'verbose_name': 'произведение для пересчёта рейтингов',
+                'verbose_name_plural': 'Произведения для пересчёта рейтингов',
+            },
+        ),
+        migrations.RunPython(mark_rated_titles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-19 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0012_catalog_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StaleLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(choices=[('overall', 'Все произведения'), ('category', 'Категория'), ('genre', 'Жанр'), ('year', 'Год')], max_length=8, verbose_name='Рейтинг')),
+                ('key', models.CharField(blank=True, max_length=50, verbose_name='Ключ')),
+            ],
+            options={
+                'verbose_name': 'рейтинг для пересчёта',
+                'verbose_name_plural': 'Рейтинги для пересчёта',
+                'constraints': [models.UniqueConstraint(fields=('board', 'key'), name='unique_stale_leaderboard')],
+            },
+        ),
+    ]
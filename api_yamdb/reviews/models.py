@@ -7,17 +7,29 @@ from django.core.validators import (
     MinValueValidator,
     RegexValidator,
 )
-from django.db import models
+from django.db import models, transaction
 
 from .constants import (
     ADMIN,
     CONFIRMATION_CODE_LENGTH,
+    DELETION_DONE,
+    DELETION_FAILED,
+    DELETION_PENDING,
+    DELETION_RUNNING,
+    DELETION_TARGET_CATEGORY,
+    DELETION_TARGET_TITLE,
+    DELETION_TARGET_USER,
     EMAIL_MAX_LENGTH,
+    LEADERBOARD_CATEGORY,
+    LEADERBOARD_GENRE,
+    LEADERBOARD_OVERALL,
+    LEADERBOARD_YEAR,
     MAX_SCORE,
     MIN_SCORE,
     MODERATOR,
     NAME_MAX_LENGTH,
     SLUG_MAX_LENGTH,
+    UNIQUE_REVIEW,
     USER,
     USERNAME_MAX_LENGTH,
     USERNAME_PATTERN,
@@ -30,6 +42,25 @@ ROLE_CHOICES = [
     (ADMIN, 'Администратор'),
 ]
 
+LEADERBOARD_CHOICES = [
+    (LEADERBOARD_OVERALL, 'Все произведения'),
+    (LEADERBOARD_CATEGORY, 'Категория'),
+    (LEADERBOARD_GENRE, 'Жанр'),
+    (LEADERBOARD_YEAR, 'Год'),
+]
+
+DELETION_TARGET_CHOICES = [
+    (DELETION_TARGET_USER, 'Пользователь'),
+    (DELETION_TARGET_TITLE, 'Произведение'),
+    (DELETION_TARGET_CATEGORY, 'Категория'),
+]
+DELETION_STATUS_CHOICES = [
+    (DELETION_PENDING, 'Ожидает'),
+    (DELETION_RUNNING, 'Выполняется'),
+    (DELETION_DONE, 'Выполнено'),
+    (DELETION_FAILED, 'Ошибка'),
+]
+
 
 class YamdbUser(AbstractUser):
     username = models.CharField(
@@ -131,6 +162,13 @@ class Title(models.Model):
         null=True,
         verbose_name='Категория',
     )
+    weighted_rating = models.FloatField(
+        null=True,
+        blank=True,
+        db_index=True,
+        editable=False,
+        verbose_name='Взвешенный рейтинг',
+    )
 
     class Meta:
         ordering = ('-year', 'name')
@@ -142,9 +180,26 @@ class Title(models.Model):
         return self.name
 
 
+VISIBLE_CONTENT = models.Q(is_hidden=False, is_deleted=False)
+
+
+class AuthorContentQuerySet(models.QuerySet):
+    def visible(self):
+        """
+        Не скрытые и не удалённые записи.
+
+        Условие совпадает с условием частичных индексов отзывов
+        и комментариев, поэтому такие выборки идут по этим индексам.
+        """
+        return self.filter(VISIBLE_CONTENT)
+
+
 class AuthorContentBase(models.Model):
     """
     Абстрактный базовый класс для отзывов и комментариев.
+
+    Удаление через API мягкое: запись помечается is_deleted и физически
+    удаляется позже командой purge_deleted.
     """
 
     author = models.ForeignKey(
@@ -156,6 +211,10 @@ class AuthorContentBase(models.Model):
     pub_date = models.DateTimeField(
         auto_now_add=True, verbose_name='Дата публикации'
     )
+    is_hidden = models.BooleanField(default=False, verbose_name='Скрыт')
+    is_deleted = models.BooleanField(default=False, verbose_name='Удалён')
+
+    objects = AuthorContentQuerySet.as_manager()
 
     class Meta:
         abstract = True
@@ -180,13 +239,53 @@ class Review(AuthorContentBase):
         verbose_name_plural = 'Отзывы'
         constraints = [
             models.UniqueConstraint(
-                fields=['title', 'author'], name='unique_review'
+                fields=['title', 'author'],
+                condition=models.Q(is_deleted=False),
+                name=UNIQUE_REVIEW,
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', '-pub_date'],
+                condition=VISIBLE_CONTENT,
+                name='review_visible_idx',
+            ),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_deleted=True),
+                name='review_deleted_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author.username} - {self.title.name}'
 
+    @property
+    def counted_score(self):
+        """
+        Пара (произведение, оценка), учтённая в счётчиках оценок.
+
+        None для отзывов, которые не учитываются (скрытых и удалённых).
+        """
+        if self.__dict__.get('is_hidden', True) or self.__dict__.get(
+            'is_deleted', True
+        ):
+            return None
+        return self.__dict__.get('title_id'), self.__dict__.get('score')
+
+    def save(self, *args, **kwargs):
+        # Отзыв и счётчики оценок из сигнала post_save меняются вместе;
+        # delete() и так выполняет сигналы post_delete в транзакции.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает учтённую в счётчиках оценку загруженного отзыва."""
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_counted_score = instance.counted_score
+        return instance
+
 
 class Comment(AuthorContentBase):
     review = models.ForeignKey(
@@ -196,6 +295,237 @@ class Comment(AuthorContentBase):
     class Meta(AuthorContentBase.Meta):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', '-pub_date'],
+                condition=VISIBLE_CONTENT,
+                name='comment_visible_idx',
+            ),
+            models.Index(
+                fields=['id'],
+                condition=models.Q(is_deleted=True),
+                name='comment_deleted_idx',
+            ),
+        ]
 
     def __str__(self):
         return f'{self.author.username} - {self.review}'
+
+
+class ScoreBucket(models.Model):
+    """
+    Количество отзывов с определённой оценкой к произведению.
+
+    Поддерживается сигналами при создании, изменении и удалении отзывов,
+    поэтому статистика произведения читается без агрегации по отзывам.
+    """
+
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='score_buckets',
+        verbose_name='Произведение',
+    )
+    score = models.IntegerField(
+        validators=[
+            MinValueValidator(MIN_SCORE),
+            MaxValueValidator(MAX_SCORE),
+        ],
+        verbose_name='Оценка',
+    )
+    count = models.IntegerField(default=0, verbose_name='Количество отзывов')
+
+    class Meta:
+        ordering = ('title', 'score')
+        verbose_name = 'счётчик оценок'
+        verbose_name_plural = 'Счётчики оценок'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'score'], name='unique_score_bucket'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.title_id}: {self.score} - {self.count}'
+
+
+class RatingPrior(models.Model):
+    """
+    Средняя оценка по всем отзывам — априорное значение взвешенного рейтинга.
+
+    Хранится одной строкой и обновляется командой refresh_ratings.
+    """
+
+    mean = models.FloatField(verbose_name='Средняя оценка')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Обновлено')
+
+    class Meta:
+        verbose_name = 'средняя оценка'
+        verbose_name_plural = 'Средняя оценка'
+
+    def __str__(self):
+        return f'{self.mean:.2f}'
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Строка материализованного рейтинга лучших произведений.
+
+    Рейтинг определяется доской (board) и ключом внутри неё: id категории
+    или жанра, год; для общего рейтинга ключ пустой. Чтение рейтинга —
+    один диапазон по индексу (board, key, position).
+    """
+
+    board = models.CharField(
+        'Рейтинг',
+        max_length=max(len(board) for board, _ in LEADERBOARD_CHOICES),
+        choices=LEADERBOARD_CHOICES,
+    )
+    key = models.CharField('Ключ', max_length=SLUG_MAX_LENGTH, blank=True)
+    position = models.PositiveIntegerField('Место')
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='leaderboard_entries',
+        verbose_name='Произведение',
+    )
+    weighted_rating = models.FloatField('Взвешенный рейтинг')
+
+    class Meta:
+        ordering = ('board', 'key', 'position')
+        verbose_name = 'место в рейтинге'
+        verbose_name_plural = 'Рейтинги произведений'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'key', 'position'],
+                name='unique_leaderboard_position',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.board} {self.key} #{self.position}: {self.title_id}'
+
+
+class CatalogVersion(models.Model):
+    """
+    Версия справочника (категорий, жанров) для процессных кэшей.
+
+    Меняется после каждого изменения строк справочника; процессы
+    сверяют с ней свой кэш (reviews.cache), поэтому версия хранится в
+    базе, общей для всех процессов, а не в кэше Django.
+    """
+
+    name = models.CharField('Справочник', max_length=64, unique=True)
+    version = models.CharField('Версия', max_length=32)
+
+    class Meta:
+        verbose_name = 'версия справочника'
+        verbose_name_plural = 'Версии справочников'
+
+    def __str__(self):
+        return f'{self.name}: {self.version}'
+
+
+class StaleLeaderboardTitle(models.Model):
+    """
+    Произведение, рейтинги лучших с которым нужно пересчитать.
+
+    Запись добавляется после изменения отзывов или самого произведения,
+    а пересчитывает доски и удаляет записи команда
+    refresh_leaderboards --stale. Поэтому запросы на запись не
+    пересчитывают рейтинги сами. id произведения хранится без внешнего
+    ключа: отметка может пережить произведение. Рейтинги, из которых
+    выпало удалённое произведение, отмечает StaleLeaderboard.
+    """
+
+    title_id = models.BigIntegerField('id произведения', unique=True)
+
+    class Meta:
+        verbose_name = 'произведение для пересчёта рейтингов'
+        verbose_name_plural = 'Произведения для пересчёта рейтингов'
+
+    def __str__(self):
+        return str(self.title_id)
+
+
+class StaleLeaderboard(models.Model):
+    """
+    Рейтинг, который нужно пересчитать целиком.
+
+    Запись добавляется при удалении произведения, которое в нём было:
+    строки LeaderboardEntry удаляются каскадом, и без пересчёта в
+    рейтинге осталась бы пустая позиция. Пересчитывает доски и удаляет
+    записи команда refresh_leaderboards --stale.
+    """
+
+    board = models.CharField(
+        'Рейтинг',
+        max_length=max(len(board) for board, _ in LEADERBOARD_CHOICES),
+        choices=LEADERBOARD_CHOICES,
+    )
+    key = models.CharField('Ключ', max_length=SLUG_MAX_LENGTH, blank=True)
+
+    class Meta:
+        verbose_name = 'рейтинг для пересчёта'
+        verbose_name_plural = 'Рейтинги для пересчёта'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['board', 'key'], name='unique_stale_leaderboard'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.board} {self.key}'
+
+
+class DeletionJobQuerySet(models.QuerySet):
+    def pending_ids(self, target):
+        """Подзапрос id объектов target, ожидающих удаления."""
+        return self.filter(
+            target=target, status__in=(DELETION_PENDING, DELETION_RUNNING)
+        ).values('object_id')
+
+
+class DeletionJob(models.Model):
+    """
+    Фоновое удаление пользователя, произведения или категории.
+
+    Объект сразу скрывается из API, а зависимые строки удаляет
+    пакетами команда process_deletions.
+    """
+
+    target = models.CharField(
+        'Объект',
+        max_length=max(len(target) for target, _ in DELETION_TARGET_CHOICES),
+        choices=DELETION_TARGET_CHOICES,
+    )
+    object_id = models.BigIntegerField('id объекта')
+    status = models.CharField(
+        'Статус',
+        max_length=max(len(status) for status, _ in DELETION_STATUS_CHOICES),
+        choices=DELETION_STATUS_CHOICES,
+        default=DELETION_PENDING,
+    )
+    processed = models.PositiveIntegerField('Удалено строк', default=0)
+    error = models.TextField('Ошибка', blank=True)
+    created_at = models.DateTimeField('Создано', auto_now_add=True)
+    finished_at = models.DateTimeField('Завершено', null=True, blank=True)
+
+    objects = DeletionJobQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('created_at',)
+        verbose_name = 'задание на удаление'
+        verbose_name_plural = 'Задания на удаление'
+        indexes = [
+            models.Index(
+                fields=['target', 'object_id'],
+                condition=models.Q(
+                    status__in=(DELETION_PENDING, DELETION_RUNNING)
+                ),
+                name='deletionjob_active_idx',
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.target} {self.object_id}: {self.status}'
@@ -0,0 +1,69 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .constants import (
+    MODERATION_DELETE,
+    MODERATION_HIDE,
+    MODERATION_TARGET_COMMENTS,
+    MODERATION_TARGET_REVIEWS,
+)
+from .models import Comment, Review
+from .stats import refresh_title_ratings
+
+
+def select_content(target, author=None, title=None, date_from=None,
+                   date_to=None, ids=None):
+    """
+    Отзывы и комментарии, подходящие под фильтры модерации.
+
+    Возвращает пару querysets (отзывы, комментарии); для цели,
+    не указанной в target, — пустой queryset.
+    """
+    condition = Q()
+    if author is not None:
+        condition &= Q(author=author)
+    if date_from is not None:
+        condition &= Q(pub_date__gte=date_from)
+    if date_to is not None:
+        condition &= Q(pub_date__lte=date_to)
+    if ids is not None:
+        condition &= Q(pk__in=ids)
+    reviews = Review.objects.none()
+    comments = Comment.objects.none()
+    if target != MODERATION_TARGET_COMMENTS:
+        reviews = Review.objects.filter(condition, is_deleted=False)
+        if title is not None:
+            reviews = reviews.filter(title=title)
+    if target != MODERATION_TARGET_REVIEWS:
+        comments = Comment.objects.filter(condition, is_deleted=False)
+        if title is not None:
+            comments = comments.filter(review__title=title)
+    return reviews, comments
+
+
+def moderate(action, reviews, comments):
+    """
+    Удаляет, скрывает или показывает отзывы и комментарии.
+
+    Работает запросами над множествами строк; рейтинги затронутых
+    произведений пересчитываются один раз в конце. Удаление мягкое,
+    записи и комментарии к удалённым отзывам физически удаляет
+    команда purge_deleted.
+    Возвращает число затронутых отзывов и комментариев.
+    """
+    title_ids = set(
+        reviews.order_by().values_list('title_id', flat=True).distinct()
+    )
+    if action == MODERATION_DELETE:
+        field, value = 'is_deleted', True
+    else:
+        field, value = 'is_hidden', action == MODERATION_HIDE
+    with transaction.atomic():
+        comments_count = comments.exclude(**{field: value}).update(
+            **{field: value}
+        )
+        reviews_count = reviews.exclude(**{field: value}).update(
+            **{field: value}
+        )
+        refresh_title_ratings(title_ids)
+    return {'reviews': reviews_count, 'comments': comments_count}
@@ -0,0 +1,123 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import receiver
+
+from .cache import CATALOG_CACHES
+from .leaderboards import mark_boards_stale, mark_leaderboards_stale
+from .models import Category, Genre, LeaderboardEntry, Review, Title
+from .stats import change_score_count, refresh_weighted_ratings
+
+_state = threading.local()
+
+
+@contextmanager
+def score_signals_muted():
+    """
+    Отключает обновление счётчиков оценок из сигналов отзывов.
+
+    Для массовых операций: счётчики и рейтинги пересчитываются один раз
+    после них (reviews.stats.refresh_title_ratings), а не по строке,
+    а при физическом удалении уже удалённых мягко отзывов — не нужны.
+    """
+    _state.muted = True
+    try:
+        yield
+    finally:
+        _state.muted = False
+
+
+def score_signals_active():
+    return not getattr(_state, 'muted', False)
+
+
+@receiver(post_save, sender=Review)
+def update_score_buckets_on_save(sender, instance, created, raw, **kwargs):
+    if raw or not score_signals_active():
+        return
+    old = None if created else getattr(
+        instance, '_loaded_counted_score', None
+    )
+    new = instance.counted_score
+    if old == new:
+        return
+    title_ids = set()
+    for counted, delta in ((old, -1), (new, 1)):
+        if counted is not None:
+            change_score_count(*counted, delta)
+            title_ids.add(counted[0])
+    refresh_weighted_ratings(title_ids)
+    mark_leaderboards_stale(title_ids)
+    instance._loaded_counted_score = new
+
+
+@receiver(post_delete, sender=Review)
+def update_score_buckets_on_delete(sender, instance, **kwargs):
+    if instance.counted_score is None or not score_signals_active():
+        return
+    change_score_count(*instance.counted_score, -1)
+    refresh_weighted_ratings([instance.title_id])
+    mark_leaderboards_stale([instance.title_id])
+
+
+@receiver(post_save, sender=Title)
+def update_leaderboards_on_title_save(sender, instance, created, raw,
+                                      **kwargs):
+    # Произведения без отзывов (weighted_rating is None) нет в рейтингах.
+    if not (created or raw or instance.weighted_rating is None):
+        mark_leaderboards_stale([instance.pk])
+
+
+@receiver(pre_delete, sender=Title)
+def mark_leaderboards_stale_on_title_delete(sender, instance, **kwargs):
+    """
+    Места удаляемого произведения удалятся каскадом: его доски нужно
+    пересчитать, чтобы следующие произведения поднялись.
+    """
+    mark_boards_stale(
+        LeaderboardEntry.objects.filter(title=instance).values_list(
+            'board', 'key'
+        )
+    )
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def update_leaderboards_on_genre_change(sender, instance, action, reverse,
+                                        pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        if instance.weighted_rating is not None:
+            mark_leaderboards_stale([instance.pk])
+    elif pk_set:
+        mark_leaderboards_stale(pk_set)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_catalog_cache(sender, **kwargs):
+    catalog = CATALOG_CACHES[sender]
+    catalog.invalidate(local_only=True)
+    transaction.on_commit(catalog.invalidate)
+
+
+@receiver(post_migrate)
+def invalidate_catalog_caches(sender, **kwargs):
+    """
+    После миграций и очистки базы (flush) справочники могли смениться.
+
+    Сбрасывается только кэш процесса: таблицы версий после частичной
+    миграции может ещё не быть, а flush очищает и её.
+    """
+    for catalog in CATALOG_CACHES.values():
+        catalog.invalidate(local_only=True)
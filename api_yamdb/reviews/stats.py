@@ -0,0 +1,158 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+
+from .constants import DEFAULT_PRIOR_MEAN, MAX_SCORE, MIN_SCORE
+from .leaderboards import mark_leaderboards_stale
+from .models import RatingPrior, Review, ScoreBucket, Title
+
+
+def change_score_count(title_id, score, delta):
+    """Атомарно изменяет счётчик отзывов с оценкой score на delta."""
+    buckets = ScoreBucket.objects.filter(title_id=title_id, score=score)
+    if buckets.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ScoreBucket.objects.create(
+                title_id=title_id, score=score, count=delta
+            )
+    except IntegrityError:
+        # Счётчик успел создать параллельный запрос.
+        buckets.update(count=F('count') + delta)
+
+
+def rebuild_score_buckets(title_ids=None):
+    """
+    Пересчитывает счётчики оценок по отзывам.
+
+    Нужен после массовых операций, которые не отправляют сигналы
+    (bulk_create, QuerySet.update/delete), и для заполнения счётчиков
+    по уже существующим отзывам. title_ids=None — все произведения.
+    """
+    buckets = ScoreBucket.objects.all()
+    reviews = Review.objects.visible()
+    if title_ids is not None:
+        buckets = buckets.filter(title_id__in=title_ids)
+        reviews = reviews.filter(title_id__in=title_ids)
+    with transaction.atomic():
+        buckets.delete()
+        ScoreBucket.objects.bulk_create(
+            ScoreBucket(**row)
+            for row in reviews.values('title_id', 'score').annotate(
+                count=Count('id')
+            ).order_by()
+        )
+
+
+def refresh_title_ratings(title_ids):
+    """
+    Пересчитывает счётчики оценок и взвешенный рейтинг, а рейтинги
+    лучших отмечает для пересчёта (см. mark_leaderboards_stale).
+
+    Вызывается один раз после массовых операций с отзывами вместо
+    обновления в сигналах по каждой строке.
+    """
+    title_ids = list(title_ids)
+    if not title_ids:
+        return
+    rebuild_score_buckets(title_ids)
+    refresh_weighted_ratings(title_ids)
+    mark_leaderboards_stale(title_ids)
+
+
+def get_prior_mean():
+    """Средняя оценка по всем отзывам на момент последнего обновления."""
+    prior = RatingPrior.objects.first()
+    return DEFAULT_PRIOR_MEAN if prior is None else prior.mean
+
+
+def refresh_prior_mean():
+    """Пересчитывает среднюю оценку по всем отзывам из счётчиков."""
+    totals = ScoreBucket.objects.aggregate(
+        votes=Sum('count'), total=Sum(F('score') * F('count'))
+    )
+    mean = DEFAULT_PRIOR_MEAN
+    if totals['votes']:
+        mean = totals['total'] / totals['votes']
+    prior = RatingPrior.objects.first() or RatingPrior()
+    prior.mean = mean
+    prior.save()
+    return mean
+
+
+def refresh_weighted_ratings(title_ids=None, prior_mean=None):
+    """
+    Пересчитывает взвешенный (байесовский) рейтинг произведений.
+
+    (сумма оценок + m * C) / (число отзывов + m), где C — средняя оценка
+    по всем отзывам, m — settings.RATING_PRIOR_WEIGHT. Считается одним
+    UPDATE по счётчикам оценок; у произведений без отзывов — NULL.
+    title_ids=None — все произведения.
+    """
+    if prior_mean is None:
+        prior_mean = get_prior_mean()
+    weight = float(settings.RATING_PRIOR_WEIGHT)
+    rating = ScoreBucket.objects.filter(
+        title_id=OuterRef('pk'), count__gt=0
+    ).values('title_id').annotate(
+        value=(
+            Sum(F('score') * F('count')) + Value(prior_mean * weight)
+        ) / (Sum('count') + Value(weight))
+    ).values('value')
+    titles = Title.objects.all()
+    if title_ids is not None:
+        titles = titles.filter(pk__in=title_ids)
+    titles.update(
+        weighted_rating=Subquery(rating, output_field=FloatField())
+    )
+
+
+def get_title_stats(title_id):
+    """
+    Возвращает количество отзывов, среднюю, медиану и гистограмму оценок.
+
+    Читает не более MAX_SCORE - MIN_SCORE + 1 строк счётчиков.
+    """
+    counts = dict.fromkeys(range(MIN_SCORE, MAX_SCORE + 1), 0)
+    counts.update(
+        ScoreBucket.objects.filter(title_id=title_id, count__gt=0)
+        .values_list('score', 'count')
+    )
+    total = sum(counts.values())
+    mean = median = None
+    if total:
+        mean = round(
+            sum(score * count for score, count in counts.items()) / total, 2
+        )
+        median = _histogram_median(counts, total)
+    return {
+        'count': total,
+        'mean': mean,
+        'median': median,
+        'histogram': [
+            {'score': score, 'count': count}
+            for score, count in counts.items()
+        ],
+    }
+
+
+def _histogram_median(counts, total):
+    """Медиана по упорядоченной гистограмме {оценка: количество}."""
+    middle = [(total - 1) // 2, total // 2]
+    values = []
+    seen = 0
+    for score, count in counts.items():
+        while middle and middle[0] < seen + count:
+            values.append(score)
+            middle.pop(0)
+        seen += count
+    return sum(values) / len(values)
@@ -0,0 +1,79 @@
+"""
+Задержка запросов к API с полным набором middleware и в профиле
+settings_api, где сессии, CSRF, аутентификация Django и сообщения
+к /api/ не применяются.
+
+Первая таблица — запросы через весь обработчик Django (тестовый
+клиент), вторая — только цепочка middleware вокруг пустого ответа,
+чтобы выделить её собственную стоимость.
+
+    python -m benchmarks.bench_api_profile
+"""
+from benchmarks.common import measure, report, setup_django
+
+
+def empty_response(request):
+    from django.http import HttpResponse
+
+    return HttpResponse(b'{}', content_type='application/json')
+
+
+def main():
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.test import Client, RequestFactory, override_settings
+    from django.utils.module_loading import import_string
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from api_yamdb import settings, settings_api
+    from reviews.models import Category, Title
+
+    category = Category.objects.create(name='Фильм', slug='films')
+    Title.objects.create(name='Терминатор', year=1984, category=category)
+    Title.objects.create(name='Крепкий орешек', year=1988, category=category)
+    admin = get_user_model().objects.create(
+        username='admin', email='admin@yamdb.fake', role='admin'
+    )
+    token = f'Bearer {AccessToken.for_user(admin)}'
+
+    requests = {
+        'titles, аноним': lambda client: client.get('/api/v1/titles/'),
+        'categories, JWT': lambda client: client.get(
+            '/api/v1/categories/', HTTP_AUTHORIZATION=token
+        ),
+    }
+    results = {}
+    for profile, middleware in (
+        ('settings', settings.MIDDLEWARE),
+        ('settings_api', settings_api.MIDDLEWARE),
+    ):
+        with override_settings(MIDDLEWARE=middleware):
+            client = Client()
+            for name, request in requests.items():
+                assert request(client).status_code == 200
+                results[f'{name}, {profile}'] = measure(
+                    lambda: request(client), repeat=1000, warmup=50
+                )
+    report('Задержка запросов к API', results)
+
+    chains = {}
+    for profile, middleware in (
+        ('settings', settings.MIDDLEWARE),
+        ('settings_api', settings_api.MIDDLEWARE),
+    ):
+        chain = empty_response
+        for name in reversed(middleware):
+            chain = import_string(name)(chain)
+        request = RequestFactory().get(
+            '/api/v1/titles/', HTTP_AUTHORIZATION=token
+        )
+        chains[f'middleware, {profile}'] = measure(
+            lambda: chain(request), repeat=5000, warmup=100
+        )
+    print()
+    report('Только цепочка middleware', chains)
+
+
+if __name__ == '__main__':
+    main()
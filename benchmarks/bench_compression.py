@@ -0,0 +1,82 @@
+"""
+Сжатие ответов API: размер на проводе и затраты процессора.
+
+Отдаёт через CompressionMiddleware страницы отзывов с текстами из
+static/data/review.csv и сравнивает кодировки: без сжатия, gzip и,
+если установлены brotli и zstandard, br и zstd.
+
+    python -m benchmarks.bench_compression
+"""
+import csv
+import time
+
+from benchmarks.common import PROJECT_DIR, measure, report, setup_django
+
+PAGE_SIZES = (5, 100)
+
+
+def review_page(texts, size):
+    return {
+        'count': size,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'text': texts[i % len(texts)],
+                'author': f'user{i}',
+                'score': i % 10 + 1,
+                'pub_date': '2019-09-24T21:08:21.567000Z',
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def main():
+    setup_django()
+
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    from api.middleware import CODECS, CompressionMiddleware
+    from api.renderers import FastJSONRenderer
+
+    with open(PROJECT_DIR / 'static/data/review.csv', encoding='utf-8') as f:
+        texts = [row['text'] for row in csv.DictReader(f)]
+
+    factory = RequestFactory()
+    results = {}
+    sizes = []
+    for size in PAGE_SIZES:
+        body = FastJSONRenderer().render(review_page(texts, size))
+        for encoding in ['identity', *CODECS]:
+            middleware = CompressionMiddleware(
+                lambda request: HttpResponse(
+                    body, content_type='application/json'
+                )
+            )
+            request = factory.get('/', HTTP_ACCEPT_ENCODING=encoding)
+            name = f'{size} отзывов, {encoding}'
+            results[name] = measure(lambda: middleware(request), repeat=50)
+            response = middleware(request)
+            assert response.get('Content-Encoding', 'identity') == encoding
+            sizes.append((name, len(body), len(response.content)))
+    report('Время ответа с учётом сжатия', results)
+    print()
+    print(f'{"вариант":<40}{"исходно, Б":>12}{"на проводе, Б":>15}'
+          f'{"доля":>8}')
+    for name, original, wire in sizes:
+        print(f'{name:<40}{original:>12}{wire:>15}{wire / original:>8.2f}')
+    # Пропускная способность сжатия большой страницы.
+    body = FastJSONRenderer().render(review_page(texts, PAGE_SIZES[-1]))
+    for encoding, (compress, _) in CODECS.items():
+        started = time.perf_counter()
+        for _ in range(20):
+            compress(body)
+        seconds = (time.perf_counter() - started) / 20
+        print(f'{encoding}: {len(body) / seconds / 2 ** 20:.0f} МБ/с')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+Горячие эндпоинты API на синтетических данных generate_data.
+
+Данные генерируются с фиксированным seed и загружаются командой
+load_data (её скорость — первый замер), затем запросы выполняются
+тестовым клиентом Django через весь обработчик: список произведений
+с каждой комбинацией фильтров TitleFilter, произведение, списки и
+создание отзывов и комментариев, signup и token.
+
+    python -m benchmarks.bench_endpoints
+    python -m benchmarks.bench_endpoints --save
+    python -m benchmarks.bench_endpoints --compare --tolerance 0.3
+    python -m benchmarks.bench_endpoints --only titles
+
+--save записывает результаты в benchmarks/baselines/bench_endpoints.json,
+--compare сравнивает с ним и завершается с кодом 1 при регрессии.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from io import StringIO
+from itertools import combinations, count
+
+from benchmarks.common import (
+    compare_baseline,
+    measure,
+    report,
+    save_baseline,
+    setup_django,
+)
+
+NAME = 'bench_endpoints'
+SIZES = {
+    'users': 300,
+    'titles': 200,
+    'reviews': 2000,
+    'comments': 2000,
+    'categories': 5,
+    'genres': 20,
+    'max_genres': 3,
+    'zipf': 1.1,
+}
+SEED = 1
+REPEAT = 50
+WARMUP = 3
+# Значения фильтров TitleFilter; genre_mode имеет смысл только с genre.
+FILTERS = {
+    'category': 'category-1',
+    'genre': 'genre-1,genre-2',
+    'year': None,  # год первого произведения, см. title_filters
+    'name': 'Произведение 1',
+}
+
+
+def load(path):
+    """Генерирует данные в path и загружает их; возвращает замер импорта."""
+    from django.core.management import call_command
+    from django.db import connection
+
+    from reviews.datagen import Sizes, generate
+
+    rows = sum(generate(path, Sizes(**SIZES), seed=SEED).values())
+    # CaptureQueriesContext хранит не больше 9000 запросов, здесь их больше.
+    queries = count()
+
+    def counted(execute, sql, params, many, context):
+        next(queries)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counted):
+        started = time.perf_counter()
+        call_command('load_data', '--path', path, stdout=StringIO())
+        elapsed = time.perf_counter() - started
+    call_command('refresh_ratings', '--rebuild-buckets', stdout=StringIO())
+    # Один прогон: «в секунду» здесь — загруженные строки CSV.
+    ms = elapsed * 1000
+    return {
+        'min': ms, 'median': ms, 'p95': ms, 'p99': ms,
+        'throughput': rows / elapsed, 'queries': next(queries),
+    }
+
+
+def title_filters(year):
+    """Все комбинации фильтров списка произведений: {название: query}."""
+    values = {**FILTERS, 'year': str(year)}
+    variants = {}
+    for size in range(len(values) + 1):
+        for names in combinations(values, size):
+            query = {name: values[name] for name in names}
+            variants['&'.join(names) or 'без фильтров'] = query
+            if 'genre' in query:
+                variants['&'.join(names) + '&genre_mode=all'] = {
+                    **query, 'genre_mode': 'all'
+                }
+    return variants
+
+
+def cases():
+    """Замеряемые запросы: {название: функция без аргументов}."""
+    from django.contrib.auth import get_user_model
+    from django.db.models import Count
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Title
+
+    User = get_user_model()
+    client = Client()
+
+    def auth(user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'}
+
+    popular = Title.objects.annotate(
+        reviews_count=Count('reviews')
+    ).order_by('-reviews_count').first()
+    review = popular.reviews.annotate(
+        comments_count=Count('comments')
+    ).order_by('-comments_count').first()
+    reviews_url = f'/api/v1/titles/{popular.pk}/reviews/'
+    comments_url = f'{reviews_url}{review.pk}/comments/'
+    admin = auth(User.objects.get(username='user1'))
+
+    # Каждый отзыв на одно произведение пишет новый автор.
+    quiet = Title.objects.annotate(
+        reviews_count=Count('reviews')
+    ).order_by('reviews_count', 'pk').first()
+    authors = iter([
+        auth(user) for user in User.objects.exclude(
+            reviews__title=quiet
+        ).order_by('pk')[:REPEAT + WARMUP]
+    ])
+    signups = count()
+
+    def signup():
+        number = next(signups)
+        return {
+            'username': f'bench{number}', 'email': f'bench{number}@yamdb.fake'
+        }
+
+    client.post('/api/v1/auth/signup/', {
+        'username': 'benchtoken', 'email': 'benchtoken@yamdb.fake'
+    })
+    code = User.objects.get(username='benchtoken').confirmation_code
+
+    def get(url, params=None, headers=None):
+        def run():
+            response = client.get(url, params or {}, **(headers or {}))
+            assert response.status_code == 200, response.content
+        return run
+
+    def post(url, data, headers=None, status=201):
+        def run():
+            response = client.post(
+                url, data() if callable(data) else data,
+                content_type='application/json',
+                **(headers() if callable(headers) else headers or {}),
+            )
+            assert response.status_code == status, response.content
+        return run
+
+    variants = {
+        f'titles?{name}': get('/api/v1/titles/', query)
+        for name, query in title_filters(popular.year).items()
+    }
+    variants.update({
+        'title': get(f'/api/v1/titles/{popular.pk}/'),
+        'reviews': get(reviews_url),
+        'comments': get(comments_url),
+        'review, создание': post(
+            f'/api/v1/titles/{quiet.pk}/reviews/',
+            {'text': 'Отзыв', 'score': 7},
+            headers=lambda: next(authors),
+        ),
+        'comment, создание': post(
+            comments_url, {'text': 'Комментарий'}, headers=admin
+        ),
+        'signup': post('/api/v1/auth/signup/', signup, status=200),
+        'token': post('/api/v1/auth/token/', {
+            'username': 'benchtoken', 'confirmation_code': code,
+        }, status=200),
+    })
+    return variants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--save', action='store_true',
+                        help='Сохранить результаты как baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='Сравнить с baseline, код 1 при регрессии')
+    parser.add_argument('--tolerance', type=float, default=0.3,
+                        help='Допустимый рост лучшего времени, доля')
+    parser.add_argument('--only', default='',
+                        help='Только варианты, содержащие эту строку')
+    args = parser.parse_args()
+
+    setup_django()
+    with tempfile.TemporaryDirectory() as path:
+        imported = load(path)
+    results = {'load_data': imported} if args.only in 'load_data' else {}
+    for name, run in cases().items():
+        if args.only in name:
+            results[name] = measure(run, repeat=REPEAT, warmup=WARMUP)
+    report(
+        f'Эндпоинты API: {SIZES["titles"]} произведений, '
+        f'{SIZES["reviews"]} отзывов, {SIZES["comments"]} комментариев',
+        results,
+    )
+    if args.save:
+        save_baseline(NAME, results)
+    if args.compare:
+        print()
+        if compare_baseline(NAME, results, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
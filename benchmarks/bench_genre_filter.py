@@ -0,0 +1,95 @@
+"""
+Фильтрация произведений по нескольким жанрам.
+
+Сравнивает фильтр через JOIN по genre__slug (с distinct(), без которого
+строки и рейтинг размножаются) и полусоединения TitleFilter
+на произведениях с большим числом жанров.
+
+    python -m benchmarks.bench_genre_filter
+"""
+import random
+
+from benchmarks.common import measure, report, setup_django
+
+TITLES = 2000
+GENRES = 40
+GENRES_PER_TITLE = 15
+REVIEWS_PER_TITLE = 3
+
+
+def populate():
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Genre, Review, Title
+
+    User = get_user_model()
+    rnd = random.Random(0)
+    genres = Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(GENRES)
+    )
+    titles = Title.objects.bulk_create(
+        Title(name=f'Произведение {i}', year=2000) for i in range(TITLES)
+    )
+    authors = User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(REVIEWS_PER_TITLE)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+        for title in titles
+        for genre in rnd.sample(genres, GENRES_PER_TITLE)
+    )
+    Review.objects.bulk_create(
+        Review(title=title, author=author, text='.', score=rnd.randint(1, 10))
+        for title in titles
+        for author in authors
+    )
+
+
+def main():
+    setup_django()
+    populate()
+
+    from django.db.models import Avg
+
+    from api.filters import TitleFilter
+    from reviews.models import Title
+
+    slugs = ['genre-1', 'genre-2', 'genre-3']
+    base = Title.objects.annotate(rating=Avg('reviews__score'))
+
+    def join_any():
+        return list(
+            base.filter(genre__slug__in=slugs).distinct()
+        )
+
+    def join_all():
+        queryset = base
+        for slug in slugs:
+            queryset = queryset.filter(genre__slug=slug)
+        return list(queryset.distinct())
+
+    def exists(mode):
+        def run():
+            return list(TitleFilter(
+                {'genre': ','.join(slugs), 'genre_mode': mode},
+                queryset=base,
+            ).qs)
+        return run
+
+    assert len(join_any()) == len(exists('any')())
+    assert len(join_all()) == len(exists('all')())
+    report(
+        f'Фильтр по {len(slugs)} жанрам: {TITLES} произведений '
+        f'по {GENRES_PER_TITLE} жанров',
+        {
+            'JOIN + distinct, any': measure(join_any),
+            'полусоединение, genre_mode=any': measure(exists('any')),
+            'JOIN + distinct, all': measure(join_all),
+            'полусоединение, genre_mode=all': measure(exists('all')),
+        },
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""
+Кодирование ответов API и разбор тел запросов в JSON.
+
+Сравнивает JSONRenderer/JSONParser DRF (стандартный json) с
+FastJSONRenderer/FastJSONParser (orjson) на типичных данных: странице
+произведений с жанрами и категорией и странице отзывов.
+
+    python -m benchmarks.bench_json_renderer
+"""
+import io
+
+from benchmarks.common import measure, report, setup_django
+
+PAGE_SIZE = 100
+
+
+def title_page():
+    return {
+        'count': 1000,
+        'next': 'http://testserver/api/v1/titles/?page=2',
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'name': f'Произведение {i}',
+                'year': 1900 + i % 120,
+                'rating': i % 10 or None,
+                'weighted_rating': 5.0 + i / 1000,
+                'description': 'Описание произведения ' * 5,
+                'genre': [
+                    {'name': 'Драма', 'slug': 'drama'},
+                    {'name': 'Комедия', 'slug': 'comedy'},
+                ],
+                'category': {'name': 'Фильм', 'slug': 'films'},
+            }
+            for i in range(PAGE_SIZE)
+        ],
+    }
+
+
+def review_page():
+    return {
+        'count': 1000,
+        'next': None,
+        'previous': None,
+        'results': [
+            {
+                'id': i,
+                'text': 'Текст отзыва ' * 20,
+                'author': f'user{i}',
+                'score': i % 10 + 1,
+                'pub_date': '2024-01-02T03:04:05.678901Z',
+            }
+            for i in range(PAGE_SIZE)
+        ],
+    }
+
+
+def main():
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.parsers import FastJSONParser
+    from api.renderers import FastJSONRenderer, orjson
+
+    if orjson is None:
+        print('orjson не установлен: FastJSONRenderer использует json.')
+
+    results = {}
+    for name, payload in (
+        ('произведения', title_page()),
+        ('отзывы', review_page()),
+    ):
+        body = JSONRenderer().render(payload)
+        assert FastJSONRenderer().render(payload) == body
+        for label, renderer, parser in (
+            ('json', JSONRenderer(), JSONParser()),
+            ('orjson', FastJSONRenderer(), FastJSONParser()),
+        ):
+            results[f'{name}, вывод, {label}'] = measure(
+                lambda: renderer.render(payload), repeat=200
+            )
+            results[f'{name}, разбор, {label}'] = measure(
+                lambda: parser.parse(io.BytesIO(body)), repeat=200
+            )
+    report(f'JSON страницы из {PAGE_SIZE} объектов', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Сериализация страниц произведений, отзывов и комментариев.
+
+Сравнивает ModelSerializer-ы (как раньше отдавались GET-запросы)
+с быстрыми сериализаторами строк QuerySet.values(), которые сейчас
+используют вьюсеты для list и retrieve. Время включает выборку из базы;
+авторы для ModelSerializer подгружаются select_related, чтобы сравнение
+не сводилось к N+1 запросам.
+
+    python -m benchmarks.bench_read_serializers
+"""
+import random
+
+from benchmarks.common import measure, report, setup_django
+
+TITLES = 100
+GENRES = 10
+GENRES_PER_TITLE = 3
+REVIEWS = 100
+COMMENTS = 100
+PAGE_SIZE = 100
+
+
+def populate():
+    from django.contrib.auth import get_user_model
+
+    from reviews.models import Category, Comment, Genre, Review, Title
+
+    User = get_user_model()
+    rnd = random.Random(0)
+    category = Category.objects.create(name='Фильм', slug='films')
+    genres = Genre.objects.bulk_create(
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}') for i in range(GENRES)
+    )
+    titles = Title.objects.bulk_create(
+        Title(
+            name=f'Произведение {i}',
+            year=2000,
+            description='Описание',
+            category=category,
+        )
+        for i in range(TITLES)
+    )
+    Title.genre.through.objects.bulk_create(
+        Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+        for title in titles
+        for genre in rnd.sample(genres, GENRES_PER_TITLE)
+    )
+    authors = User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(REVIEWS)
+    )
+    reviews = Review.objects.bulk_create(
+        Review(
+            title=titles[0],
+            author=author,
+            text='Отзыв',
+            score=rnd.randint(1, 10),
+        )
+        for author in authors
+    )
+    Comment.objects.bulk_create(
+        Comment(review=reviews[0], author=author, text='Комментарий')
+        for author in authors[:COMMENTS]
+    )
+
+
+def main():
+    setup_django()
+    populate()
+
+    from django.db.models import Avg
+
+    from api.serializers import (
+        CommentSerializer,
+        CommentValuesSerializer,
+        ReviewSerializer,
+        ReviewValuesSerializer,
+        TitleReadSerializer,
+        TitleValuesSerializer,
+    )
+    from reviews.models import Comment, Review, Title
+
+    querysets = {
+        'произведения': (
+            Title.objects.annotate(rating=Avg('reviews__score')),
+            TitleReadSerializer,
+            TitleValuesSerializer,
+        ),
+        'отзывы': (
+            Review.objects.select_related('author'),
+            ReviewSerializer,
+            ReviewValuesSerializer,
+        ),
+        'комментарии': (
+            Comment.objects.select_related('author'),
+            CommentSerializer,
+            CommentValuesSerializer,
+        ),
+    }
+
+    def model(queryset, serializer_class):
+        def run():
+            return serializer_class(
+                queryset[:PAGE_SIZE], many=True
+            ).data
+        return run
+
+    def values(queryset, serializer_class):
+        rows = queryset.values(*serializer_class.value_fields())
+
+        def run():
+            return serializer_class(rows[:PAGE_SIZE], many=True).data
+        return run
+
+    results = {}
+    for name, (queryset, slow, fast) in querysets.items():
+        assert model(queryset, slow)() == values(queryset, fast)()
+        results[f'{name}, ModelSerializer'] = measure(model(queryset, slow))
+        results[f'{name}, .values()'] = measure(values(queryset, fast))
+    report(f'Сериализация страницы из {PAGE_SIZE} объектов', results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Одновременные отзывы на одно произведение.
+
+USERS пользователей отправляют по ATTEMPTS отзывов с разными оценками
+на одно произведение из THREADS потоков; запросы одного пользователя
+идут подряд и выполняются параллельно, как повторные нажатия кнопки.
+Запросы проходят через весь обработчик Django (тестовый клиент).
+
+После нагрузки проверяется, что:
+- нет ответов 5xx, у каждого пользователя ровно один ответ 201,
+  остальные — 400;
+- средняя оценка в базе и рейтинг в API совпадают с принятыми оценками;
+- счётчики оценок и weighted_rating, которые обновляются сигналами
+  при каждом отзыве, совпадают с пересчётом с нуля.
+
+SQLite работает с файлом во временной папке (база в памяти не
+выдерживает записи из нескольких потоков); с PostgreSQL в DATABASES
+нагрузка на базу реальнее.
+
+    python -m benchmarks.bench_review_concurrency
+    python -m benchmarks.bench_review_concurrency --threads 32 --users 500
+
+При нарушении проверок завершается с кодом 1.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks.common import percentile, setup_django
+
+THREADS = 16
+USERS = 200
+ATTEMPTS = 3
+
+
+def populate(users):
+    from django.contrib.auth import get_user_model
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from reviews.models import Category, Genre, Title
+
+    User = get_user_model()
+    category = Category.objects.create(name='Фильм', slug='films')
+    genre = Genre.objects.create(name='Драма', slug='drama')
+    title = Title.objects.create(name='Премьера', year=2024, category=category)
+    title.genre.add(genre)
+    authors = User.objects.bulk_create(
+        User(username=f'user{i}', email=f'user{i}@yamdb.fake')
+        for i in range(users)
+    )
+    return title, [
+        f'Bearer {AccessToken.for_user(author)}' for author in authors
+    ]
+
+
+def hammer(title, tokens, attempts, threads):
+    """Отправляет отзывы; возвращает [(пользователь, оценка, статус, мс)]."""
+    from django.db import connections
+    from django.test import Client
+
+    url = f'/api/v1/titles/{title.pk}/reviews/'
+    rnd = random.Random(0)
+    tasks = [
+        (user, token, rnd.randint(1, 10))
+        for user, token in enumerate(tokens)
+        for _ in range(attempts)
+    ]
+    local = threading.local()
+
+    def post(task):
+        user, token, score = task
+        if not hasattr(local, 'client'):
+            # Ошибки сервера считаются ответами 500, а не исключениями.
+            local.client = Client(raise_request_exception=False)
+        started = time.perf_counter()
+        response = local.client.post(
+            url,
+            {'text': 'Отзыв', 'score': score},
+            content_type='application/json',
+            HTTP_AUTHORIZATION=token,
+        )
+        return (
+            user, score, response.status_code,
+            (time.perf_counter() - started) * 1000,
+        )
+
+    def close_connections():
+        connections.close_all()
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(post, tasks))
+        # Каждый поток закрывает своё подключение к базе.
+        barrier = threading.Barrier(threads)
+        list(pool.map(
+            lambda _: (barrier.wait(), close_connections()), range(threads)
+        ))
+    return results
+
+
+def check(title, results):
+    """Проверки согласованности; возвращает список ошибок."""
+    from django.db.models import Avg
+    from django.test import Client
+
+    from reviews.models import Review, ScoreBucket
+    from reviews.stats import (
+        get_prior_mean,
+        rebuild_score_buckets,
+        refresh_weighted_ratings,
+    )
+
+    errors = []
+    statuses = Counter(status for _, _, status, _ in results)
+    if any(status >= 500 for status in statuses):
+        errors.append(f'ответы 5xx: {dict(statuses)}')
+    created = Counter(user for user, _, status, _ in results if status == 201)
+    users = {user for user, _, _, _ in results}
+    if set(created) != users or set(created.values()) != {1}:
+        errors.append('не у каждого пользователя ровно один отзыв создан')
+    if statuses[201] + statuses[400] != len(results):
+        errors.append(f'неожиданные статусы: {dict(statuses)}')
+
+    accepted = [score for _, score, status, _ in results if status == 201]
+    reviews = Review.objects.filter(title=title)
+    if reviews.count() != len(accepted):
+        errors.append(
+            f'отзывов в базе {reviews.count()}, принято {len(accepted)}'
+        )
+    expected = sum(accepted) / len(accepted) if accepted else None
+    average = reviews.aggregate(average=Avg('score'))['average']
+    if average is None or abs(average - expected) > 1e-9:
+        errors.append(f'средняя оценка {average}, ожидалась {expected}')
+    rating = Client().get(f'/api/v1/titles/{title.pk}/').json()['rating']
+    if expected is not None and rating != int(expected):
+        errors.append(f'рейтинг в API {rating}, ожидался {int(expected)}')
+
+    buckets = dict(
+        ScoreBucket.objects.filter(title=title, count__gt=0)
+        .values_list('score', 'count')
+    )
+    if buckets != dict(Counter(accepted)):
+        errors.append(f'счётчики оценок {buckets} не совпадают с отзывами')
+    title.refresh_from_db()
+    incremental = title.weighted_rating
+    rebuild_score_buckets([title.pk])
+    refresh_weighted_ratings([title.pk], prior_mean=get_prior_mean())
+    title.refresh_from_db()
+    if incremental is None or abs(incremental - title.weighted_rating) > 1e-9:
+        errors.append(
+            f'weighted_rating {incremental}, после пересчёта '
+            f'{title.weighted_rating}'
+        )
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--threads', type=int, default=THREADS)
+    parser.add_argument('--users', type=int, default=USERS)
+    parser.add_argument('--attempts', type=int, default=ATTEMPTS)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        setup_django(test_database=Path(directory) / 'test.sqlite3')
+        title, tokens = populate(args.users)
+        started = time.perf_counter()
+        results = hammer(title, tokens, args.attempts, args.threads)
+        elapsed = time.perf_counter() - started
+        errors = check(title, results)
+
+    timings = sorted(ms for _, _, _, ms in results)
+    statuses = Counter(status for _, _, status, _ in results)
+    print(
+        f'{len(results)} запросов в {args.threads} потоках за '
+        f'{elapsed:.2f} с ({len(results) / elapsed:.1f} в секунду)'
+    )
+    print(
+        f'задержка, мс: p50 {percentile(timings, 50):.1f}, '
+        f'p95 {percentile(timings, 95):.1f}, '
+        f'p99 {percentile(timings, 99):.1f}'
+    )
+    print('статусы: ' + ', '.join(
+        f'{status}: {count}' for status, count in sorted(statuses.items())
+    ))
+    if errors:
+        print('ОШИБКИ:\n' + '\n'.join(f'- {error}' for error in errors))
+        sys.exit(1)
+    print('Проверки пройдены')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Общие утилиты бенчмарков.
+
+Бенчмарки запускаются из корня репозитория как модули, например:
+    python -m benchmarks.bench_genre_filter
+
+База данных создаётся так же, как в тестах: отдельная тестовая БД
+(для SQLite — в памяти), поэтому рабочая db.sqlite3 не затрагивается.
+
+Результаты можно сохранить как baseline (benchmarks/baselines/*.json)
+и сравнивать с ним последующие прогоны, см. save_baseline и
+compare_baseline.
+"""
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+BASELINES_DIR = Path(__file__).resolve().parent / 'baselines'
+
+
+def setup_django(settings_module='api_yamdb.settings', test_database=None):
+    """
+    Настраивает Django и создаёт пустую тестовую базу данных.
+
+    test_database — файл тестовой базы SQLite вместо базы в памяти: он
+    нужен, когда к базе одновременно пишут несколько потоков. Запись
+    тогда ждёт освобождения блокировки, а не падает сразу.
+    """
+    if str(PROJECT_DIR) not in sys.path:
+        sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    if test_database is not None and connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = str(test_database)
+        connection.settings_dict['OPTIONS'].update(
+            timeout=60, transaction_mode='IMMEDIATE'
+        )
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def percentile(timings, percent):
+    """Перцентиль отсортированного списка по ближайшему рангу."""
+    return timings[min(len(timings) - 1, int(len(timings) * percent / 100))]
+
+
+def measure(func, repeat=20, warmup=2):
+    """
+    Запускает func repeat раз и возвращает статистику времени в мс
+    и пропускную способность (вызовов в секунду).
+
+    Количество SQL-запросов считается по последнему прогону.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'min': timings[0],
+        'median': statistics.median(timings),
+        'p95': percentile(timings, 95),
+        'p99': percentile(timings, 99),
+        'throughput': 1000 * len(timings) / sum(timings),
+        'queries': len(queries),
+    }
+
+
+def report(title, results):
+    """Печатает таблицу результатов {название: статистика}."""
+    width = max([40, *(len(name) + 2 for name in results)])
+    print(title)
+    print(f'{"вариант":<{width}}{"min, мс":>10}{"median, мс":>12}'
+          f'{"p95, мс":>10}{"p99, мс":>10}{"в секунду":>11}'
+          f'{"запросов":>10}')
+    for name, stats in results.items():
+        print(
+            f'{name:<{width}}{stats["min"]:>10.2f}{stats["median"]:>12.2f}'
+            f'{stats["p95"]:>10.2f}{stats["p99"]:>10.2f}'
+            f'{stats["throughput"]:>11.1f}{stats["queries"]:>10}'
+        )
+
+
+def baseline_path(name):
+    return BASELINES_DIR / f'{name}.json'
+
+
+def save_baseline(name, results):
+    """Сохраняет результаты как baseline бенчмарка name."""
+    BASELINES_DIR.mkdir(exist_ok=True)
+    baseline_path(name).write_text(json.dumps({
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {
+            case: {key: round(value, 3) for key, value in stats.items()}
+            for case, stats in results.items()
+        },
+    }, ensure_ascii=False, indent=1, sort_keys=True) + '\n', encoding='utf-8')
+    print(f'Baseline сохранён в {baseline_path(name)}')
+
+
+def compare_baseline(name, results, tolerance):
+    """
+    Сравнивает результаты с baseline бенчмарка name и печатает таблицу.
+
+    Регрессия — лучшее время (min, меньше всего зависит от фоновой
+    нагрузки) выросло больше чем в 1 + tolerance раз или
+    запросов к БД стало больше. Время зависит от машины, поэтому
+    baseline стоит снимать на той же машине, что и сравнение; число
+    запросов от машины не зависит. Возвращает названия регрессий.
+    """
+    baseline = json.loads(baseline_path(name).read_text(encoding='utf-8'))
+    width = max([40, *(len(case) + 2 for case in results)])
+    print(
+        f'Сравнение с baseline (Python {baseline["python"]}, '
+        f'{baseline["platform"]}), допуск {tolerance:.0%}'
+    )
+    print(f'{"вариант":<{width}}{"было, мс":>10}{"стало, мс":>11}'
+          f'{"изменение":>11}{"запросов":>12}')
+    regressions = []
+    for case, stats in results.items():
+        old = baseline['results'].get(case)
+        if old is None:
+            print(f'{case:<{width}}{"нет в baseline":>44}')
+            continue
+        change = stats['min'] / old['min'] - 1
+        regressed = (
+            change > tolerance or stats['queries'] > old['queries']
+        )
+        if regressed:
+            regressions.append(case)
+        queries = f'{old["queries"]}->{stats["queries"]}'
+        print(
+            f'{case:<{width}}{old["min"]:>10.2f}{stats["min"]:>11.2f}'
+            f'{change:>+11.0%}{queries:>12}'
+            + ('  РЕГРЕССИЯ' if regressed else '')
+        )
+    return regressions
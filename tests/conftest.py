@@ -28,4 +28,6 @@ if FILENAME not in project_dir_content:
 
 pytest_plugins = [
     'tests.fixtures.fixture_user',
+    'tests.fixtures.fixture_nplusone',
+    'tests.fixtures.fixture_query_budget',
 ]
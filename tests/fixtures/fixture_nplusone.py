@@ -0,0 +1,13 @@
+import pytest
+
+
+@pytest.fixture
+def no_n_plus_one(settings):
+    """
+    Запросы к API падают с NPlusOneError при повторе формы SQL.
+
+    В тестах создаётся по 2–3 объекта, поэтому порог ниже, чем по
+    умолчанию: запрос на каждый объект списка даст уже 3 повтора.
+    """
+    settings.NPLUSONE_DETECTION = 'raise'
+    settings.NPLUSONE_THRESHOLD = 2
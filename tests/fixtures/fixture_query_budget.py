@@ -0,0 +1,32 @@
+import pytest
+from django.db import connection
+from django.test.client import ClientHandler
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import check_query_count, query_budget
+
+
+@pytest.fixture
+def query_budgets(monkeypatch):
+    """
+    Успешные запросы тестовых клиентов к API укладываются в QUERY_BUDGETS.
+
+    Проверяются все клиенты теста, в том числе в create_* из tests.utils.
+    """
+    get_response = ClientHandler.get_response
+
+    def budgeted_get_response(handler, request):
+        budget = query_budget(request)
+        if budget is None:
+            return get_response(handler, request)
+        with CaptureQueriesContext(connection) as queries:
+            response = get_response(handler, request)
+        if response.status_code < 300:
+            check_query_count(
+                f'{request.method}-запрос к `{request.path}`',
+                queries,
+                budget,
+            )
+        return response
+
+    monkeypatch.setattr(ClientHandler, 'get_response', budgeted_get_response)
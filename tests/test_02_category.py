@@ -9,6 +9,7 @@ from tests.utils import (
 
 
 @pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('query_budgets')
 class Test02CategoryAPI:
 
     CATEGORY_URL = '/api/v1/categories/'
@@ -2,13 +2,15 @@ from http import HTTPStatus
 
 import pytest
 
+from reviews.models import Genre, Title
 from tests.utils import (
-    check_pagination, check_permissions, create_categories, create_genre,
-    create_titles
+    QUERY_BUDGETS, assert_max_queries, check_pagination, check_permissions,
+    create_categories, create_genre, create_titles
 )
 
 
 @pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('no_n_plus_one', 'query_budgets')
 class Test04TitleAPI:
 
     TITLES_URL = '/api/v1/titles/'
@@ -353,3 +355,21 @@ class Test04TitleAPI:
             f'Проверьте, что PUT-запрос к `{self.TITLES_DETAIL_URL_TEMPLATE} '
             'не предусмотрен и возвращает статус 405.'
         )
+
+    def test_07_titles_list_query_budget(self, client, admin_client):
+        create_titles(admin_client)
+        genres = list(Genre.objects.all())
+        titles = Title.objects.bulk_create(
+            Title(name=f'Произведение {i}', year=2000) for i in range(12)
+        )
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.pk, genre_id=genre.pk)
+            for title in titles
+            for genre in genres
+        )
+        budget = QUERY_BUDGETS['GET', 'titles-list']
+        for url in (self.TITLES_URL, f'{self.TITLES_URL}?page=3'):
+            with assert_max_queries(budget, f'GET-запрос к `{url}`'):
+                response = client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()['results']
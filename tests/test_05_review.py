@@ -10,6 +10,7 @@ from tests.utils import (
 
 
 @pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('no_n_plus_one', 'query_budgets')
 class Test05ReviewAPI:
 
     TITLE_DETAIL_URL_TEMPLATE = '/api/v1/titles/{title_id}/'
@@ -7,6 +7,7 @@ from tests.utils import (check_fields, check_pagination, create_comments,
 
 
 @pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('no_n_plus_one', 'query_budgets')
 class Test06CommentAPI:
     COMMENTS_URL_TEMPLATE = (
         '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
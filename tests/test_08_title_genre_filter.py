@@ -0,0 +1,97 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleGenreFilter:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_genre_any(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.get(
+            f'{self.TITLES_URL}?genre={genres[0]["slug"]},{genres[2]["slug"]}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        names = {title['name'] for title in response.json()['results']}
+        assert names == {titles[0]['name'], titles[1]['name']}, (
+            'Проверьте, что при фильтрации по нескольким жанрам через '
+            'запятую возвращаются произведения хотя бы с одним из них.'
+        )
+
+    def test_02_genre_all(self, admin_client):
+        titles, _, genres = create_titles(admin_client)
+        response = admin_client.get(
+            f'{self.TITLES_URL}?genre={genres[0]["slug"]},{genres[1]["slug"]}'
+            '&genre_mode=all'
+        )
+        data = response.json()
+        assert [title['name'] for title in data['results']] == [
+            titles[0]['name']
+        ], (
+            'Проверьте, что при `genre_mode=all` возвращаются только '
+            'произведения со всеми перечисленными жанрами.'
+        )
+        response = admin_client.get(
+            f'{self.TITLES_URL}?genre={genres[0]["slug"]},{genres[2]["slug"]}'
+            '&genre_mode=all'
+        )
+        assert response.json()['count'] == 0
+
+    def test_03_genre_mode_invalid(self, admin_client):
+        response = admin_client.get(
+            f'{self.TITLES_URL}?genre=horror&genre_mode=some'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что недопустимое значение `genre_mode` приводит к '
+            'ответу со статусом 400.'
+        )
+
+    def test_04_no_duplicates_and_rating(self, admin_client, user_client,
+                                         moderator_client):
+        titles, _, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 2)
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 9)
+        for mode in ('any', 'all'):
+            response = admin_client.get(
+                f'{self.TITLES_URL}?genre={genres[0]["slug"]},'
+                f'{genres[1]["slug"]}&genre_mode={mode}'
+            )
+            data = response.json()
+            assert data['count'] == 1, (
+                'Проверьте, что фильтрация по нескольким жанрам не '
+                'дублирует произведения в выдаче.'
+            )
+            assert data['results'][0]['rating'] == 5, (
+                'Проверьте, что фильтрация по нескольким жанрам не '
+                'искажает рейтинг произведения.'
+            )
+
+    def test_05_genre_all_case_insensitive(self, admin_client):
+        for slug in ('Drama', 'drama', 'comedy'):
+            response = admin_client.post(
+                '/api/v1/genres/', data={'name': slug, 'slug': slug}
+            )
+            assert response.status_code == HTTPStatus.CREATED
+        for name, genre in (
+            ('Обе драмы', ['Drama', 'drama', 'comedy']),
+            ('Одна драма', ['Drama', 'comedy']),
+            ('Без комедии', ['Drama', 'drama']),
+        ):
+            response = admin_client.post(
+                self.TITLES_URL,
+                data={'name': name, 'year': 2000, 'genre': genre},
+                format='json',
+            )
+            assert response.status_code == HTTPStatus.CREATED
+        response = admin_client.get(
+            f'{self.TITLES_URL}?genre=DRAMA,comedy&genre_mode=all'
+        )
+        names = {title['name'] for title in response.json()['results']}
+        assert names == {'Обе драмы', 'Одна драма'}, (
+            'Проверьте, что при `genre_mode=all` жанры, совпадающие со '
+            'слагом без учёта регистра, засчитываются как один.'
+        )
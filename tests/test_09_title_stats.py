@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09TitleStats:
+
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+
+    @pytest.mark.parametrize('title_id', [0, 'abc'])
+    def test_01_stats_not_found(self, client, title_id):
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Проверьте, что запрос статистики несуществующего произведения '
+            'возвращает ответ со статусом 404.'
+        )
+
+    def test_02_stats_empty(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        response = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data['count'] == 0
+        assert data['mean'] is None and data['median'] is None
+        assert [bucket['score'] for bucket in data['histogram']] == list(
+            range(1, 11)
+        ), 'Гистограмма должна содержать корзины для оценок от 1 до 10.'
+
+    def test_03_stats_follow_reviews(self, client, admin_client, user_client,
+                                     moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отзыв', 2)
+        create_single_review(moderator_client, title_id, 'Отзыв', 9)
+        review_id = create_single_review(
+            user_client, title_id, 'Отзыв', 4
+        ).json()['id']
+        url = self.STATS_URL_TEMPLATE.format(title_id=title_id)
+
+        data = client.get(url).json()
+        assert (data['count'], data['mean'], data['median']) == (3, 5, 4), (
+            'Проверьте, что статистика учитывает созданные отзывы.'
+        )
+
+        user_client.patch(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            ),
+            data={'score': 10}
+        )
+        data = client.get(url).json()
+        histogram = {
+            bucket['score']: bucket['count'] for bucket in data['histogram']
+        }
+        assert histogram[4] == 0 and histogram[10] == 1, (
+            'Проверьте, что статистика учитывает изменение оценки.'
+        )
+        assert (data['count'], data['median']) == (3, 9)
+
+        user_client.delete(
+            self.REVIEW_DETAIL_URL_TEMPLATE.format(
+                title_id=title_id, review_id=review_id
+            )
+        )
+        data = client.get(url).json()
+        assert (data['count'], data['mean'], data['median']) == (
+            2, 5.5, 5.5
+        ), 'Проверьте, что статистика учитывает удаление отзыва.'
@@ -0,0 +1,47 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10WeightedRating:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_weighted_rating_ordering(self, client, admin_client,
+                                         user_client, moderator_client,
+                                         user_superuser_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 10)
+        for author_client in (
+            moderator_client, admin_client, user_superuser_client
+        ):
+            create_single_review(author_client, titles[0]['id'], 'Отзыв', 9)
+
+        response = client.get(f'{self.TITLES_URL}?ordering=-weighted_rating')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert [title['id'] for title in results] == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            'Проверьте, что при сортировке по `weighted_rating` произведение '
+            'с одним высоким отзывом не обгоняет произведение с несколькими '
+            'отзывами чуть ниже.'
+        )
+        assert results[1]['rating'] == 10
+        assert results[0]['weighted_rating'] > results[1]['weighted_rating']
+
+    def test_02_refresh_ratings(self, client, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 10)
+        call_command('refresh_ratings', '--rebuild-buckets')
+        response = client.get(f'{self.TITLES_URL}{titles[0]["id"]}/')
+        assert response.json()['weighted_rating'] == pytest.approx(10), (
+            'Если все отзывы имеют одну оценку, после обновления средней '
+            'оценки взвешенный рейтинг должен совпадать с ней.'
+        )
+        response = client.get(f'{self.TITLES_URL}{titles[1]["id"]}/')
+        assert response.json()['weighted_rating'] is None
@@ -0,0 +1,156 @@
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import (
+    LeaderboardEntry,
+    StaleLeaderboard,
+    StaleLeaderboardTitle,
+)
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11Leaderboards:
+
+    LEADERBOARDS_URL = '/api/v1/leaderboards/'
+
+    def prepare(self, admin_client, user_client):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 9)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 3)
+        self.refresh_stale()
+        return titles, categories, genres
+
+    @staticmethod
+    def refresh_stale():
+        call_command('refresh_leaderboards', '--stale', stdout=StringIO())
+
+    def test_01_overall(self, client, admin_client, user_client,
+                        django_assert_num_queries):
+        titles, _, _ = self.prepare(admin_client, user_client)
+        with django_assert_num_queries(1):
+            response = client.get(f'{self.LEADERBOARDS_URL}overall/')
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [entry['title']['id'] for entry in data] == [
+            titles[0]['id'], titles[1]['id']
+        ], (
+            'Проверьте, что общий рейтинг упорядочен по взвешенному '
+            'рейтингу произведений.'
+        )
+        assert [entry['position'] for entry in data] == [1, 2]
+
+    def test_02_category_genre_year(self, client, admin_client, user_client):
+        titles, categories, genres = self.prepare(admin_client, user_client)
+        expected = {
+            f'category/{categories[1]["slug"]}/': [titles[1]['id']],
+            f'genre/{genres[0]["slug"]}/': [titles[0]['id']],
+            f'genre/{genres[2]["slug"]}/': [titles[1]['id']],
+            f'year/{titles[0]["year"]}/': [titles[0]['id']],
+        }
+        for path, title_ids in expected.items():
+            response = client.get(f'{self.LEADERBOARDS_URL}{path}')
+            assert response.status_code == HTTPStatus.OK
+            assert [
+                entry['title']['id'] for entry in response.json()
+            ] == title_ids, (
+                f'Проверьте содержимое рейтинга `{self.LEADERBOARDS_URL}'
+                f'{path}`.'
+            )
+
+    def test_03_title_moves_between_boards(self, client, admin_client,
+                                           user_client):
+        titles, categories, _ = self.prepare(admin_client, user_client)
+        admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            data={'category': categories[1]['slug']}
+        )
+        self.refresh_stale()
+        response = client.get(
+            f'{self.LEADERBOARDS_URL}category/{categories[0]["slug"]}/'
+        )
+        assert response.json() == [], (
+            'Проверьте, что при смене категории произведение исчезает из '
+            'рейтинга прежней категории.'
+        )
+        response = client.get(
+            f'{self.LEADERBOARDS_URL}category/{categories[1]["slug"]}/'
+        )
+        assert [entry['title']['id'] for entry in response.json()] == [
+            titles[0]['id'], titles[1]['id']
+        ]
+
+    def test_04_refresh_command(self, client, admin_client, user_client):
+        self.prepare(admin_client, user_client)
+        before = client.get(f'{self.LEADERBOARDS_URL}overall/').json()
+        call_command('refresh_leaderboards', stdout=StringIO())
+        after = client.get(f'{self.LEADERBOARDS_URL}overall/').json()
+        assert before == after, (
+            'Проверьте, что инкрементальное обновление рейтинга даёт тот же '
+            'результат, что и полный пересчёт командой refresh_leaderboards.'
+        )
+
+    @pytest.mark.parametrize('path', [
+        'unknown/', 'overall/extra/', 'category/', 'category/nothing/',
+        'year/abc/', 'year/%C2%B2/',
+    ])
+    def test_05_not_found(self, client, path):
+        response = client.get(f'{self.LEADERBOARDS_URL}{path}')
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_06_writes_only_mark_titles(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        self.refresh_stale()
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 9)
+        assert not LeaderboardEntry.objects.exists(), (
+            'Создание отзыва не должно пересчитывать рейтинги в запросе.'
+        )
+        assert list(StaleLeaderboardTitle.objects.values_list(
+            'title_id', flat=True
+        )) == [titles[0]['id']], (
+            'Произведение с новым отзывом должно быть отмечено для '
+            'пересчёта рейтингов.'
+        )
+        self.refresh_stale()
+        assert not StaleLeaderboardTitle.objects.exists()
+        assert list(LeaderboardEntry.objects.values_list(
+            'title_id', flat=True
+        )) == [titles[0]['id']] * 5, (
+            'refresh_leaderboards --stale должен пересчитать общий рейтинг '
+            'и рейтинги категории, жанров и года произведения.'
+        )
+
+    def test_07_deleted_title_leaves_no_gap(self, client, admin_client,
+                                            user_client):
+        titles, _, _ = self.prepare(admin_client, user_client)
+        response = admin_client.delete(f'/api/v1/titles/{titles[0]["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert StaleLeaderboard.objects.filter(
+            board='overall', key=''
+        ).exists(), (
+            'Удаление произведения из рейтинга должно отмечать рейтинг '
+            'для пересчёта.'
+        )
+        self.refresh_stale()
+        assert not StaleLeaderboard.objects.exists()
+        response = client.get(f'{self.LEADERBOARDS_URL}overall/')
+        assert [
+            (entry['position'], entry['title']['id'])
+            for entry in response.json()
+        ] == [(1, titles[1]['id'])], (
+            'После удаления произведения следующие должны подняться в '
+            'рейтинге.'
+        )
+        boards = {}
+        for board, key, position in LeaderboardEntry.objects.values_list(
+            'board', 'key', 'position'
+        ):
+            boards.setdefault((board, key), []).append(position)
+        assert all(
+            positions == list(range(1, len(positions) + 1))
+            for positions in boards.values()
+        ), 'Места в рейтингах должны идти подряд с первого.'
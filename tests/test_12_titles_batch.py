@@ -0,0 +1,58 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12TitlesBatch:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_batch_order_and_missing(self, client, admin_client,
+                                        user_client):
+        titles, categories, genres = create_titles(admin_client)
+        create_single_review(user_client, titles[1]['id'], 'Отзыв', 7)
+        missing_id = titles[1]['id'] + 100
+        response = client.get(
+            f'{self.TITLES_URL}?ids={titles[1]["id"]},{missing_id},'
+            f'{titles[0]["id"]}'
+        )
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert [title['id'] for title in data['results']] == [
+            titles[1]['id'], titles[0]['id']
+        ], (
+            'Проверьте, что пакетный запрос возвращает произведения в '
+            'порядке, указанном в параметре `ids`.'
+        )
+        assert data['missing'] == [missing_id], (
+            'Проверьте, что пакетный запрос перечисляет отсутствующие id в '
+            'ключе `missing`.'
+        )
+        first = data['results'][0]
+        assert first['rating'] == 7
+        assert first['category'] == categories[1]
+        assert first['genre'] == [genres[2]]
+        assert first == client.get(
+            f'{self.TITLES_URL}{titles[1]["id"]}/'
+        ).json(), (
+            'Произведение в пакетном ответе должно совпадать с ответом на '
+            'запрос одного произведения.'
+        )
+
+    def test_02_batch_query_count(self, client, admin_client,
+                                  django_assert_max_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = ','.join(str(title['id']) for title in titles)
+        with django_assert_max_num_queries(2):
+            response = client.get(f'{self.TITLES_URL}?ids={ids}')
+        assert len(response.json()['results']) == len(titles)
+
+    @pytest.mark.parametrize('ids', ['', 'a,b', '1,,-2', '%C2%B2', ','.join(
+        str(pk) for pk in range(1, 202)
+    )])
+    def test_03_batch_invalid(self, client, ids):
+        response = client.get(f'{self.TITLES_URL}?ids={ids}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
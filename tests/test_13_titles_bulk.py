@@ -0,0 +1,103 @@
+from http import HTTPStatus
+
+import pytest
+from rest_framework.test import APIClient
+
+from tests.utils import create_categories, create_genre, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TitlesBulk:
+
+    BULK_URL = '/api/v1/titles/bulk/'
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_bulk_permissions(self, user_client, moderator_client):
+        for user_client_, expected in (
+            (APIClient(), HTTPStatus.UNAUTHORIZED),
+            (user_client, HTTPStatus.FORBIDDEN),
+            (moderator_client, HTTPStatus.FORBIDDEN),
+        ):
+            response = user_client_.post(
+                self.BULK_URL, data=[{'name': 'a', 'year': 2000}],
+                format='json'
+            )
+            assert response.status_code == expected, (
+                'Проверьте, что массовая загрузка произведений доступна '
+                'только администратору.'
+            )
+
+    def test_02_bulk_create(self, admin_client,
+                            django_assert_max_num_queries):
+        genres = create_genre(admin_client)
+        categories = create_categories(admin_client)
+        data = [
+            {
+                'name': f'Произведение {idx}',
+                'year': 2000 + idx,
+                'genre': [genres[0]['slug'], genres[idx % 2 + 1]['slug']],
+                'category': categories[idx % 2]['slug'],
+            }
+            for idx in range(10)
+        ]
+        with django_assert_max_num_queries(10):
+            response = admin_client.post(
+                self.BULK_URL, data=data, format='json'
+            )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Если запрос массовой загрузки содержит корректные данные - '
+            'должен вернуться ответ со статусом 201.'
+        )
+        results = response.json()
+        assert [title['name'] for title in results] == [
+            item['name'] for item in data
+        ]
+        assert results[3]['genre'] == [genres[0], genres[2]] or (
+            results[3]['genre'] == [genres[2], genres[0]]
+        )
+        assert results[3]['category'] == categories[1]
+        assert admin_client.get(self.TITLES_URL).json()['count'] == 10
+
+    def test_03_bulk_update(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.BULK_URL, data=[
+            {'id': titles[0]['id'], 'genre': [genres[2]['slug']]},
+            {'id': titles[1]['id'], 'name': 'Новое название'},
+            {'name': 'Новое произведение', 'year': 2020},
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        first, second, third = response.json()
+        assert first['genre'] == [genres[2]]
+        assert first['name'] == titles[0]['name']
+        assert second['name'] == 'Новое название'
+        assert second['category'] == categories[1]
+        assert third['genre'] == [] and third['category'] is None
+
+    def test_04_bulk_invalid_is_atomic(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.post(self.BULK_URL, data=[
+            {'name': 'Годное', 'year': 2000, 'genre': [genres[0]['slug']]},
+            {'name': 'Без жанра', 'year': 2000, 'genre': ['unknown']},
+            {'name': 'Без категории', 'year': 2000, 'category': 'unknown'},
+            {'id': titles[0]['id'] + 100, 'name': 'Нет такого'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        errors = response.json()
+        assert errors[0] == {}
+        assert set(errors[1]) == {'genre'}
+        assert set(errors[2]) == {'category'}
+        assert set(errors[3]) == {'id'}
+        response = admin_client.post(self.BULK_URL, data=[
+            {'name': 'Годное', 'year': 2000},
+            {'name': 'Без года'},
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert set(response.json()[1]) == {'year'}
+        assert admin_client.get(self.TITLES_URL).json()['count'] == len(
+            titles
+        ), 'При ошибке в любом элементе ничего не должно сохраниться.'
+
+    @pytest.mark.parametrize('data', [[], {'name': 'a'}, [{}] * 201])
+    def test_05_bulk_invalid_payload(self, admin_client, data):
+        response = admin_client.post(self.BULK_URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
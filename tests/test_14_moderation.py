@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14Moderation:
+
+    MODERATION_URL = '/api/v1/moderation/'
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+    STATS_URL_TEMPLATE = '/api/v1/titles/{title_id}/stats/'
+
+    def prepare(self, admin_client, user, user_client, moderator,
+                moderator_client):
+        return create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+
+    def test_01_permissions(self, client, user_client, admin_client):
+        data = {'action': 'hide', 'author': 'TestUser'}
+        response = client.post(self.MODERATION_URL, data=data)
+        assert response.status_code == HTTPStatus.UNAUTHORIZED
+        response = user_client.post(self.MODERATION_URL, data=data)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что массовая модерация недоступна пользователю с '
+            'ролью `user`.'
+        )
+        response = admin_client.post(self.MODERATION_URL, data=data)
+        assert response.status_code == HTTPStatus.OK
+
+    @pytest.mark.parametrize('data', [
+        {'action': 'hide'},
+        {'action': 'burn', 'author': 'TestUser'},
+        {'action': 'hide', 'ids': [1]},
+        {'action': 'hide', 'date_from': '2030-01-01T00:00:00Z',
+         'date_to': '2020-01-01T00:00:00Z'},
+    ])
+    def test_02_invalid(self, moderator_client, data):
+        response = moderator_client.post(
+            self.MODERATION_URL, data=data, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_03_hide_and_unhide_author(self, client, admin_client, user,
+                                       user_client, moderator,
+                                       moderator_client):
+        comments, reviews, titles = self.prepare(
+            admin_client, user, user_client, moderator, moderator_client
+        )
+        title_id = titles[0]['id']
+        create_single_review(admin_client, title_id, 'Отзыв', 10)
+        response = moderator_client.post(
+            self.MODERATION_URL, data={'action': 'hide', 'author': user}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 1, 'comments': 1}
+
+        reviews_url = self.REVIEWS_URL_TEMPLATE.format(title_id=title_id)
+        visible = {review['id'] for review in client.get(
+            reviews_url
+        ).json()['results']}
+        assert reviews[0]['id'] not in visible, (
+            'Скрытые отзывы не должны отображаться в списке отзывов.'
+        )
+        assert client.get(
+            f'{reviews_url}{reviews[0]["id"]}/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[1]['id']
+        )
+        assert client.get(comments_url).status_code == HTTPStatus.OK
+        stats = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+        assert stats['count'] == 2, (
+            'Скрытые отзывы не должны учитываться в статистике оценок.'
+        )
+        title = client.get(f'/api/v1/titles/{title_id}/').json()
+        assert title['rating'] == 7, (
+            'Скрытые отзывы не должны учитываться в рейтинге.'
+        )
+
+        response = moderator_client.post(
+            self.MODERATION_URL, data={'action': 'unhide', 'author': user}
+        )
+        assert response.json() == {'reviews': 1, 'comments': 1}
+        stats = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=title_id)
+        ).json()
+        assert stats['count'] == 3
+
+    def test_04_delete_by_ids(self, client, admin_client, user, user_client,
+                              moderator, moderator_client):
+        comments, reviews, titles = self.prepare(
+            admin_client, user, user_client, moderator, moderator_client
+        )
+        response = moderator_client.post(self.MODERATION_URL, data={
+            'action': 'delete', 'target': 'reviews',
+            'ids': [reviews[0]['id']],
+        }, format='json')
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == {'reviews': 1, 'comments': 0}
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        assert client.get(comments_url).status_code == HTTPStatus.NOT_FOUND, (
+            'Комментарии к удалённому отзыву не должны быть доступны.'
+        )
+        stats = client.get(
+            self.STATS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        ).json()
+        assert stats['count'] == len(reviews) - 1
@@ -0,0 +1,78 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review
+from tests.utils import create_comments, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15SoftDelete:
+
+    REVIEW_DETAIL_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/'
+    )
+    COMMENTS_URL_TEMPLATE = (
+        '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+    def test_01_review_soft_delete(self, client, admin_client, user,
+                                   user_client, moderator, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        review_url = self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(review_url).status_code == HTTPStatus.NOT_FOUND
+        assert Review.objects.filter(pk=reviews[0]['id']).exists(), (
+            'Удаление отзыва через API должно быть мягким.'
+        )
+        assert client.get(self.COMMENTS_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        )).status_code == HTTPStatus.NOT_FOUND
+        stats = client.get(f'/api/v1/titles/{title_id}/stats/').json()
+        assert stats['count'] == len(reviews) - 1
+
+        create_single_review(user_client, title_id, 'Новый отзыв', 3)
+
+    def test_02_comment_soft_delete(self, client, admin_client, user,
+                                    user_client, moderator,
+                                    moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        comments_url = self.COMMENTS_URL_TEMPLATE.format(
+            title_id=titles[0]['id'], review_id=reviews[0]['id']
+        )
+        response = moderator_client.delete(
+            f'{comments_url}{comments[0]["id"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(comments_url).json()['count'] == len(comments) - 1
+
+    def test_03_purge_deleted(self, admin_client, user, user_client,
+                              moderator, moderator_client):
+        comments, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        title_id = titles[0]['id']
+        moderator_client.delete(
+            self.COMMENTS_URL_TEMPLATE.format(
+                title_id=title_id, review_id=reviews[0]['id']
+            ) + f'{comments[1]["id"]}/'
+        )
+        user_client.delete(self.REVIEW_DETAIL_URL_TEMPLATE.format(
+            title_id=title_id, review_id=reviews[0]['id']
+        ))
+        call_command('purge_deleted', '--batch-size', '1')
+        assert not Review.objects.filter(pk=reviews[0]['id']).exists()
+        assert not Comment.objects.exists(), (
+            'Команда purge_deleted должна удалять комментарии к удалённым '
+            'отзывам.'
+        )
+        assert Review.objects.count() == len(reviews) - 1
@@ -0,0 +1,94 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Comment, Review, Title
+from tests.utils import create_comments, create_titles
+
+
+@pytest.fixture
+def deletion_jobs(settings):
+    settings.DELETION_JOBS_ENABLED = True
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('deletion_jobs')
+class Test16DeletionJobs:
+
+    TITLES_URL = '/api/v1/titles/'
+    JOBS_URL = '/api/v1/deletion-jobs/'
+
+    def prepare(self, admin_client, user, user_client, moderator,
+                moderator_client):
+        return create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+
+    def test_01_title(self, client, admin_client, user, user_client,
+                      moderator, moderator_client):
+        _, _, titles = self.prepare(
+            admin_client, user, user_client, moderator, moderator_client
+        )
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        response = admin_client.delete(title_url)
+        assert response.status_code == HTTPStatus.ACCEPTED, (
+            'В режиме фонового удаления DELETE должен возвращать 202.'
+        )
+        job = response.json()
+        assert job['status'] == 'pending'
+        assert client.get(title_url).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            f'{title_url}reviews/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert client.get(
+            f'{title_url}stats/'
+        ).status_code == HTTPStatus.NOT_FOUND
+        assert Title.objects.filter(pk=titles[0]['id']).exists()
+
+        call_command('process_deletions', '--batch-size', '1')
+        assert not Title.objects.filter(pk=titles[0]['id']).exists()
+        assert not Review.objects.exists() and not Comment.objects.exists()
+        response = admin_client.get(f'{self.JOBS_URL}{job["id"]}/')
+        assert response.json()['status'] == 'done'
+        assert response.json()['processed'] == 4
+
+    def test_02_user_keeps_ratings(self, client, admin_client, user,
+                                   user_client, moderator,
+                                   moderator_client):
+        _, _, titles = self.prepare(
+            admin_client, user, user_client, moderator, moderator_client
+        )
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert user_client.get('/api/v1/users/me/').status_code == (
+            HTTPStatus.UNAUTHORIZED
+        ), 'Пользователь, ожидающий удаления, должен быть деактивирован.'
+        call_command('process_deletions')
+        stats = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/stats/'
+        ).json()
+        assert stats['count'] == 1, (
+            'После удаления пользователя его отзывы не должны учитываться в '
+            'статистике оценок.'
+        )
+        assert not Comment.objects.filter(author=user).exists()
+
+    def test_03_category(self, client, admin_client):
+        _, categories, _ = create_titles(admin_client)
+        url = f'/api/v1/categories/{categories[0]["slug"]}/'
+        assert admin_client.delete(url).status_code == HTTPStatus.ACCEPTED
+        slugs = [
+            category['slug'] for category in
+            client.get('/api/v1/categories/').json()['results']
+        ]
+        assert categories[0]['slug'] not in slugs
+        call_command('process_deletions')
+        assert not Title.objects.filter(
+            category__slug=categories[0]['slug']
+        ).exists()
+        assert Title.objects.count() == 2
+
+    def test_04_jobs_admin_only(self, user_client):
+        response = user_client.get(self.JOBS_URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN
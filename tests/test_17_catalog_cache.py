@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.cache import CatalogCache
+from reviews.cache import categories as category_cache
+from reviews.cache import genres as genre_cache
+from reviews.models import Genre, Title
+from tests.utils import create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17CatalogCache:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_list_without_catalog_queries(self, client, admin_client,
+                                             settings,
+                                             django_assert_num_queries):
+        settings.CATALOG_CACHE_CHECK_INTERVAL = 60
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_num_queries(3):
+            # count для пагинации, произведения и id их жанров.
+            response = client.get(self.TITLES_URL)
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert all(title['category'] for title in results), (
+            'Проверьте, что категория произведения берётся из кэша.'
+        )
+        assert any(title['genre'] for title in results)
+
+    def test_02_invalidated_on_change(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        category_slug = client.get(title_url).json()['category']['slug']
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Новая', 'slug': 'new'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert category_cache.get_by_slug('new') is not None, (
+            'Проверьте, что создание категории сбрасывает кэш справочника.'
+        )
+        response = admin_client.patch(
+            title_url, data={'category': 'new'}, format='json'
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert client.get(title_url).json()['category']['slug'] == 'new'
+
+        admin_client.delete('/api/v1/categories/new/')
+        assert category_cache.get_by_slug('new') is None
+        assert client.get(title_url).json()['category'] is None
+        assert category_cache.get_by_slug(category_slug) is not None
+
+    def test_03_filters_use_cache(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        slug = categories[0]['slug'].upper()
+        response = client.get(f'{self.TITLES_URL}?category={slug}')
+        assert response.json()['count'] == 1, (
+            'Проверьте, что фильтр `category` не зависит от регистра.'
+        )
+        response = client.get(f'{self.TITLES_URL}?genre=unknown')
+        assert response.json()['count'] == 0
+        assert genre_cache.filter_slug_iexact(genres[0]['slug'].upper())
+
+    def test_04_shared_between_processes(self, admin_client, settings):
+        settings.CATALOG_CACHE_CHECK_INTERVAL = 0
+        other_process = CatalogCache(Genre)
+        assert other_process.get_by_slug('new') is None
+        response = admin_client.post(
+            '/api/v1/genres/', data={'name': 'Новый', 'slug': 'new'}
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert other_process.get_by_slug('new') is not None, (
+            'Проверьте, что версия справочника хранится в базе и изменения '
+            'видны кэшам других процессов.'
+        )
+
+    def test_05_reload_on_miss(self, client, admin_client, settings):
+        settings.CATALOG_CACHE_CHECK_INTERVAL = 60
+        titles, _, _ = create_titles(admin_client)
+        title_url = f'{self.TITLES_URL}{titles[0]["id"]}/'
+        client.get(title_url)
+        # Жанр без сигналов, как из другого процесса до сверки версий.
+        genre, = Genre.objects.bulk_create(
+            [Genre(name='Без сигнала', slug='unsignalled')]
+        )
+        Title.genre.through.objects.create(
+            title_id=titles[0]['id'], genre_id=genre.pk
+        )
+        response = client.get(title_url)
+        slugs = {genre['slug'] for genre in response.json()['genre']}
+        assert 'unsignalled' in slugs, (
+            'Проверьте, что при промахе по id кэш справочника перечитывается, '
+            'а жанр не пропадает из ответа.'
+        )
@@ -0,0 +1,53 @@
+import pytest
+from django.db.models import Avg
+
+from api.serializers import (
+    CommentSerializer,
+    CommentValuesSerializer,
+    ReviewSerializer,
+    ReviewValuesSerializer,
+    TitleReadSerializer,
+    TitleValuesSerializer,
+)
+from reviews.models import Comment, Review, Title
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ValuesSerializers:
+
+    def compare(self, queryset, serializer_class, values_serializer_class):
+        expected = serializer_class(queryset, many=True).data
+        rows = queryset.values(*values_serializer_class.value_fields())
+        assert values_serializer_class(rows, many=True).data == expected, (
+            f'Проверьте, что {values_serializer_class.__name__} выводит '
+            f'то же, что и {serializer_class.__name__}.'
+        )
+        assert values_serializer_class(rows[0]).data == expected[0]
+
+    def test_01_same_output(self, admin_client, user, user_client,
+                            moderator, moderator_client):
+        create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        titles = Title.objects.annotate(rating=Avg('reviews__score'))
+        self.compare(titles, TitleReadSerializer, TitleValuesSerializer)
+        self.compare(
+            Review.objects.all(), ReviewSerializer, ReviewValuesSerializer
+        )
+        self.compare(
+            Comment.objects.all(), CommentSerializer, CommentValuesSerializer
+        )
+
+    def test_02_reviews_without_n_plus_one(self, client, admin_client, user,
+                                           user_client, moderator,
+                                           moderator_client,
+                                           django_assert_num_queries):
+        _, _, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        with django_assert_num_queries(3):
+            # Произведение, count и отзывы вместе с авторами одним JOIN.
+            response = client.get(url)
+        assert [review['author'] for review in response.json()['results']]
@@ -0,0 +1,68 @@
+import io
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from tests.utils import create_reviews
+
+
+class Test19JSONRenderer:
+
+    PAYLOADS = [
+        {
+            'name': 'Терминатор',
+            'rating': None,
+            'weighted_rating': 7.25,
+            'genre': [{'name': 'Ужасы', 'slug': 'horror'}],
+        },
+        {'pub_date': datetime(2024, 1, 2, 3, 4, 5, 678901, timezone.utc)},
+        {'price': Decimal('1.50'), 'lazy': gettext_lazy('Фильм')},
+        {'text': 'строка\u2028с разделителями\u2029'},
+        {'big': 2 ** 70},
+        [],
+    ]
+
+    @pytest.mark.parametrize('payload', PAYLOADS)
+    def test_01_same_output(self, payload):
+        assert FastJSONRenderer().render(payload) == (
+            JSONRenderer().render(payload)
+        ), 'Проверьте, что FastJSONRenderer выводит то же, что JSONRenderer.'
+
+    def test_02_indent_and_empty(self):
+        payload = self.PAYLOADS[0]
+        media_type = 'application/json; indent=4'
+        assert FastJSONRenderer().render(payload, media_type) == (
+            JSONRenderer().render(payload, media_type)
+        )
+        assert FastJSONRenderer().render(None) == b''
+
+    @pytest.mark.parametrize('body', [
+        '{"name": "Фильм", "year": 1984}',
+        '[1, 2.5, null, true]',
+        '{"big": 1180591620717411303424}',
+    ])
+    def test_03_parser(self, body):
+        assert FastJSONParser().parse(io.BytesIO(body.encode())) == (
+            JSONParser().parse(io.BytesIO(body.encode()))
+        )
+
+    @pytest.mark.parametrize('body', ['{"score": NaN}', '{', ''])
+    def test_04_parser_errors(self, body):
+        with pytest.raises(ParseError) as fast:
+            FastJSONParser().parse(io.BytesIO(body.encode()))
+        with pytest.raises(ParseError) as stdlib:
+            JSONParser().parse(io.BytesIO(body.encode()))
+        assert str(fast.value) == str(stdlib.value)
+
+    @pytest.mark.django_db(transaction=True)
+    def test_05_api_response(self, client, admin_client, user, user_client):
+        _, titles = create_reviews(admin_client, {user: user_client})
+        response = client.get(f'/api/v1/titles/{titles[0]["id"]}/reviews/')
+        assert response.content == JSONRenderer().render(response.json())
@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20SparseFields:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_title_fields(self, client, admin_client,
+                             django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_num_queries(2):
+            response = client.get(f'{self.TITLES_URL}?fields=name,id')
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()['results']
+        assert all(list(title) == ['id', 'name'] for title in results), (
+            'Проверьте, что параметр `fields` оставляет в ответе только '
+            'перечисленные поля в обычном порядке.'
+        )
+        response = client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/?fields=name'
+        )
+        assert response.json() == {'name': titles[0]['name']}
+
+    def test_02_title_exclude(self, client, admin_client,
+                              django_assert_num_queries):
+        create_titles(admin_client)
+        client.get(self.TITLES_URL)
+        with django_assert_num_queries(2):
+            response = client.get(
+                f'{self.TITLES_URL}?exclude=description,genre,rating'
+            )
+        title = response.json()['results'][0]
+        assert list(title) == [
+            'id', 'name', 'year', 'weighted_rating', 'category'
+        ], 'Проверьте, что параметр `exclude` убирает поля из ответа.'
+        assert title['category']
+
+    def test_03_sql_columns(self, client, admin_client,
+                            django_assert_num_queries):
+        create_titles(admin_client)
+        with django_assert_num_queries(2) as context:
+            client.get(f'{self.TITLES_URL}?fields=name')
+        sql = context.captured_queries[-1]['sql']
+        assert 'description' not in sql and 'reviews_review' not in sql, (
+            'Проверьте, что невыводимые столбцы и JOIN с отзывами не '
+            'попадают в запрос.'
+        )
+
+    def test_04_reviews_and_comments(self, client, admin_client, user,
+                                     user_client, moderator,
+                                     moderator_client):
+        _, reviews, titles = create_comments(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        reviews_url = f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+        response = client.get(f'{reviews_url}?exclude=text,pub_date')
+        assert list(response.json()['results'][0]) == [
+            'id', 'author', 'score'
+        ]
+        response = client.get(
+            f'{reviews_url}{reviews[0]["id"]}/comments/?fields=text'
+        )
+        assert {
+            comment['text'] for comment in response.json()['results']
+        } == {'comment number 1', 'comment number 2'}
+
+    @pytest.mark.parametrize('query', [
+        'fields=name,unknown', 'fields=', 'exclude=password'
+    ])
+    def test_05_invalid(self, client, admin_client, query):
+        create_titles(admin_client)
+        response = client.get(f'{self.TITLES_URL}?{query}')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Неизвестные поля в `fields` и `exclude` должны давать 400.'
+        )
+
+    def test_06_batch_without_id(self, client, admin_client,
+                                 django_assert_num_queries):
+        titles, _, _ = create_titles(admin_client)
+        ids = [titles[1]['id'], titles[0]['id']]
+        client.get(self.TITLES_URL)
+        with django_assert_num_queries(1):
+            response = client.get(
+                f'{self.TITLES_URL}?ids={ids[0]},{ids[1]},0&fields=name'
+            )
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что пакетный запрос работает и без `id` в `fields`.'
+        )
+        assert response.json() == {
+            'results': [
+                {'name': titles[1]['name']}, {'name': titles[0]['name']}
+            ],
+            'missing': [0],
+        }
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Export:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def read(self, response):
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, 'Выгрузка должна отдаваться потоком.'
+        return b''.join(response.streaming_content).decode()
+
+    def test_01_titles_ndjson(self, client, admin_client):
+        create_titles(admin_client)
+        response = admin_client.get(f'{self.TITLES_URL}export/ndjson/')
+        assert response['Content-Type'] == 'application/x-ndjson'
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        expected = client.get(self.TITLES_URL).json()
+        assert rows == expected['results'], (
+            'Проверьте, что выгрузка NDJSON содержит те же произведения, '
+            'что и список, по одному на строку.'
+        )
+
+    def test_02_titles_csv_filtered(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        response = admin_client.get(
+            f'{self.TITLES_URL}export/csv/'
+            f'?category={categories[0]["slug"]}&fields=id,name,genre'
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        assert rows == [
+            ['id', 'name', 'genre'],
+            [
+                str(titles[0]['id']),
+                titles[0]['name'],
+                f'{genres[1]["slug"]},{genres[0]["slug"]}',
+            ],
+        ], (
+            'Проверьте, что выгрузка CSV учитывает фильтры и `fields`, '
+            'а жанры выводит слагами.'
+        )
+
+    def test_03_reviews(self, admin_client, user, user_client, moderator,
+                        moderator_client):
+        reviews, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        response = admin_client.get(
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/export/csv/'
+        )
+        rows = list(csv.DictReader(io.StringIO(self.read(response))))
+        assert {row['text'] for row in rows} == {
+            review['text'] for review in reviews
+        }
+        assert list(rows[0]) == ['id', 'text', 'author', 'score', 'pub_date']
+        response = admin_client.get(
+            f'{self.TITLES_URL}{titles[0]["id"] + 100}/reviews/export/csv/'
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_04_admin_only(self, client, admin_client, user_client,
+                           moderator_client):
+        titles, _, _ = create_titles(admin_client)
+        urls = [
+            f'{self.TITLES_URL}export/ndjson/',
+            f'{self.TITLES_URL}{titles[0]["id"]}/reviews/export/ndjson/',
+        ]
+        for url in urls:
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            for api_client in (user_client, moderator_client):
+                assert api_client.get(url).status_code == (
+                    HTTPStatus.FORBIDDEN
+                ), 'Выгрузка доступна только администратору.'
@@ -0,0 +1,73 @@
+import gzip
+import json
+
+import pytest
+
+from api.middleware import CODECS, choose_encoding
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Compression:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @pytest.fixture
+    def reviews_url(self, admin_client, user, user_client, moderator,
+                    moderator_client, settings):
+        settings.COMPRESSION_MIN_SIZE = 200
+        _, titles = create_reviews(
+            admin_client, {user: user_client, moderator: moderator_client}
+        )
+        return f'{self.TITLES_URL}{titles[0]["id"]}/reviews/'
+
+    def test_01_gzip(self, client, reviews_url):
+        plain = client.get(reviews_url)
+        assert 'Content-Encoding' not in plain, (
+            'Без Accept-Encoding ответ не должен сжиматься.'
+        )
+        response = client.get(reviews_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert response['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response['Vary']
+        assert int(response['Content-Length']) == len(response.content)
+        assert json.loads(gzip.decompress(response.content)) == (
+            plain.json()
+        )
+
+    def test_02_threshold(self, client, reviews_url, settings):
+        settings.COMPRESSION_MIN_SIZE = 100000
+        response = client.get(reviews_url, HTTP_ACCEPT_ENCODING='gzip')
+        assert 'Content-Encoding' not in response, (
+            'Ответы короче COMPRESSION_MIN_SIZE не должны сжиматься.'
+        )
+
+    def test_03_streaming(self, admin_client, reviews_url):
+        plain = admin_client.get(f'{reviews_url}export/ndjson/')
+        response = admin_client.get(
+            f'{reviews_url}export/ndjson/', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        assert response.streaming and response['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(
+            b''.join(response.streaming_content)
+        ) == b''.join(plain.streaming_content), (
+            'Проверьте, что потоковые ответы сжимаются по мере отдачи.'
+        )
+
+
+class Test22ChooseEncoding:
+
+    def test_01_negotiation(self):
+        assert choose_encoding('') is None
+        assert choose_encoding('identity') is None
+        assert choose_encoding('gzip;q=0, deflate') is None
+        assert choose_encoding('deflate, gzip;q=0.5') == 'gzip'
+        assert choose_encoding('*') == next(iter(CODECS))
+        assert choose_encoding('*, gzip;q=0') != 'gzip'
+
+    def test_02_optional_codecs(self):
+        brotli = pytest.importorskip('brotli')
+        _, compress_stream = CODECS['br']
+        assert choose_encoding('gzip, br') == 'br'
+        assert brotli.decompress(
+            b''.join(compress_stream([b'abc' * 100, b'def' * 100]))
+        ) == b'abc' * 100 + b'def' * 100
@@ -0,0 +1,53 @@
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from api_yamdb import settings_api
+
+
+@pytest.fixture
+def api_profile(settings):
+    settings.MIDDLEWARE = settings_api.MIDDLEWARE
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('api_profile')
+class Test23APIProfile:
+
+    def test_01_api_skips_session(self, client, admin_client):
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.OK
+        request = response.wsgi_request
+        assert not hasattr(request, 'session'), (
+            'В профиле settings_api запросы к API не должны проходить '
+            'через SessionMiddleware.'
+        )
+        assert not hasattr(request, '_messages')
+        assert 'csrftoken' not in response.cookies
+        response = admin_client.post(
+            '/api/v1/categories/', data={'name': 'Фильм', 'slug': 'films'}
+        )
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что JWT-аутентификация API работает без сессий.'
+        )
+
+    def test_02_admin_keeps_session_and_csrf(self, user_superuser):
+        client = Client(enforce_csrf_checks=True)
+        response = client.get('/admin/login/')
+        assert response.status_code == HTTPStatus.OK
+        assert hasattr(response.wsgi_request, 'session')
+        csrf_token = response.cookies['csrftoken'].value
+        credentials = {
+            'username': user_superuser.username, 'password': '1234567'
+        }
+        response = client.post('/admin/login/', data=credentials)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'CSRF-защита админки должна работать и в профиле settings_api.'
+        )
+        response = client.post(
+            '/admin/login/?next=/admin/',
+            data={**credentials, 'csrfmiddlewaretoken': csrf_token},
+        )
+        assert response.status_code == HTTPStatus.FOUND
+        assert client.get('/admin/').status_code == HTTPStatus.OK
@@ -0,0 +1,85 @@
+import re
+from http import HTTPStatus
+
+import pytest
+from django.test import Client
+
+from monitoring.stats import percentile, registry
+from tests.utils import create_titles
+
+SERVER_TIMING = re.compile(
+    r'total;dur=[\d.]+, db;dur=[\d.]+;desc="(\d+) queries", '
+    r'serialize;dur=[\d.]+, encode;dur=[\d.]+'
+)
+
+
+@pytest.fixture
+def instrumentation(settings):
+    settings.INSTRUMENTATION_ENABLED = True
+    registry.reset()
+    yield
+    registry.reset()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Instrumentation:
+
+    URL = '/api/v1/instrumentation/'
+
+    def test_01_disabled(self, client, admin_client):
+        response = client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response, (
+            'Без INSTRUMENTATION_ENABLED замеры не должны выполняться.'
+        )
+        response = admin_client.get(self.URL)
+        assert response.json() == {'enabled': False, 'views': {}}
+
+    @pytest.mark.usefixtures('instrumentation')
+    def test_02_server_timing_and_stats(self, admin_client):
+        create_titles(admin_client)
+        client = Client()
+        for _ in range(3):
+            response = client.get('/api/v1/titles/')
+        match = SERVER_TIMING.fullmatch(response['Server-Timing'])
+        assert match, (
+            'Проверьте формат заголовка Server-Timing: total, db, '
+            'serialize, encode.'
+        )
+        assert int(match[1]) == 3
+
+        views = admin_client.get(self.URL).json()['views']
+        stats = views['TitleViewSet.list']
+        assert stats['count'] == 3
+        assert stats['queries'] == {'p50': 3, 'p95': 3, 'p99': 3}
+        assert stats['size']['p50'] == len(response.content)
+        assert stats['wall_ms']['p50'] <= stats['wall_ms']['p99']
+        assert 'render_ms' not in stats, (
+            'Время рендерера должно называться encode_ms: сериализаторы '
+            'замеряются отдельно, в serialize_ms.'
+        )
+        assert stats['serialize_ms']['p50'] > 0, (
+            'Проверьте, что время сериализаторов замеряется.'
+        )
+        assert stats['encode_ms']['p50'] >= 0
+        assert views['TitleViewSet.create']['count'] == 2, (
+            'Действия вьюсетов должны учитываться раздельно.'
+        )
+
+        response = admin_client.delete(self.URL)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert list(admin_client.get(self.URL).json()['views']) == [
+            'instrumentation_view.delete'
+        ], 'DELETE должен сбрасывать накопленную статистику.'
+
+    def test_03_admin_only(self, client, user_client, moderator_client):
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED
+        for api_client in (user_client, moderator_client):
+            assert api_client.get(self.URL).status_code == (
+                HTTPStatus.FORBIDDEN
+            )
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (50, 95, 99)] == [50, 95, 99]
+    assert percentile([7], 99) == 7
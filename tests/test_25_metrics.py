@@ -0,0 +1,120 @@
+import csv
+import re
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from monitoring import metrics
+from tests.utils import create_titles
+
+
+def sample(text, name, **labels):
+    """Значение метрики name с метками labels из ответа /metrics."""
+    pattern = re.escape(name) + r'\{(.*?)\} (\S+)$'
+    for match in re.finditer(pattern, text, re.M):
+        pairs = dict(re.findall(r'(\w+)="(.*?)"', match[1]))
+        if pairs == {key: str(value) for key, value in labels.items()}:
+            return float(match[2])
+    return None
+
+
+@pytest.fixture
+def metrics_dir(settings, tmp_path, monkeypatch):
+    settings.METRICS_ENABLED = True
+    settings.METRICS_DIR = str(tmp_path)
+    monkeypatch.setattr(metrics, 'metrics', metrics.Metrics())
+    return tmp_path
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Metrics:
+
+    def test_01_disabled(self, client):
+        assert client.get('/metrics').status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.usefixtures('metrics_dir')
+    def test_02_requests_and_cache(self, admin_client):
+        create_titles(admin_client)
+        client = Client()
+        for _ in range(2):
+            client.get('/api/v1/titles/')
+        response = client.get('/metrics')
+        assert response.status_code == HTTPStatus.OK
+        assert response['Content-Type'].startswith('text/plain; version=0.0.4')
+        text = response.content.decode()
+        assert sample(
+            text, 'yamdb_http_requests_total',
+            view='TitleViewSet.list', method='GET', status=200,
+        ) == 2, 'Проверьте счётчик запросов по представлениям.'
+        assert sample(
+            text, 'yamdb_http_request_duration_seconds_count',
+            view='TitleViewSet.list',
+        ) == 2
+        assert sample(
+            text, 'yamdb_http_request_duration_seconds_bucket',
+            view='TitleViewSet.list', le='+Inf',
+        ) == 2
+        assert sample(
+            text, 'yamdb_db_queries_total', view='TitleViewSet.list'
+        ) == 6
+        assert sample(
+            text, 'yamdb_catalog_cache_lookups_total',
+            catalog='genre', result='hit',
+        ) > 0, 'Проверьте учёт обращений к кэшу справочников.'
+
+    @pytest.mark.usefixtures('metrics_dir')
+    def test_03_auth_outcomes(self, client, user):
+        client.post('/api/v1/auth/signup/', data={})
+        client.post('/api/v1/auth/signup/', data={
+            'username': 'new_user', 'email': 'new@yamdb.fake'
+        })
+        client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': '0000'
+        })
+        text = client.get('/metrics').content.decode()
+        for endpoint, outcome in (
+            ('signup', 'invalid'),
+            ('signup', 'success'),
+            ('token', 'wrong_code'),
+        ):
+            assert sample(
+                text, 'yamdb_auth_total', endpoint=endpoint, outcome=outcome
+            ) == 1, f'Проверьте учёт исхода {endpoint}: {outcome}.'
+
+    def test_04_processes_and_load_data(self, client, metrics_dir,
+                                        settings):
+        data_dir = settings.BASE_DIR / 'static/data'
+        call_command('load_data', '--path', str(data_dir))
+        with open(data_dir / 'review.csv', encoding='utf-8') as file:
+            reviews = len(list(csv.DictReader(file)))
+        other = metrics.Metrics()
+        other.inc(
+            'yamdb_http_requests_total',
+            (('view', 'TitleViewSet.list'), ('method', 'GET'),
+             ('status', '200')),
+            5,
+        )
+        other.flush(force=True)
+        assert len(list(metrics_dir.glob('*.json'))) == 2
+        client.get('/api/v1/titles/')
+        text = client.get('/metrics').content.decode()
+        assert sample(
+            text, 'yamdb_http_requests_total',
+            view='TitleViewSet.list', method='GET', status=200,
+        ) == 6, 'Проверьте суммирование метрик всех процессов.'
+        assert sample(
+            text, 'yamdb_import_rows_total', file='review'
+        ) == reviews, 'Проверьте учёт строк, загруженных load_data.'
+        assert sample(
+            text, 'yamdb_import_duration_seconds_total', file='review'
+        ) > 0
+
+    @pytest.mark.usefixtures('metrics_dir')
+    def test_05_token(self, client, settings):
+        settings.METRICS_TOKEN = 'secret'
+        assert client.get('/metrics').status_code == HTTPStatus.UNAUTHORIZED
+        assert client.get(
+            '/metrics', HTTP_AUTHORIZATION='Bearer secret'
+        ).status_code == HTTPStatus.OK
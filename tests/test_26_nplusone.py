@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from monitoring.middleware import NPlusOneMiddleware
+from monitoring.nplusone import NPlusOneError, QueryShapes, query_shape
+from reviews.models import Title
+from tests.utils import create_titles
+
+
+def select_titles_one_by_one(request):
+    for pk in Title.objects.values_list('pk', flat=True):
+        Title.objects.filter(pk=pk).first()
+    return HttpResponse()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26NPlusOne:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_query_shape(self):
+        assert query_shape(
+            'SELECT *  FROM t\n WHERE id IN (%s, %s, %s)'
+        ) == query_shape('SELECT * FROM t WHERE id IN (%s)'), (
+            'Проверьте, что форма запроса не зависит от длины списка IN.'
+        )
+
+    def test_02_repeated_shapes(self, admin_client):
+        create_titles(admin_client)
+        with QueryShapes(threshold=1) as shapes:
+            for title in Title.objects.all():
+                Title.objects.filter(pk=title.pk).first()
+        assert list(shapes.repeated().values()) == [2], (
+            'Проверьте, что QueryShapes находит повторяющийся запрос.'
+        )
+        with QueryShapes(threshold=2) as shapes:
+            list(Title.objects.filter(pk__in=[1, 2, 3]))
+            list(Title.objects.filter(pk__in=[1, 2]))
+        assert list(shapes.counts.values()) == [2]
+        assert not shapes.repeated()
+
+    def test_03_middleware(self, settings, admin_client, caplog):
+        create_titles(admin_client)
+        request = RequestFactory().get(self.TITLES_URL)
+        settings.NPLUSONE_THRESHOLD = 1
+
+        settings.NPLUSONE_DETECTION = 'raise'
+        with pytest.raises(NPlusOneError, match=self.TITLES_URL):
+            NPlusOneMiddleware(select_titles_one_by_one)(request)
+
+        settings.NPLUSONE_DETECTION = 'log'
+        with caplog.at_level(logging.WARNING, logger='monitoring.nplusone'):
+            NPlusOneMiddleware(select_titles_one_by_one)(request)
+        assert 'N+1' in caplog.text, (
+            'Проверьте, что при NPLUSONE_DETECTION=log N+1 пишется в лог.'
+        )
+
+    def test_04_api_without_n_plus_one(self, client, admin_client, settings):
+        settings.NPLUSONE_DETECTION = 'raise'
+        settings.NPLUSONE_THRESHOLD = 1
+        create_titles(admin_client)
+        assert client.get(self.TITLES_URL).status_code == 200
@@ -0,0 +1,79 @@
+import json
+import logging
+
+import pytest
+
+from monitoring.slowlog import JSONFormatter, logger
+from tests.utils import create_titles
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def slow_queries(settings, monkeypatch):
+    settings.SLOW_QUERY_LOG_ENABLED = True
+    settings.SLOW_QUERY_THRESHOLD = 0
+    settings.SLOW_QUERY_EXPLAIN_THRESHOLD = 0
+    handler = ListHandler()
+    # Вместо файла из LOGGING записи собираются в список.
+    monkeypatch.setattr(logger, 'handlers', [handler])
+    return handler.records
+
+
+@pytest.mark.django_db(transaction=True)
+class Test27SlowQueries:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    def test_01_logged_with_view_and_plan(self, client, admin_client,
+                                          slow_queries):
+        _, categories, _ = create_titles(admin_client)
+        slow_queries.clear()
+        client.get(f'{self.TITLES_URL}?category={categories[0]["slug"]}')
+        entries = [
+            json.loads(JSONFormatter().format(record))
+            for record in slow_queries
+        ]
+        assert entries, (
+            'Проверьте, что запросы дольше SLOW_QUERY_THRESHOLD '
+            'пишутся в лог monitoring.slowqueries.'
+        )
+        titles = [
+            entry for entry in entries if 'reviews_title' in entry['sql']
+        ]
+        assert titles
+        for entry in titles:
+            assert entry['view'] == 'TitleViewSet.list', (
+                'Проверьте, что в записи указано представление запроса.'
+            )
+            assert entry['path'] == self.TITLES_URL
+            assert entry['duration_ms'] >= 0
+            assert entry['plan'], (
+                'Проверьте, что для медленных запросов снимается план '
+                '(EXPLAIN QUERY PLAN для SQLite).'
+            )
+        assert any(entry['params'] for entry in titles)
+
+    def test_02_threshold(self, client, admin_client, settings,
+                          slow_queries):
+        create_titles(admin_client)
+        settings.SLOW_QUERY_EXPLAIN_THRESHOLD = 10 ** 6
+        slow_queries.clear()
+        client.get(self.TITLES_URL)
+        assert slow_queries
+        assert all(record.query['plan'] is None for record in slow_queries), (
+            'Проверьте, что план снимается только для запросов дольше '
+            'SLOW_QUERY_EXPLAIN_THRESHOLD.'
+        )
+        settings.SLOW_QUERY_THRESHOLD = 10 ** 6
+        slow_queries.clear()
+        client.get(self.TITLES_URL)
+        assert not slow_queries
@@ -0,0 +1,96 @@
+import csv
+from collections import Counter
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.db.models import Sum
+
+from reviews.models import (
+    Comment,
+    LeaderboardEntry,
+    Review,
+    ScoreBucket,
+    Title,
+)
+
+SIZES = (
+    '--users', '30', '--titles', '20', '--reviews', '200',
+    '--comments', '100', '--categories', '3', '--genres', '5',
+)
+
+
+def generate(path, *args):
+    call_command(
+        'generate_data', '--path', str(path), *SIZES, *args, stdout=StringIO()
+    )
+
+
+def read(path, name):
+    with open(Path(path) / f'{name}.csv', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test28GenerateData:
+
+    def test_01_schema_and_determinism(self, tmp_path):
+        generate(tmp_path / 'a', '--seed', '1')
+        generate(tmp_path / 'b', '--seed', '1')
+        generate(tmp_path / 'c', '--seed', '2')
+        fixtures = Path(settings.BASE_DIR) / 'static' / 'data'
+        for fixture in fixtures.glob('*.csv'):
+            generated = tmp_path / 'a' / fixture.name
+            assert generated.exists(), f'Не создан файл {fixture.name}.'
+            with open(fixture, encoding='utf-8') as file:
+                header = file.readline()
+            assert generated.read_text(encoding='utf-8').startswith(
+                header
+            ), f'Проверьте заголовок {fixture.name}: он как в static/data.'
+            assert generated.read_bytes() == (
+                tmp_path / 'b' / fixture.name
+            ).read_bytes(), 'Проверьте, что данные зависят только от seed.'
+        assert (tmp_path / 'a' / 'review.csv').read_bytes() != (
+            tmp_path / 'c' / 'review.csv'
+        ).read_bytes()
+
+    def test_02_distribution(self, tmp_path):
+        generate(tmp_path)
+        reviews = read(tmp_path, 'review')
+        assert len(reviews) == 200
+        assert len(read(tmp_path, 'comments')) == 100
+        pairs = [(row['title_id'], row['author']) for row in reviews]
+        assert len(set(pairs)) == len(pairs), (
+            'Проверьте, что автор пишет на произведение один отзыв.'
+        )
+        per_title = Counter(row['title_id'] for row in reviews)
+        counts = sorted(per_title.values(), reverse=True)
+        assert counts[0] >= 4 * counts[len(counts) // 2], (
+            'Проверьте, что отзывы распределены по закону Ципфа.'
+        )
+        assert all(
+            1 <= int(row['score']) <= 10 for row in reviews
+        )
+        genre_links = Counter(row['title_id'] for row in read(
+            tmp_path, 'genre_title'
+        ))
+        assert len(genre_links) == 20
+        assert max(genre_links.values()) <= 3
+
+    def test_03_loadable(self, tmp_path):
+        generate(tmp_path)
+        call_command('load_data', '--path', str(tmp_path), stdout=StringIO())
+        assert Title.objects.count() == 20
+        assert Review.objects.count() == 200
+        assert Comment.objects.count() == 100
+        assert ScoreBucket.objects.aggregate(total=Sum('count')) == {
+            'total': 200
+        }, 'После загрузки счётчики оценок должны быть пересчитаны.'
+        assert not Title.objects.filter(
+            reviews__isnull=False, weighted_rating__isnull=True
+        ).exists(), 'После загрузки должны быть пересчитаны рейтинги.'
+        assert LeaderboardEntry.objects.filter(board='overall').count() == (
+            Title.objects.filter(weighted_rating__isnull=False).count()
+        )
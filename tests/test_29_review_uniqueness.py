@@ -0,0 +1,48 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import IntegrityError
+
+from api.views import unique_review_violated
+from reviews.models import Review
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test29ReviewUniqueness:
+
+    REVIEWS_URL_TEMPLATE = '/api/v1/titles/{title_id}/reviews/'
+
+    def test_01_duplicate_is_bad_request(self, admin_client, user,
+                                         user_client,
+                                         django_assert_max_num_queries):
+        reviews, titles = create_reviews(admin_client, {user: user_client})
+        url = self.REVIEWS_URL_TEMPLATE.format(title_id=titles[0]['id'])
+        # Пользователь, произведение и отклонённая вставка в транзакции
+        # Review.save() (BEGIN и ROLLBACK), без exists().
+        with django_assert_max_num_queries(5):
+            response = user_client.post(url, data={'text': '2', 'score': 1})
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что повторный отзыв пользователя на произведение '
+            'отклоняется со статусом 400, а не 500.'
+        )
+        assert 'non_field_errors' in response.json()
+        assert Review.objects.filter(author=user).count() == 1
+
+        user_client.delete(f'{url}{reviews[0]["id"]}/')
+        response = user_client.post(url, data={'text': '3', 'score': 9})
+        assert response.status_code == HTTPStatus.CREATED, (
+            'Проверьте, что после удаления отзыва можно оставить новый.'
+        )
+
+    def test_02_unique_review_violated(self):
+        assert unique_review_violated(IntegrityError(
+            'UNIQUE constraint failed: '
+            'reviews_review.title_id, reviews_review.author_id'
+        ))
+        assert unique_review_violated(IntegrityError(
+            'duplicate key value violates unique constraint "unique_review"'
+        ))
+        assert not unique_review_violated(IntegrityError(
+            'FOREIGN KEY constraint failed'
+        ))
@@ -0,0 +1,113 @@
+import pstats
+from http import HTTPStatus
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.conf import settings as django_settings
+from django.core.management import call_command
+
+from reviews.models import Title
+
+
+@pytest.fixture
+def profiling(settings, tmp_path):
+    settings.PROFILING_ENABLED = True
+    settings.PROFILING_DIR = str(tmp_path / 'profiles')
+    return Path(settings.PROFILING_DIR)
+
+
+def load_stats(path):
+    stats = pstats.Stats(str(path))
+    return {function[2] for function in stats.stats}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test30Profiling:
+
+    URL = '/api/v1/profiles/'
+
+    def test_01_disabled(self, admin_client):
+        response = admin_client.get('/api/v1/titles/?profile=1')
+        assert 'X-Profile-Id' not in response, (
+            'Без PROFILING_ENABLED запросы не должны профилироваться.'
+        )
+        assert admin_client.get(self.URL).json()['profiles'] == []
+
+    def test_02_admin_trace(self, profiling, admin_client, tmp_path):
+        response = admin_client.get('/api/v1/titles/?profile=1')
+        assert response.status_code == HTTPStatus.OK
+        name = response['X-Profile-Id']
+        assert (profiling / name).is_file(), (
+            'Трейс должен сохраняться в PROFILING_DIR.'
+        )
+        response = admin_client.get(
+            '/api/v1/categories/', HTTP_X_PROFILE='cprofile'
+        )
+        assert 'X-Profile-Id' in response, (
+            'Профилирование должно включаться и заголовком X-Profile.'
+        )
+
+        profiles = admin_client.get(self.URL).json()['profiles']
+        assert len(profiles) == 2
+        assert name in {profile['name'] for profile in profiles}
+
+        response = admin_client.get(f'{self.URL}{name}/')
+        assert response.status_code == HTTPStatus.OK
+        assert 'attachment' in response['Content-Disposition']
+        downloaded = tmp_path / 'downloaded.prof'
+        downloaded.write_bytes(b''.join(response.streaming_content))
+        assert 'list' in load_stats(downloaded), (
+            'В трейсе должны быть вызовы представления.'
+        )
+
+        response = admin_client.delete(f'{self.URL}{name}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert not (profiling / name).exists()
+        assert admin_client.get(f'{self.URL}{name}/').status_code == (
+            HTTPStatus.NOT_FOUND
+        )
+
+    def test_03_not_admin(self, profiling, client, user_client,
+                          moderator_client):
+        for api_client in (client, user_client, moderator_client):
+            response = api_client.get('/api/v1/titles/?profile=1')
+            assert response.status_code == HTTPStatus.OK
+            assert 'X-Profile-Id' not in response, (
+                'Профилировать запросы может только администратор.'
+            )
+        assert not profiling.exists()
+        assert client.get(self.URL).status_code == HTTPStatus.UNAUTHORIZED
+        for api_client in (user_client, moderator_client):
+            assert api_client.get(self.URL).status_code == (
+                HTTPStatus.FORBIDDEN
+            )
+
+    def test_04_names_and_pruning(self, profiling, settings, admin_client):
+        settings.PROFILING_KEEP = 2
+        for _ in range(3):
+            admin_client.get('/api/v1/genres/?profile=1')
+        assert len(list(profiling.iterdir())) == 2, (
+            'Старые трейсы сверх PROFILING_KEEP должны удаляться.'
+        )
+        (profiling.parent / 'secret.prof').write_bytes(b'secret')
+        for name in ('..%2Fsecret.prof', 'settings.py', 'unknown.prof'):
+            assert admin_client.get(f'{self.URL}{name}/').status_code == (
+                HTTPStatus.NOT_FOUND
+            ), 'Скачать можно только трейс из PROFILING_DIR.'
+
+    def test_05_profile_load_data(self, profiling):
+        output = StringIO()
+        call_command(
+            'profile_load_data',
+            '--path', str(Path(django_settings.BASE_DIR) / 'static' / 'data'),
+            '--limit', '5',
+            stdout=output,
+        )
+        assert Title.objects.exists(), 'Данные должны загрузиться.'
+        traces = list(profiling.glob('*.prof'))
+        assert len(traces) == 1
+        assert 'handle' in load_stats(traces[0])
+        assert 'cumulative' in output.getvalue(), (
+            'В выводе команды должна быть сводка pstats.'
+        )
@@ -1,5 +1,37 @@
+from contextlib import contextmanager
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import Resolver404, resolve
+
+# Наибольшее число SQL-запросов успешного запроса к API без
+# аутентификации: (метод, имя маршрута) -> запросов. От размера страницы
+# и числа объектов бюджет не зависит. Создание произведений и отзывов
+# дороже остального: оно обновляет счётчики оценок и взвешенный рейтинг
+# и отмечает произведение для пересчёта досок лучших (с BEGIN и COMMIT).
+# Создание категорий и жанров меняет версию справочника в CatalogVersion
+# (INSERT ... ON CONFLICT с BEGIN и COMMIT). Произведения читают жанры
+# и категории из кэша, который сверяет их версии с базой одним запросом
+# не чаще раза в CATALOG_CACHE_CHECK_INTERVAL: он входит в бюджет.
+QUERY_BUDGETS = {
+    ('GET', 'categories-list'): 2,
+    ('POST', 'categories-list'): 5,
+    ('GET', 'genres-list'): 2,
+    ('POST', 'genres-list'): 5,
+    ('GET', 'titles-list'): 4,
+    ('POST', 'titles-list'): 10,
+    ('GET', 'titles-detail'): 3,
+    ('GET', 'title-reviews-list'): 3,
+    ('POST', 'title-reviews-list'): 13,
+    ('GET', 'title-reviews-detail'): 2,
+    ('GET', 'review-comments-list'): 3,
+    ('POST', 'review-comments-list'): 2,
+    ('GET', 'review-comments-detail'): 2,
+}
+# JWT-аутентификация добавляет запрос пользователя.
+AUTHENTICATION_QUERIES = 1
+
 
 check_name_and_slug_patterns = (
     (
@@ -102,6 +134,34 @@ invalid_data_for_user_patch_and_creation.extend([
 ])
 
 
+def query_budget(request):
+    """Бюджет запросов к БД для запроса к API или None, если его нет."""
+    try:
+        url_name = resolve(request.path_info).url_name
+    except Resolver404:
+        return None
+    budget = QUERY_BUDGETS.get((request.method, url_name))
+    if budget is not None and 'HTTP_AUTHORIZATION' in request.META:
+        budget += AUTHENTICATION_QUERIES
+    return budget
+
+
+def check_query_count(description, queries, max_queries):
+    assert len(queries) <= max_queries, (
+        f'Проверьте, что {description} выполняет не больше {max_queries} '
+        f'запросов к БД, сейчас их {len(queries)}:\n'
+        + '\n'.join(query['sql'] for query in queries.captured_queries)
+    )
+
+
+@contextmanager
+def assert_max_queries(max_queries, description='запрос'):
+    """Блок выполняет не больше max_queries запросов к БД."""
+    with CaptureQueriesContext(connection) as queries:
+        yield queries
+    check_query_count(description, queries, max_queries)
+
+
 def check_pagination(url, respons_data, expected_count, post_data=None):
     expected_keys = ('count', 'next', 'previous', 'results')
     for key in expected_keys: